@@ -0,0 +1,31 @@
+"""Add resume and job listing indexes
+
+Revision ID: 546edbbd8f6d
+Revises: 78e1fd6614c0
+Create Date: 2026-10-19 12:03:38.927410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '546edbbd8f6d'
+down_revision: Union[str, None] = '78e1fd6614c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination for resume and job listings, newest first
+    op.create_index('ix_resumes_user_id_uploaded_at', 'resumes', ['user_id', 'uploaded_at', 'id'], unique=False)
+    op.create_index('ix_job_descriptions_is_active_created_at', 'job_descriptions', ['is_active', 'created_at', 'id'], unique=False)
+    op.create_index('ix_job_descriptions_user_id_created_at', 'job_descriptions', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_descriptions_user_id_created_at', table_name='job_descriptions')
+    op.drop_index('ix_job_descriptions_is_active_created_at', table_name='job_descriptions')
+    op.drop_index('ix_resumes_user_id_uploaded_at', table_name='resumes')
@@ -0,0 +1,31 @@
+"""Add resumes.embedding and resumes.embedded_at
+
+Revision ID: 5f2b8c3d9e14
+Revises: 993e13c2cad4
+Create Date: 2026-10-19 18:40:12.905417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2b8c3d9e14'
+down_revision: Union[str, None] = '993e13c2cad4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Full-precision embeddings for job matching; the index lets workers read only new ones
+    op.add_column('resumes', sa.Column('embedding', sa.LargeBinary(), nullable=True))
+    op.add_column('resumes', sa.Column('embedded_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_resumes_embedded_at'), 'resumes', ['embedded_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resumes_embedded_at'), table_name='resumes')
+    op.drop_column('resumes', 'embedded_at')
+    op.drop_column('resumes', 'embedding')
@@ -0,0 +1,32 @@
+"""Add job_matches leaderboard index
+
+Revision ID: 78e1fd6614c0
+Revises: a69052a08a9f
+Create Date: 2026-10-19 11:26:53.104772
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78e1fd6614c0'
+down_revision: Union[str, None] = 'a69052a08a9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves WHERE job_id = ? ORDER BY overall_score DESC, id for keyset pages
+    op.create_index(
+        'ix_job_matches_job_id_overall_score',
+        'job_matches',
+        ['job_id', sa.text('overall_score DESC'), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_matches_job_id_overall_score', table_name='job_matches')
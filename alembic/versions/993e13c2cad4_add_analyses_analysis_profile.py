@@ -0,0 +1,31 @@
+"""Add analyses.analysis_profile
+
+Revision ID: 993e13c2cad4
+Revises: 546edbbd8f6d
+Create Date: 2026-10-19 14:21:07.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '993e13c2cad4'
+down_revision: Union[str, None] = '546edbbd8f6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+analysisprofile = sa.Enum('FAST', 'STANDARD', 'FULL', name='analysisprofile')
+
+
+def upgrade() -> None:
+    # Existing rows were all produced by the full pipeline
+    analysisprofile.create(op.get_bind(), checkfirst=True)
+    op.add_column('analyses', sa.Column('analysis_profile', analysisprofile, server_default='FULL', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('analyses', 'analysis_profile')
+    analysisprofile.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,41 @@
+"""Unique job_matches (resume_id, job_id)
+
+Revision ID: a69052a08a9f
+Revises: d46570d6e361
+Create Date: 2026-10-19 10:41:07.552918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a69052a08a9f'
+down_revision: Union[str, None] = 'd46570d6e361'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-running a match used to insert a new row each time; keep the latest one
+    op.execute("""
+        DELETE FROM job_matches
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY resume_id, job_id ORDER BY matched_at DESC, id
+                ) AS position
+                FROM job_matches
+            ) AS duplicates
+            WHERE duplicates.position > 1
+        )
+    """)
+    op.create_unique_constraint(
+        'uq_job_matches_resume_id_job_id', 'job_matches', ['resume_id', 'job_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_job_matches_resume_id_job_id', 'job_matches', type_='unique')
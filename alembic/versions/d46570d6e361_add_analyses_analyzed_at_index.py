@@ -0,0 +1,27 @@
+"""Add analyses.analyzed_at index
+
+Revision ID: d46570d6e361
+Revises: ca40e4aab19c
+Create Date: 2026-10-19 09:12:44.318201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd46570d6e361'
+down_revision: Union[str, None] = 'ca40e4aab19c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets the skill IDF table read only analyses newer than its watermark
+    op.create_index(op.f('ix_analyses_analyzed_at'), 'analyses', ['analyzed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analyses_analyzed_at'), table_name='analyses')
@@ -0,0 +1 @@
+"""Admin-only operational endpoints"""
\ No newline at end of file
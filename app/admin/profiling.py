@@ -0,0 +1,160 @@
+"""
+In-process profilers for a running worker.
+
+StackSampler polls sys._current_frames() from a background thread, so it
+needs no extra dependency and sees every thread (event loop, inference pool,
+auth crypto pool). Output is collapsed stacks, the input format of
+flamegraph.pl and speedscope, or a speedscope JSON document.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+# Leaf frames of threads that are parked, not burning CPU
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+# Frames that only describe the profiler or import machinery
+TRACEMALLOC_IGNORE = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def _frame_name(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+
+class StackSampler:
+    """Samples the Python stacks of every other thread at a fixed interval"""
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+
+    def run(self, seconds: float):
+        """Sample for `seconds`; blocks the calling thread"""
+        me = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = self._stack(frame)
+                if stack is not None:
+                    self.stacks[(names.get(ident, str(ident)),) + stack] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+        self.duration = time.perf_counter() - started
+
+    def _stack(self, frame):
+        """Root-first frame names, or None for an idle thread we're skipping"""
+        if not self.include_idle:
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                return None
+
+        stack = []
+        while frame is not None:
+            stack.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def collapsed(self) -> str:
+        """One `thread;outer;...;leaf count` line per distinct stack"""
+        return "\n".join(
+            f"{';'.join(stack)} {count}"
+            for stack, count in self.stacks.most_common()
+        ) + "\n"
+
+    def speedscope(self, name: str = "resumeiq") -> Dict[str, Any]:
+        """Speedscope file format (sampled profile), loadable at speedscope.app"""
+        frames: List[Dict[str, str]] = []
+        index: Dict[str, int] = {}
+        samples, weights = [], []
+
+        for stack, count in self.stacks.items():
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame})
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{name} pid {os.getpid()}",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }],
+            "exporter": "app.admin.profiling"
+        }
+
+
+def _statistic(stat) -> Dict[str, Any]:
+    return {
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+        "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+    }
+
+
+def _statistic_diff(stat) -> Dict[str, Any]:
+    return {
+        "size_kb": round(stat.size / 1024, 1),
+        "size_diff_kb": round(stat.size_diff / 1024, 1),
+        "count_diff": stat.count_diff,
+        "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+    }
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in TRACEMALLOC_IGNORE]
+    )
+
+
+def start_memory_window(frames: int) -> Tuple[tracemalloc.Snapshot, bool]:
+    """Start tracemalloc if needed and take the opening snapshot; returns (snapshot, started_here)"""
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    return _snapshot(), started_here
+
+
+def finish_memory_window(before: tracemalloc.Snapshot, top: int, group_by: str) -> Dict[str, Any]:
+    """The top allocation sites still alive and the sites that grew the most since `before`"""
+    after = _snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+
+    return {
+        "pid": os.getpid(),
+        "group_by": group_by,
+        "traced_current_kb": round(current / 1024, 1),
+        "traced_peak_kb": round(peak / 1024, 1),
+        "top": [_statistic(stat) for stat in after.statistics(group_by)[:top]],
+        "growth": [_statistic_diff(stat) for stat in after.compare_to(before, group_by)[:top]]
+    }
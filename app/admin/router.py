@@ -0,0 +1,107 @@
+"""Admin-only profiling and model lifecycle endpoints for a running worker"""
+
+import asyncio
+import os
+import threading
+import tracemalloc
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.config import settings
+from app.auth.dependencies import CurrentUser, get_current_admin
+from app.admin.profiling import StackSampler, start_memory_window, finish_memory_window
+from app.ai.lifecycle import model_manager
+
+router = APIRouter()
+
+# One profile per process at a time; overlapping samplers skew each other
+_profile_lock = threading.Lock()
+
+
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+class MemoryGrouping(str, Enum):
+    LINENO = "lineno"
+    FILENAME = "filename"
+    TRACEBACK = "traceback"
+
+
+def _acquire_profiler():
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+
+
+@router.post("/profile/cpu")
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, description="How long to sample (capped at PROFILING_MAX_SECONDS)"),
+    interval_ms: float = Query(settings.PROFILING_SAMPLE_INTERVAL_MS, ge=1, le=1000),
+    format: ProfileFormat = Query(ProfileFormat.COLLAPSED, description="collapsed stacks or speedscope JSON"),
+    include_idle: bool = Query(False, description="Keep samples of threads parked in waits"),
+    current_user: CurrentUser = Depends(get_current_admin)
+):
+    """
+    Sample every thread of the worker that serves this request for N seconds.
+    Collapsed output feeds flamegraph.pl; both formats load in speedscope.
+    """
+    _acquire_profiler()
+    try:
+        sampler = StackSampler(interval_ms / 1000, include_idle)
+        # Sample from a thread so the event loop keeps serving (and is profiled)
+        await asyncio.to_thread(sampler.run, min(seconds, settings.PROFILING_MAX_SECONDS))
+    finally:
+        _profile_lock.release()
+
+    headers = {
+        "X-Profile-PID": str(os.getpid()),
+        "X-Profile-Samples": str(sampler.samples),
+        "X-Profile-Seconds": f"{sampler.duration:.2f}"
+    }
+    if format == ProfileFormat.SPEEDSCOPE:
+        return JSONResponse(sampler.speedscope(), headers=headers)
+    return PlainTextResponse(sampler.collapsed(), headers=headers)
+
+
+@router.post("/profile/memory")
+async def profile_memory(
+    seconds: float = Query(10, ge=0, description="Window to measure growth over (capped at PROFILING_MAX_SECONDS)"),
+    top: int = Query(25, ge=1, le=500),
+    group_by: MemoryGrouping = Query(MemoryGrouping.LINENO),
+    current_user: CurrentUser = Depends(get_current_admin)
+):
+    """
+    Trace allocations for a window and return the top-N live allocation
+    sites plus the sites that grew the most, to spot leaks and churn.
+    tracemalloc slows allocation while it runs and is stopped afterwards
+    unless it was already on.
+    """
+    _acquire_profiler()
+    started_here = False
+    try:
+        before, started_here = start_memory_window(settings.PROFILING_TRACEMALLOC_FRAMES)
+        await asyncio.sleep(min(seconds, settings.PROFILING_MAX_SECONDS))
+        return await asyncio.to_thread(finish_memory_window, before, top, group_by.value)
+    finally:
+        # Also runs if the client goes away mid-window
+        if started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+@router.get("/models")
+async def model_status(current_user: CurrentUser = Depends(get_current_admin)):
+    """RSS of the worker serving this request and the state of its models"""
+    return model_manager.report()
+
+
+@router.post("/models/unload")
+async def unload_models(current_user: CurrentUser = Depends(get_current_admin)):
+    """Unload every model of this worker that isn't mid-call; they reload on next use"""
+    unloaded = await asyncio.to_thread(model_manager.unload_all)
+    return {"unloaded": unloaded, **model_manager.report()}
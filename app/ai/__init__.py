@@ -4,10 +4,12 @@ from app.ai.ner_extractor import NERExtractor
 from app.ai.skills_extractor import SkillsExtractor
 from app.ai.similarity import SimilarityCalculator
 from app.ai.experience_classifier import ExperienceClassifier
+from app.ai.skill_matcher import BatchSkillMatcher
 
 __all__ = [
     "NERExtractor",
     "SkillsExtractor", 
     "SimilarityCalculator",
-    "ExperienceClassifier"
+    "ExperienceClassifier",
+    "BatchSkillMatcher"
 ]
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Model artifacts: verified local snapshots in MODEL_CACHE_DIR.
+
+Snapshots are fetched once (or installed from a bundle built elsewhere) and
+models then load from disk by path, with no hub lookup. Each snapshot keeps
+a manifest of file sizes and SHA-256 hashes. Where a model publishes
+safetensors only those weights are fetched, and transformers memory-maps
+them on load instead of unpickling a copy.
+
+    python -m app.ai.artifacts fetch                # configured models and their fallbacks
+    python -m app.ai.artifacts verify               # re-hash every file against its manifest
+    python -m app.ai.artifacts bundle models.tar.gz
+    python -m app.ai.artifacts install models.tar.gz
+
+With MODEL_OFFLINE a model without a snapshot fails to load instead of
+being downloaded.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.ai.config import MODEL_CONFIGS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+# Models the app loads: MODEL_CONFIGS entries with a model class behind them
+LOADED_MODELS = ("ner", "similarity")
+
+# Fetched only when a model has no safetensors weights
+LEGACY_WEIGHTS = ("*.bin", "*.pt", "*.pth", "*.h5", "*.msgpack", "*.ot", "*.onnx", "*.tflite")
+
+
+class ModelArtifactError(RuntimeError):
+    """A model snapshot is missing or doesn't match its manifest"""
+
+
+def snapshots_dir() -> Path:
+    return Path(settings.MODEL_CACHE_DIR) / "snapshots"
+
+
+def snapshot_dir(model_name: str) -> Path:
+    return snapshots_dir() / model_name.replace("/", "--")
+
+
+def configured_models() -> List[str]:
+    """Primary and fallback hub names of every model the app loads"""
+    names = []
+    for key in LOADED_MODELS:
+        for field in ("model_name", "fallback_model_name"):
+            name = MODEL_CONFIGS[key].get(field)
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def configure_hub():
+    """Point the hub cache at MODEL_CACHE_DIR and, if offline, forbid downloads; call before importing transformers"""
+    os.environ.setdefault("HF_HUB_CACHE", str(Path(settings.MODEL_CACHE_DIR) / "hub"))
+    if settings.MODEL_OFFLINE:
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(model_name: str) -> Optional[Dict[str, Any]]:
+    path = snapshot_dir(model_name) / MANIFEST
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(model_name: str, revision: Optional[str] = None) -> Dict[str, Any]:
+    """Record the size and hash of every file in the snapshot"""
+    root = snapshot_dir(model_name)
+    files = {}
+    for path in sorted(root.rglob("*")):
+        relative = path.relative_to(root).as_posix()
+        if not path.is_file() or relative == MANIFEST or relative.startswith(".cache/"):
+            continue
+        files[relative] = {"size": path.stat().st_size, "sha256": _sha256(path)}
+
+    manifest = {
+        "model": model_name,
+        "revision": revision,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": files
+    }
+    with open(root / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def verify(model_name: str, hashes: bool = False) -> List[str]:
+    """Problems with a snapshot, empty if it's intact; sizes only unless `hashes`"""
+    manifest = read_manifest(model_name)
+    if manifest is None:
+        return [f"{model_name}: no snapshot in {snapshot_dir(model_name)}"]
+
+    root = snapshot_dir(model_name)
+    problems = []
+    for relative, expected in manifest["files"].items():
+        path = root / relative
+        if not path.is_file():
+            problems.append(f"{model_name}: missing {relative}")
+        elif path.stat().st_size != expected["size"]:
+            problems.append(f"{model_name}: {relative} is {path.stat().st_size} bytes, expected {expected['size']}")
+        elif hashes and _sha256(path) != expected["sha256"]:
+            problems.append(f"{model_name}: {relative} doesn't match its SHA-256")
+    return problems
+
+
+def model_source(model_name: str) -> str:
+    """
+    What to pass to pipeline()/SentenceTransformer(): the snapshot path if
+    there is an intact one, else the hub name (unless MODEL_OFFLINE).
+    """
+    problems = verify(model_name)
+    if not problems:
+        return str(snapshot_dir(model_name))
+    if settings.MODEL_OFFLINE:
+        raise ModelArtifactError("; ".join(problems))
+    if read_manifest(model_name) is not None:
+        logger.warning(f"Ignoring damaged snapshot: {'; '.join(problems)}")
+    return model_name
+
+
+def fetch(model_name: str, revision: Optional[str] = None) -> Dict[str, Any]:
+    """Download a snapshot of a hub model into MODEL_CACHE_DIR and write its manifest"""
+    from huggingface_hub import HfApi, snapshot_download
+
+    configure_hub()
+    repo_files = HfApi().list_repo_files(model_name, revision=revision)
+    ignore = list(LEGACY_WEIGHTS)
+    if not any(name.endswith(".safetensors") for name in repo_files):
+        logger.warning(f"{model_name} has no safetensors weights; fetching pickled ones")
+        ignore = ["*.h5", "*.msgpack", "*.ot", "*.onnx", "*.tflite"]
+
+    target = snapshot_dir(model_name)
+    target.mkdir(parents=True, exist_ok=True)
+    snapshot_download(model_name, revision=revision, local_dir=str(target), ignore_patterns=ignore)
+    return write_manifest(model_name, revision)
+
+
+def build_bundle(output: str, models: List[str]) -> List[str]:
+    """Tar the snapshots of `models` for installing on nodes without hub access"""
+    missing = [problem for model in models for problem in verify(model, hashes=True)]
+    if missing:
+        raise ModelArtifactError("; ".join(missing))
+
+    mode = "w:gz" if output.endswith((".tar.gz", ".tgz")) else "w"
+    with tarfile.open(output, mode) as bundle:
+        for model in models:
+            bundle.add(
+                snapshot_dir(model),
+                arcname=f"snapshots/{snapshot_dir(model).name}",
+                # Download bookkeeping of huggingface_hub, not part of the model
+                filter=lambda info: None if "/.cache" in info.name else info
+            )
+    return models
+
+
+def install_bundle(path: str) -> List[str]:
+    """Unpack a bundle into MODEL_CACHE_DIR and verify every snapshot in it"""
+    root = Path(settings.MODEL_CACHE_DIR)
+    with tarfile.open(path) as bundle:
+        for member in bundle.getmembers():
+            if not member.name.startswith("snapshots/") or ".." in Path(member.name).parts:
+                raise ModelArtifactError(f"Unexpected path in bundle: {member.name}")
+        if hasattr(tarfile, "data_filter"):
+            bundle.extractall(root, filter="data")
+        else:
+            bundle.extractall(root)
+        installed = sorted({Path(name).parts[1] for name in bundle.getnames() if len(Path(name).parts) > 1})
+
+    models = []
+    for name in installed:
+        manifest = snapshots_dir() / name / MANIFEST
+        if not manifest.exists():
+            raise ModelArtifactError(f"Bundle snapshot {name} has no {MANIFEST}")
+        with open(manifest) as f:
+            models.append(json.load(f)["model"])
+    problems = [problem for model in models for problem in verify(model, hashes=True)]
+    if problems:
+        raise ModelArtifactError("; ".join(problems))
+    return models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch, verify and bundle model snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fetch_parser = commands.add_parser("fetch", help="Download snapshots into MODEL_CACHE_DIR")
+    fetch_parser.add_argument("models", nargs="*", help="Hub names (default: configured models)")
+    fetch_parser.add_argument("--revision")
+    verify_parser = commands.add_parser("verify", help="Check snapshots against their manifests")
+    verify_parser.add_argument("models", nargs="*")
+    bundle_parser = commands.add_parser("bundle", help="Write a .tar or .tar.gz of snapshots")
+    bundle_parser.add_argument("output")
+    bundle_parser.add_argument("--models", nargs="+")
+    install_parser = commands.add_parser("install", help="Unpack and verify a bundle")
+    install_parser.add_argument("bundle")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(levelname)s %(message)s")
+
+    try:
+        if args.command == "fetch":
+            for model in args.models or configured_models():
+                manifest = fetch(model, args.revision)
+                size = sum(entry["size"] for entry in manifest["files"].values())
+                print(f"{model}: {len(manifest['files'])} files, {size / 2**20:.1f}MB")
+        elif args.command == "verify":
+            problems = [problem for model in args.models or configured_models() for problem in verify(model, hashes=True)]
+            for problem in problems:
+                print(problem)
+            if problems:
+                sys.exit(1)
+            print("All snapshots intact")
+        elif args.command == "bundle":
+            models = build_bundle(args.output, args.models or configured_models())
+            print(f"Bundled {', '.join(models)} into {args.output}")
+        else:
+            models = install_bundle(args.bundle)
+            print(f"Installed {', '.join(models)} into {snapshots_dir()}")
+    except ModelArtifactError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,68 @@
 """Base class for AI models with caching and error handling"""
 
+import functools
 import logging
+import sys
+import threading
+import time
 from typing import Any, Dict, Optional
 from functools import lru_cache
-import torch
+
+from app.metrics import MODEL_LOAD_LATENCY, MODEL_LOADED, MODEL_MEMORY, model_memory_bytes
+from app.tracing import span
+from app.ai.lifecycle import model_manager, rss_bytes
 
 logger = logging.getLogger(__name__)
 
+# One instance per model class, see BaseModel.shared
+_shared_instances: Dict[type, "BaseModel"] = {}
+_shared_lock = threading.Lock()
+
+
+def uses_model(fn):
+    """Mark a method as using the weights: loads them and pins them against unloading for the call"""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        self.acquire()
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            self.release()
+    return wrapper
+
+
 class BaseModel:
     """Base class for AI models with common functionality"""
     
+    # Rule-based subclasses set this to False; the lifecycle manager ignores them
+    has_weights = True
+    
     def __init__(self, model_name: str, device: str = "cpu"):
         self.model_name = model_name
         self.device = device
         self.model = None
         self.tokenizer = None
         self._loaded = False
+        self._load_lock = threading.Lock()
+        self.active_calls = 0
+        self.last_used = 0.0
+        self.param_bytes: Optional[int] = None
+        self.rss_delta_bytes: Optional[int] = None
+        # Set for weights inherited from a pre-fork master, see app.ai.prefork
+        self.pinned = False
+        model_manager.register(self)
+    
+    @classmethod
+    def shared(cls):
+        """The process-wide instance of this model, so its weights are loaded once"""
+        with _shared_lock:
+            if cls not in _shared_instances:
+                _shared_instances[cls] = cls()
+            return _shared_instances[cls]
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
         
     def load_model(self):
         """Load model - to be implemented by subclasses"""
@@ -24,9 +71,55 @@ class BaseModel:
     def ensure_loaded(self):
         """Ensure model is loaded before inference"""
         if not self._loaded:
-            logger.info(f"Loading model: {self.model_name}")
-            self.load_model()
-            self._loaded = True
+            # Evict other models first if loading this one would bust the RSS budget
+            if self.has_weights:
+                model_manager.make_room(loading=self)
+            # Several inference threads may hit a cold model at once
+            with self._load_lock:
+                if not self._loaded:
+                    logger.info(f"Loading model: {self.model_name}")
+                    started = time.perf_counter()
+                    rss_before = rss_bytes()
+                    with span("model.load", model=self.model_name):
+                        self.load_model()
+                    MODEL_LOAD_LATENCY.labels(self.model_name).observe(time.perf_counter() - started)
+                    self.rss_delta_bytes = rss_bytes() - rss_before
+                    self._loaded = True
+                    self._record_loaded()
+    
+    def acquire(self):
+        """Pin the model for a call, loading it if needed"""
+        with self._load_lock:
+            self.active_calls += 1
+        try:
+            self.ensure_loaded()
+        except BaseException:
+            self.release()
+            raise
+        self.last_used = time.monotonic()
+    
+    def release(self):
+        with self._load_lock:
+            self.active_calls -= 1
+        self.last_used = time.monotonic()
+    
+    def try_unload(self) -> bool:
+        """Unload unless pinned or a call is using the model; returns whether it was unloaded"""
+        with self._load_lock:
+            if not self._loaded or self.pinned or self.active_calls:
+                return False
+            self.unload_model()
+            return True
+    
+    def _torch_modules(self) -> tuple:
+        """Torch modules holding this model's weights, for the memory gauge"""
+        return (self.model,)
+    
+    def _record_loaded(self):
+        MODEL_LOADED.labels(self.model_name).set(1)
+        self.param_bytes = model_memory_bytes(*self._torch_modules())
+        if self.param_bytes is not None:
+            MODEL_MEMORY.labels(self.model_name).set(self.param_bytes)
             
     def predict(self, text: str) -> Any:
         """Make prediction - to be implemented by subclasses"""
@@ -40,6 +133,10 @@ class BaseModel:
             self.model = None
             self.tokenizer = None
             self._loaded = False
-            if torch.cuda.is_available():
+            MODEL_LOADED.labels(self.model_name).set(0)
+            MODEL_MEMORY.labels(self.model_name).set(0)
+            # torch is only imported by model loading; don't pull it in just to unload
+            torch = sys.modules.get("torch")
+            if torch is not None and torch.cuda.is_available():
                 torch.cuda.empty_cache()
             logger.info(f"Unloaded model: {self.model_name}")
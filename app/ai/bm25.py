@@ -0,0 +1,148 @@
+"""In-process BM25 index over resume text and rank fusion helpers"""
+
+from typing import List, Dict, Tuple, Iterable, Hashable, Optional
+from collections import Counter
+from datetime import datetime
+import math
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps tech tokens like "c++", "c#", "node.js" and "ci/cd" parts intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "our", "the", "to", "we", "will", "with", "you", "your"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a mutable document set.
+
+    `watermark` and `refreshed_at` track how far an index filled from a
+    table has read it (see app.resumes.text_index).
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.doc_lengths: Dict[Hashable, int] = {}
+        self.doc_terms: Dict[Hashable, List[str]] = {}
+        self.total_length = 0
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id: Hashable, text: str):
+        """Index (or re-index) a document"""
+        self.remove(doc_id)
+        tokens = tokenize(text or "")
+        counts = Counter(tokens)
+
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+        self.doc_lengths[doc_id] = len(tokens)
+        self.doc_terms[doc_id] = list(counts)
+        self.total_length += len(tokens)
+
+    def replace(self, other: "BM25Index"):
+        """Take over the documents of an index built elsewhere (e.g. on another thread)"""
+        self.postings, self.doc_lengths, self.doc_terms = other.postings, other.doc_lengths, other.doc_terms
+        self.total_length = other.total_length
+        self.watermark = other.watermark
+
+    def remove(self, doc_id: Hashable):
+        """Drop a document from the index"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+
+        self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def score(self, query: str, doc_ids: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, float]:
+        """BM25 score of every matching document (optionally restricted to doc_ids)"""
+        if not self.doc_lengths:
+            return {}
+
+        allowed = set(doc_ids) if doc_ids is not None else None
+        total_docs = len(self.doc_lengths)
+        avg_length = self.total_length / total_docs or 1.0
+        scores: Dict[Hashable, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            df = len(posting)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+            # Walk whichever side is smaller
+            if allowed is not None and len(allowed) < len(posting):
+                items = ((doc_id, posting[doc_id]) for doc_id in allowed if doc_id in posting)
+            else:
+                items = posting.items()
+
+            for doc_id, tf in items:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """Best matching documents first"""
+        ranked = sorted(self.score(query, doc_ids).items(), key=lambda x: x[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Hashable]],
+    k: int = 60,
+    weights: Optional[List[float]] = None
+) -> Dict[Hashable, float]:
+    """
+    Fuse several rankings (best first) with reciprocal rank fusion.
+    Scores are normalized so that ranking first everywhere gives 1.0.
+    """
+    weights = weights or [1.0] * len(rankings)
+    best_possible = sum(weights) / (k + 1)
+    fused: Dict[Hashable, float] = {}
+
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+
+    return {doc_id: score / best_possible for doc_id, score in fused.items()}
+
+
+# Resume text index, filled from the resumes table by app.resumes.text_index
+# and kept in sync by ResumeService on create and delete
+resume_text_index = BM25Index()
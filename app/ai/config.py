@@ -10,6 +10,7 @@ logger = logging.getLogger(__name__)
 MODEL_CONFIGS = {
     "ner": {
         "model_name": "dbmdz/bert-large-cased-finetuned-conll03-english",
+        "fallback_model_name": "dslim/bert-base-NER",
         "task": "ner",
         "aggregation_strategy": "simple",
         "device": -1  # CPU, use 0 for GPU
@@ -22,6 +23,7 @@ MODEL_CONFIGS = {
     },
     "similarity": {
         "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+        "fallback_model_name": "sentence-transformers/all-MiniLM-L6-v2",
         "device": "cpu"
     },
     "zero_shot": {
@@ -1,7 +1,7 @@
 """Classify experience level from resume text"""
 
 import re
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 import logging
 from app.ai.base import BaseModel
@@ -9,13 +9,72 @@ from app.ai.config import EXPERIENCE_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+# Display label for each experience level
+LEVEL_LABELS = {
+    "entry": "Entry Level",
+    "mid": "Mid-Level",
+    "senior": "Senior",
+    "executive": "Executive"
+}
+
+# Levels are checked in EXPERIENCE_KEYWORDS order, the first one wins
+LEVEL_PRIORITY = {level: i for i, level in enumerate(EXPERIENCE_KEYWORDS)}
+LEVELS_BY_PRIORITY = list(EXPERIENCE_KEYWORDS)
+
+# Common job title keywords
+TITLE_KEYWORDS = [
+    "engineer", "developer", "manager", "analyst", "designer",
+    "architect", "consultant", "specialist", "coordinator",
+    "director", "lead", "senior", "junior", "principal",
+    "head of", "vp", "vice president", "chief", "intern"
+]
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+
+def _keyword_alternation(keywords: List[str]) -> str:
+    """Build a regex alternation, longest keywords first"""
+    return "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+
+
+# One zero-width lookahead per position with a named group per level. Alternatives
+# are ordered by level priority, so the highest-priority level wins at each offset
+# and overlapping keywords (e.g. "cto" inside "director") are still seen.
+KEYWORD_PATTERN = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{level}>{_keyword_alternation(keywords)})"
+        for level, keywords in EXPERIENCE_KEYWORDS.items()
+    ) + ")"
+)
+
+TITLE_PATTERN = re.compile(_keyword_alternation(TITLE_KEYWORDS))
+
+YEARS_PATTERN = re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience')
+
+# Month is either a name ("Jan", "January", "Sept.") or a number followed by "/"
+_MONTH = r'(?:(?P<{0}_name>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*,?\s*|(?P<{0}_num>1[0-2]|0?[1-9])\s*/\s*)?'
+
+DATE_RANGE_PATTERN = re.compile(
+    r'\b' + _MONTH.format("start") + r'(?P<start_year>\d{4})'
+    r'\s*(?:-|–|—|to)\s*'
+    r'(?:' + _MONTH.format("end") + r'(?P<end_year>\d{4})\b|(?P<open>present|current|now)\b)'
+)
+
+SINCE_PATTERN = re.compile(r'since\s*(\d{4})')
+
+
 class ExperienceClassifier(BaseModel):
     """Classify candidate experience level"""
     
+    has_weights = False
+    
     def __init__(self):
         super().__init__("experience_classifier", "cpu")
         self.experience_keywords = EXPERIENCE_KEYWORDS
-        
+    
     def load_model(self):
         """No model needed for rule-based classification"""
         pass
@@ -25,7 +84,7 @@ class ExperienceClassifier(BaseModel):
         text_lower = text.lower()
         
         # Extract years of experience
-        years = self._extract_years_of_experience(text)
+        years = self._extract_years_of_experience(text_lower)
         
         # Check for experience level keywords
         level = self._classify_by_keywords(text_lower)
@@ -35,7 +94,7 @@ class ExperienceClassifier(BaseModel):
             level = self._classify_by_years(years)
         
         # Extract job titles for additional context
-        job_titles = self._extract_job_titles(text)
+        job_titles = self._extract_job_titles(self._build_line_index(text, text_lower))
         
         return {
             "experience_years": years,
@@ -44,63 +103,95 @@ class ExperienceClassifier(BaseModel):
             "confidence": self._calculate_confidence(level, years, job_titles)
         }
     
-    def _extract_years_of_experience(self, text: str) -> Optional[float]:
-        """Extract total years of experience from text"""
+    def _build_line_index(self, text: str, text_lower: str) -> List[Tuple[str, str]]:
+        """Pair each original line with its lowercased form"""
+        return list(zip(text.split('\n'), text_lower.split('\n')))
+    
+    def _extract_years_of_experience(self, text_lower: str) -> Optional[float]:
+        """Extract total years of experience from lowercased text"""
         
         # Pattern 1: "X years of experience"
-        pattern1 = r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'
-        match1 = re.search(pattern1, text, re.IGNORECASE)
-        if match1:
-            return float(match1.group(1))
-        
-        # Pattern 2: Date ranges (e.g., "2018 - 2023")
-        date_pattern = r'(\d{4})\s*[-–]\s*(\d{4}|present|current)'
-        date_matches = re.findall(date_pattern, text, re.IGNORECASE)
-        
-        if date_matches:
-            total_years = 0
-            current_year = datetime.now().year
-            
-            for start, end in date_matches:
-                start_year = int(start)
-                if end.lower() in ['present', 'current']:
-                    end_year = current_year
-                else:
-                    end_year = int(end)
-                
-                years_diff = end_year - start_year
-                if 0 <= years_diff <= 50:  # Sanity check
-                    total_years += years_diff
-            
-            if total_years > 0:
-                return float(total_years)
+        match = YEARS_PATTERN.search(text_lower)
+        if match:
+            return float(match.group(1))
+        
+        # Pattern 2: Date ranges (e.g., "2018 - 2023", "Jan 2020 - Present"),
+        # merged so that overlapping jobs are only counted once
+        intervals = self._extract_date_ranges(text_lower)
+        if intervals:
+            total_months = self._merge_timeline(intervals)
+            if total_months > 0:
+                return round(total_months / 12, 1)
         
         # Pattern 3: "Since YYYY"
-        since_pattern = r'since\s*(\d{4})'
-        since_match = re.search(since_pattern, text, re.IGNORECASE)
+        since_match = SINCE_PATTERN.search(text_lower)
         if since_match:
             start_year = int(since_match.group(1))
             return float(datetime.now().year - start_year)
         
         return None
     
+    def _extract_date_ranges(self, text_lower: str) -> List[Tuple[int, int]]:
+        """Extract date ranges as (start, end) month offsets"""
+        now = datetime.now()
+        intervals = []
+        
+        for match in DATE_RANGE_PATTERN.finditer(text_lower):
+            start = self._to_months(
+                match.group("start_year"), match.group("start_name"), match.group("start_num")
+            )
+            if match.group("open"):
+                end = now.year * 12 + now.month - 1
+            else:
+                end = self._to_months(
+                    match.group("end_year"), match.group("end_name"), match.group("end_num")
+                )
+            
+            if 0 <= end - start <= 50 * 12:  # Sanity check
+                intervals.append((start, end))
+        
+        return intervals
+    
+    def _to_months(self, year: str, month_name: Optional[str], month_num: Optional[str]) -> int:
+        """Convert a year and optional month to a month offset"""
+        if month_name:
+            month = MONTHS[month_name]
+        elif month_num:
+            month = int(month_num)
+        else:
+            month = 1
+        return int(year) * 12 + month - 1
+    
+    def _merge_timeline(self, intervals: List[Tuple[int, int]]) -> int:
+        """Merge overlapping intervals and return the covered months"""
+        total = 0
+        current_start, current_end = None, None
+        
+        for start, end in sorted(intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        
+        if current_end is not None:
+            total += current_end - current_start
+        
+        return total
+    
     def _classify_by_keywords(self, text_lower: str) -> Optional[str]:
-        """Classify based on keyword matching"""
-        
-        # Check each experience level
-        for level, keywords in self.experience_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if level == "entry":
-                        return "Entry Level"
-                    elif level == "mid":
-                        return "Mid-Level"
-                    elif level == "senior":
-                        return "Senior"
-                    elif level == "executive":
-                        return "Executive"
+        """Classify based on keyword matching, highest-priority level wins"""
+        best = None
+        
+        for match in KEYWORD_PATTERN.finditer(text_lower):
+            priority = LEVEL_PRIORITY[match.lastgroup]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
         
-        return None
+        return LEVEL_LABELS[LEVELS_BY_PRIORITY[best]] if best is not None else None
     
     def _classify_by_years(self, years: float) -> str:
         """Classify based on years of experience"""
@@ -113,29 +204,18 @@ class ExperienceClassifier(BaseModel):
         else:
             return "Executive"
     
-    def _extract_job_titles(self, text: str) -> List[str]:
-        """Extract likely job titles from text"""
+    def _extract_job_titles(self, line_index: List[Tuple[str, str]]) -> List[str]:
+        """Extract likely job titles from the line index"""
         job_titles = []
         
-        # Common job title patterns
-        title_keywords = [
-            "engineer", "developer", "manager", "analyst", "designer",
-            "architect", "consultant", "specialist", "coordinator",
-            "director", "lead", "senior", "junior", "principal",
-            "head of", "vp", "vice president", "chief", "intern"
-        ]
-        
-        lines = text.split('\n')
-        for line in lines:
-            line_lower = line.lower().strip()
-            
+        for line, line_lower in line_index:
             # Check if line contains job title keywords
-            for keyword in title_keywords:
-                if keyword in line_lower and len(line) < 100:  # Likely a title, not a paragraph
-                    job_titles.append(line.strip())
+            if len(line) < 100 and TITLE_PATTERN.search(line_lower):  # Likely a title, not a paragraph
+                job_titles.append(line.strip())
+                if len(job_titles) == 5:
                     break
         
-        return job_titles[:5]  # Return top 5 job titles
+        return job_titles  # Return top 5 job titles
     
     def _calculate_confidence(self, level: str, years: Optional[float], job_titles: List[str]) -> float:
         """Calculate confidence score for the classification"""
@@ -150,4 +230,4 @@ class ExperienceClassifier(BaseModel):
         if job_titles:
             confidence += 0.1 * min(len(job_titles), 3)
         
-        return min(confidence, 1.0)
\ No newline at end of file
+        return min(confidence, 1.0)
@@ -0,0 +1,124 @@
+"""Inference worker pool and admission control for model-backed requests"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Per-call overhead (tokenizer setup, pipeline dispatch) expressed in characters,
+# so short texts don't skew the per-character speed estimate
+MIN_CALL_CHARS = 1000
+
+# Model calls run here instead of on the event loop; torch and the tokenizers
+# release the GIL, and a bounded pool keeps concurrent inference from thrashing
+inference_executor = ThreadPoolExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    thread_name_prefix="inference"
+)
+
+
+class AdmissionController:
+    """
+    Tracks the inference work in flight, measured in characters of input text,
+    and projects how long a new request would wait behind it. Service speed is
+    learned from completed calls (EWMA of seconds per character).
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.INFERENCE_WORKERS,
+        latency_target: float = settings.ADMISSION_LATENCY_TARGET_MS / 1000,
+        bulk_share: float = settings.ADMISSION_BULK_SHARE,
+        seconds_per_char: float = settings.ADMISSION_INITIAL_MS_PER_KCHAR / 1e6,
+        smoothing: float = 0.2
+    ):
+        self.workers = max(workers, 1)
+        self.latency_target = latency_target
+        self.bulk_share = bulk_share
+        self.seconds_per_char = seconds_per_char
+        self.smoothing = smoothing
+        self.inflight_chars = 0
+        self.inflight_requests = 0
+        self._lock = threading.Lock()
+
+    def projected_latency(self, chars: int = 0) -> float:
+        """Seconds until a request of `chars` would finish given the work ahead of it"""
+        return (self.inflight_chars + chars) * self.seconds_per_char / self.workers
+
+    def try_admit(self, chars: int, priority: str = INTERACTIVE) -> bool:
+        """
+        Reserve capacity for a request. Bulk requests only get the first
+        `bulk_share` of the latency budget, leaving headroom for interactive ones.
+        """
+        limit = self.latency_target * (self.bulk_share if priority == BULK else 1.0)
+        chars = max(chars, MIN_CALL_CHARS)
+        with self._lock:
+            # An idle pool always admits, however large the request
+            if self.inflight_requests and self.projected_latency(chars) > limit:
+                return False
+            self.inflight_chars += chars
+            self.inflight_requests += 1
+            return True
+
+    def release(self, chars: int):
+        """Return capacity reserved by try_admit"""
+        chars = max(chars, MIN_CALL_CHARS)
+        with self._lock:
+            self.inflight_chars = max(self.inflight_chars - chars, 0)
+            self.inflight_requests = max(self.inflight_requests - 1, 0)
+
+    def observe(self, chars: int, seconds: float):
+        """Fold one completed inference call into the speed estimate"""
+        chars = max(chars, MIN_CALL_CHARS)
+        with self._lock:
+            self.seconds_per_char += self.smoothing * (seconds / chars - self.seconds_per_char)
+
+    def retry_after(self) -> float:
+        """Seconds until the work in flight should have drained below the target"""
+        return max(self.projected_latency() - self.latency_target, 0.0) + 1.0
+
+
+admission_controller = AdmissionController()
+
+
+class AdmissionTicket:
+    """One admitted request's reservation; released once, early if the request won't use the pool"""
+
+    def __init__(self, controller: AdmissionController, chars: int):
+        self.controller = controller
+        self.chars = chars
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.controller.release(self.chars)
+
+
+def release_admission(request) -> None:
+    """Give back the request's admission reservation, e.g. once it settles on the fast profile"""
+    ticket = getattr(request.state, "admission", None)
+    if ticket is not None:
+        ticket.release()
+
+
+async def run_inference(fn: Callable[..., Any], *args, chars: Optional[int] = None) -> Any:
+    """Run a blocking model call on the inference pool and record its speed"""
+    def timed():
+        started = time.perf_counter()
+        result = fn(*args)
+        if chars:
+            admission_controller.observe(chars, time.perf_counter() - started)
+        return result
+
+    # Carry the request's trace context onto the worker thread
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, context.run, timed)
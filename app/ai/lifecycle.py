@@ -0,0 +1,177 @@
+"""
+Model lifecycle: idle unloading and a per-process RSS budget.
+
+Every BaseModel registers itself here. A background sweep unloads models
+nobody has used for MODEL_IDLE_TTL_SECONDS, and evicts least recently used
+models while the process is over MODEL_RSS_BUDGET_MB. Models in the middle
+of a call are never unloaded; they reload on their next use.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.metrics import MODEL_UNLOADS
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _return_memory_to_os():
+    """Collect and ask glibc to hand freed arenas back, so RSS actually drops"""
+    gc.collect()
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return
+    try:
+        ctypes.CDLL(libc_name).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class ModelManager:
+    """Tracks registered models and unloads the idle or least recently used ones"""
+
+    def __init__(
+        self,
+        idle_ttl: float = settings.MODEL_IDLE_TTL_SECONDS,
+        rss_budget_mb: float = settings.MODEL_RSS_BUDGET_MB,
+        interval: float = settings.MODEL_SWEEP_INTERVAL_SECONDS
+    ):
+        self.idle_ttl = idle_ttl
+        self.rss_budget = int(rss_budget_mb * 1024 * 1024)
+        self.interval = interval
+        self._models: "weakref.WeakSet" = weakref.WeakSet()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, model):
+        self._models.add(model)
+
+    def models(self) -> List[Any]:
+        """Registered models that hold weights (rule-based ones are skipped)"""
+        return [model for model in list(self._models) if model.has_weights]
+
+    def over_budget(self) -> bool:
+        return bool(self.rss_budget) and rss_bytes() > self.rss_budget
+
+    def sweep(self) -> List[str]:
+        """Unload idle models, then evict until under the RSS budget; returns what was unloaded"""
+        unloaded = []
+        now = time.monotonic()
+
+        if self.idle_ttl:
+            for model in self.models():
+                if model.is_loaded and now - model.last_used > self.idle_ttl and model.try_unload():
+                    MODEL_UNLOADS.labels(model.model_name, "idle").inc()
+                    unloaded.append(model.model_name)
+
+        if unloaded:
+            _return_memory_to_os()
+
+        return unloaded + self.make_room()
+
+    def make_room(self, loading: Any = None) -> List[str]:
+        """Evict least recently used models (other than `loading`) while over the RSS budget"""
+        unloaded = []
+        if not self.over_budget():
+            return unloaded
+
+        candidates = sorted(
+            (model for model in self.models() if model.is_loaded and model is not loading),
+            key=lambda model: model.last_used
+        )
+        for model in candidates:
+            if not self.over_budget():
+                break
+            if model.try_unload():
+                MODEL_UNLOADS.labels(model.model_name, "rss_budget").inc()
+                unloaded.append(model.model_name)
+                _return_memory_to_os()
+
+        if self.over_budget():
+            logger.warning(
+                f"RSS {rss_bytes() // 2**20}MB still over the {self.rss_budget // 2**20}MB budget "
+                f"with {len(unloaded)} models evicted"
+            )
+        return unloaded
+
+    def unload_all(self) -> List[str]:
+        """Unload every model not in use, regardless of idle time"""
+        unloaded = []
+        for model in self.models():
+            if model.try_unload():
+                MODEL_UNLOADS.labels(model.model_name, "manual").inc()
+                unloaded.append(model.model_name)
+        if unloaded:
+            _return_memory_to_os()
+        return unloaded
+
+    def report(self) -> Dict[str, Any]:
+        """Process RSS and per-model state, for the admin endpoint"""
+        now = time.monotonic()
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": rss_bytes(),
+            "rss_budget_bytes": self.rss_budget or None,
+            "idle_ttl_seconds": self.idle_ttl or None,
+            "models": [
+                {
+                    "model": model.model_name,
+                    "class": type(model).__name__,
+                    "loaded": model.is_loaded,
+                    "pinned": model.pinned,
+                    "in_use": model.active_calls,
+                    "idle_seconds": round(now - model.last_used, 1) if model.last_used else None,
+                    "param_bytes": model.param_bytes,
+                    "rss_delta_bytes": model.rss_delta_bytes
+                }
+                for model in self.models()
+            ]
+        }
+
+    def start(self):
+        """Run sweep() every `interval` seconds on a daemon thread"""
+        if self._thread is not None or not (self.idle_ttl or self.rss_budget):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-lifecycle", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                unloaded = self.sweep()
+                if unloaded:
+                    logger.info(f"Unloaded models: {', '.join(unloaded)} (RSS now {rss_bytes() // 2**20}MB)")
+            except Exception as e:
+                logger.error(f"Model sweep failed: {e}")
+
+
+model_manager = ModelManager()
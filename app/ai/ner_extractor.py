@@ -1,47 +1,70 @@
 """Named Entity Recognition for extracting names, companies, dates, etc."""
 
 from typing import List, Dict, Any
-from transformers import pipeline
 import logging
 import re
 from datetime import datetime
-from app.ai.base import BaseModel
+from app.ai.base import BaseModel, uses_model
+from app.ai.artifacts import configure_hub, model_source
 from app.ai.config import MODEL_CONFIGS
+from app.ai.remote import RemoteNERPipeline
+from app.config import settings
+from app.metrics import record_fallback
+from app.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 class NERExtractor(BaseModel):
     """Extract named entities from resume text"""
     
-    def __init__(self):
+    def __init__(self, backend: str = settings.INFERENCE_BACKEND):
         config = MODEL_CONFIGS["ner"]
         super().__init__(config["model_name"], config.get("device", -1))
         self.pipeline = None
-        
+        self.backend = backend
+        # Remote weights live in the inference server, not this process
+        self.has_weights = backend != "remote"
+    
     def load_model(self):
         """Load NER model"""
+        if self.backend == "remote":
+            self.pipeline = RemoteNERPipeline()
+            return
+        # Imported on first load: transformers and torch take seconds and hundreds of MB
+        configure_hub()
+        from transformers import pipeline
+        
         try:
             self.pipeline = pipeline(
                 "ner",
-                model=self.model_name,
+                model=model_source(self.model_name),
                 aggregation_strategy="simple",
                 device=self.device
             )
             logger.info("NER model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading NER model: {e}")
+            record_fallback("ner", "fallback_model")
             # Fallback to smaller model if large one fails
             self.pipeline = pipeline(
                 "ner",
-                model="dslim/bert-base-NER",
+                model=model_source(MODEL_CONFIGS["ner"]["fallback_model_name"]),
                 aggregation_strategy="simple",
                 device=self.device
             )
-            
+    
+    def _torch_modules(self) -> tuple:
+        return (getattr(self.pipeline, "model", None),)
+    
+    def unload_model(self):
+        """Drop the pipeline too; it holds the only reference to the weights"""
+        self.pipeline = None
+        super().unload_model()
+    
+    @traced("ner.extract_entities")
+    @uses_model
     def extract_entities(self, text: str) -> Dict[str, Any]:
         """Extract all entities from text"""
-        self.ensure_loaded()
-        
         try:
             # Get raw entities
             entities = self.pipeline(text)
@@ -56,10 +79,10 @@ class NERExtractor(BaseModel):
             }
             
             for entity in entities:
-
+                
                 entity_type = entity['entity_group']
                 entity_text = entity['word'].strip()
-
+                
                 # Skip BERT subword tokens
                 if entity_text.startswith('##'):
                     continue
@@ -89,7 +112,7 @@ class NERExtractor(BaseModel):
                 "work_history": work_history,
                 "candidate_name": organized["persons"][0] if organized["persons"] else None
             }
-            
+        
         except Exception as e:
             logger.error(f"Error extracting entities: {e}")
             return self._fallback_extraction(text)
@@ -110,7 +133,7 @@ class NERExtractor(BaseModel):
             (?:\(\d{2,4}\)|\d{2,4})[\s.-]?      # area code, either (123) or 123
             \d{3,4}[\s.-]?\d{3,4}               # local number
         """
-
+        
         phones = re.findall(phone_pattern, text, re.VERBOSE)
         if phones:
             contact["phone"] = phones[0]
@@ -126,7 +149,7 @@ class NERExtractor(BaseModel):
         github = re.search(github_pattern, text, re.IGNORECASE)
         if github:
             contact["github"] = github.group()
-            
+        
         return contact
     
     def _extract_work_history(self, text: str, entities: Dict) -> List[Dict]:
@@ -177,7 +200,12 @@ class NERExtractor(BaseModel):
     def _fallback_extraction(self, text: str) -> Dict[str, Any]:
         """Fallback extraction using regex when model fails"""
         logger.info("Using fallback extraction method")
-        
+        record_fallback("ner", "regex_extraction")
+        return self.extract_entities_fast(text)
+    
+    @traced("ner.extract_entities_fast")
+    def extract_entities_fast(self, text: str) -> Dict[str, Any]:
+        """Regex-only extraction (contacts, first-line name); never loads the model"""
         contact_info = self._extract_contact_info(text)
         
         # Simple name extraction (first line often contains name)
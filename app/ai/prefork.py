@@ -0,0 +1,70 @@
+"""
+Pre-fork model sharing.
+
+Under gunicorn with preload_app (see gunicorn.conf.py) the master calls
+share_models() before forking, so every worker inherits one copy of the
+weights instead of loading its own. Tensors are moved to shared memory,
+which keeps the pages shared even if something writes to them, and the
+Python objects are frozen out of the GC so collections in the workers don't
+dirty (and copy) the pages holding them.
+"""
+
+import gc
+import logging
+import os
+import time
+from typing import List
+
+from app.ai.lifecycle import rss_bytes
+from app.ai.ner_extractor import NERExtractor
+from app.ai.similarity import SimilarityCalculator
+
+logger = logging.getLogger(__name__)
+
+# Models with weights; the rule-based ones cost nothing to load per worker
+SHARED_MODELS = (NERExtractor, SimilarityCalculator)
+
+
+def _share_module(module):
+    """Freeze a torch module for inference and move its tensors to shared memory"""
+    module.eval()
+    for param in module.parameters():
+        param.requires_grad_(False)
+    module.share_memory()
+
+
+def share_models() -> List[str]:
+    """Load the shared instance of every model in this process and pin it there; call before forking"""
+    # Fast tokenizers refuse to use their thread pool after a fork anyway; say so up front
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    started = time.perf_counter()
+    rss_before = rss_bytes()
+    shared = []
+
+    for model_class in SHARED_MODELS:
+        model = model_class.shared()
+        if not model.has_weights:
+            # INFERENCE_BACKEND="remote": nothing to share
+            continue
+        try:
+            model.ensure_loaded()
+        except Exception as e:
+            # Workers fall back to loading it themselves on first use
+            logger.error(f"Could not preload {model.model_name}: {e}")
+            continue
+        for module in model._torch_modules():
+            if module is not None:
+                _share_module(module)
+        # Unloading in a worker frees nothing while the master holds the pages
+        model.pinned = True
+        shared.append(model.model_name)
+
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        f"Preloaded {len(shared)} models for forked workers in {time.perf_counter() - started:.1f}s "
+        f"(+{(rss_bytes() - rss_before) // 2**20}MB): {', '.join(shared)}"
+    )
+    return shared
@@ -0,0 +1,178 @@
+"""
+Client side of the out-of-process inference server (app.ai.server).
+
+With INFERENCE_BACKEND="remote" the NER and similarity models hold these
+proxies instead of their weights, and every call goes over INFERENCE_SOCKET.
+The proxies mimic the calls the models already make (a SentenceTransformer's
+encode, a transformers pipeline call), so the model code is the same for
+both backends.
+
+Wire format: every message is a frame, a big-endian uint32 length followed
+by that many bytes.
+    request:  op (uint8), count (uint32), then count texts as uint32 length + UTF-8
+    response: status (uint8, 0 ok / 1 error), then
+              OP_ENCODE: rows (uint32), dim (uint32), rows * dim little-endian float32
+              OP_NER:    UTF-8 JSON, one entity list per text
+              error:     UTF-8 message
+"""
+
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+from typing import Any, List, Sequence, Union
+
+import numpy as np
+
+from app.config import settings
+from app.metrics import record_fallback
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+OP_ENCODE = 1
+OP_NER = 2
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_FRAME = 64 * 1024 * 1024
+
+_LENGTH = struct.Struct("!I")
+_REQUEST_HEAD = struct.Struct("!BI")
+_MATRIX_HEAD = struct.Struct("!II")
+
+
+class InferenceServerError(RuntimeError):
+    """The inference server was unreachable or failed the call"""
+
+
+def pack_request(op: int, texts: Sequence[str]) -> bytes:
+    parts = [_REQUEST_HEAD.pack(op, len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_request(body: bytes):
+    """(op, texts) from a request frame body"""
+    op, count = _REQUEST_HEAD.unpack_from(body)
+    offset = _REQUEST_HEAD.size
+    texts = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        texts.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    return op, texts
+
+
+def pack_matrix(matrix: np.ndarray) -> bytes:
+    matrix = np.ascontiguousarray(matrix, dtype="<f4")
+    return _MATRIX_HEAD.pack(*matrix.shape) + matrix.tobytes()
+
+
+def unpack_matrix(payload: bytes) -> np.ndarray:
+    rows, dim = _MATRIX_HEAD.unpack_from(payload)
+    return np.frombuffer(payload, dtype="<f4", offset=_MATRIX_HEAD.size, count=rows * dim).reshape(rows, dim)
+
+
+def pack_entities(entities: List[List[dict]]) -> bytes:
+    # Pipelines return numpy scalars for scores and offsets
+    return json.dumps(entities, separators=(",", ":"), default=lambda value: value.item()).encode("utf-8")
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        buffer += chunk
+    return bytes(buffer)
+
+
+class InferenceClient:
+    """
+    Blocking client with one connection per thread, so each inference pool
+    thread has a single request in flight and needs no request ids.
+    Connections are re-opened after errors and after a fork.
+    """
+
+    def __init__(self, path: str = settings.INFERENCE_SOCKET, timeout: float = settings.MODEL_INFERENCE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None and self._local.pid == os.getpid():
+            return sock
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        self._local.sock = sock
+        self._local.pid = os.getpid()
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def call(self, op: int, texts: Sequence[str]) -> bytes:
+        """Send one request and return the response payload"""
+        request = pack_request(op, texts)
+        with span("inference.remote", op=op, texts=len(texts)):
+            try:
+                sock = self._connection()
+                sock.sendall(_LENGTH.pack(len(request)) + request)
+                (length,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+                response = _recv_exactly(sock, length)
+            except (OSError, ConnectionError) as e:
+                # Half-read frames leave the stream unusable
+                self._close()
+                record_fallback("inference_server", "unavailable")
+                raise InferenceServerError(f"Inference server at {self.path} failed: {e}") from e
+
+        if response[0] != STATUS_OK:
+            raise InferenceServerError(response[1:].decode("utf-8", "replace"))
+        return response[1:]
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return unpack_matrix(self.call(OP_ENCODE, texts))
+
+    def ner(self, texts: Sequence[str]) -> List[List[dict]]:
+        return json.loads(self.call(OP_NER, texts))
+
+
+inference_client = InferenceClient()
+
+
+class RemoteEncoder:
+    """Stands in for a SentenceTransformer: encode() returns a vector for a string, a matrix for a list"""
+
+    def __init__(self, client: InferenceClient = inference_client):
+        self.client = client
+
+    def encode(self, sentences: Union[str, Sequence[str]], **kwargs) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self.client.encode([sentences])[0]
+        return self.client.encode(list(sentences))
+
+
+class RemoteNERPipeline:
+    """Stands in for a transformers NER pipeline: a list of entities per text"""
+
+    def __init__(self, client: InferenceClient = inference_client):
+        self.client = client
+
+    def __call__(self, inputs: Union[str, Sequence[str]]) -> Any:
+        if isinstance(inputs, str):
+            return self.client.ner([inputs])[0]
+        return self.client.ner(list(inputs))
@@ -0,0 +1,179 @@
+"""
+Out-of-process inference server:
+
+    python -m app.ai.server
+
+Owns the NER and similarity models and serves API workers running with
+INFERENCE_BACKEND="remote" over a Unix socket (protocol in app.ai.remote).
+Requests from all connections, and so from all workers, are batched per
+model: a batch closes at INFERENCE_SERVER_MAX_BATCH texts or after
+INFERENCE_SERVER_BATCH_WAIT_MS, whichever comes first.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.ai.ner_extractor import NERExtractor
+from app.ai.similarity import SimilarityCalculator
+from app.ai.remote import (
+    MAX_FRAME, OP_ENCODE, OP_NER, STATUS_ERROR, STATUS_OK,
+    pack_entities, pack_matrix, unpack_request
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Batcher:
+    """Collects texts from concurrent requests and runs them through one model call"""
+
+    def __init__(self, name: str, run: Callable[[List[str]], list], executor: ThreadPoolExecutor):
+        self.name = name
+        self.run = run
+        self.executor = executor
+        self.max_batch = settings.INFERENCE_SERVER_MAX_BATCH
+        self.max_wait = settings.INFERENCE_SERVER_BATCH_WAIT_MS / 1000
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+
+    async def submit(self, texts: List[str]) -> list:
+        """One result per text"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for item_texts, _ in pending for text in item_texts]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self.executor, self.run, texts)
+            except Exception as e:
+                logger.error(f"{self.name} batch of {len(texts)} failed: {e}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug(f"{self.name}: {len(pending)} requests, {len(texts)} texts in {time.perf_counter() - started:.3f}s")
+            offset = 0
+            for item_texts, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+class InferenceServer:
+    """Loads the models and answers framed requests from API workers"""
+
+    def __init__(self, path: str = settings.INFERENCE_SOCKET):
+        self.path = path
+        # The server always runs the models itself
+        self.similarity = SimilarityCalculator(backend="local")
+        self.ner = NERExtractor(backend="local")
+        # One thread per model: each batch already fills the CPU
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference-server")
+        self.batchers = {}
+
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        return self.similarity.model.encode(list(texts), batch_size=settings.INFERENCE_SERVER_MAX_BATCH)
+
+    def _extract(self, texts: Sequence[str]) -> list:
+        return self.ner.pipeline(list(texts))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    length = int.from_bytes(await reader.readexactly(4), "big")
+                except asyncio.IncompleteReadError:
+                    break
+                if length > MAX_FRAME:
+                    logger.warning(f"Dropping connection after a {length} byte frame")
+                    break
+                response = await self._respond(await reader.readexactly(length))
+                writer.write(len(response).to_bytes(4, "big") + response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, body: bytes) -> bytes:
+        try:
+            op, texts = unpack_request(body)
+            if op not in self.batchers:
+                raise ValueError(f"Unknown op {op}")
+            if not texts:
+                # Nothing to batch; the encode matrix still needs its width
+                if op == OP_ENCODE:
+                    dim = self.similarity.model.get_sentence_embedding_dimension()
+                    return bytes([STATUS_OK]) + pack_matrix(np.zeros((0, dim), dtype=np.float32))
+                return bytes([STATUS_OK]) + pack_entities([])
+            results = await self.batchers[op].submit(texts)
+            if op == OP_ENCODE:
+                return bytes([STATUS_OK]) + pack_matrix(np.asarray(results).reshape(len(texts), -1))
+            return bytes([STATUS_OK]) + pack_entities(results)
+        except Exception as e:
+            return bytes([STATUS_ERROR]) + str(e).encode("utf-8")
+
+    async def serve(self):
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        # Load before listening so workers never wait on a cold model
+        await loop.run_in_executor(self.executor, self.similarity.ensure_loaded)
+        await loop.run_in_executor(self.executor, self.ner.ensure_loaded)
+        logger.info(f"Models loaded in {time.perf_counter() - started:.1f}s")
+
+        self.batchers = {
+            OP_ENCODE: Batcher("encode", self._encode, self.executor),
+            OP_NER: Batcher("ner", self._extract, self.executor)
+        }
+        tasks = [asyncio.create_task(batcher.serve()) for batcher in self.batchers.values()]
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        os.chmod(self.path, 0o660)
+        logger.info(f"Inference server listening on {self.path} (pid {os.getpid()})")
+
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        async with server:
+            await stop.wait()
+
+        for task in tasks:
+            task.cancel()
+        os.unlink(self.path)
+        logger.info("Inference server stopped")
+
+
+def main():
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(InferenceServer().serve())
+
+
+if __name__ == "__main__":
+    main()
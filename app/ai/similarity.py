@@ -1,36 +1,51 @@
 """Text similarity for matching resumes to job descriptions"""
 
-from typing import List, Tuple, Dict
-from sentence_transformers import SentenceTransformer
+from typing import List, Tuple, Dict, Optional
 import numpy as np
 import logging
 import re
-from app.ai.base import BaseModel
+from app.ai.base import BaseModel, uses_model
+from app.ai.artifacts import configure_hub, model_source
 from app.ai.config import MODEL_CONFIGS
+from app.ai.remote import RemoteEncoder
+from app.config import settings
+from app.metrics import record_fallback
+from app.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 class SimilarityCalculator(BaseModel):
     """Calculate semantic similarity between texts"""
     
-    def __init__(self):
+    def __init__(self, backend: str = settings.INFERENCE_BACKEND):
         config = MODEL_CONFIGS["similarity"]
         super().__init__(config["model_name"], config.get("device", "cpu"))
+        self.backend = backend
+        # Remote weights live in the inference server, not this process
+        self.has_weights = backend != "remote"
         
     def load_model(self):
         """Load sentence transformer model"""
+        if self.backend == "remote":
+            self.model = RemoteEncoder()
+            return
+        # Imported on first load: sentence_transformers pulls in torch and transformers
+        configure_hub()
+        from sentence_transformers import SentenceTransformer
+        
         try:
-            self.model = SentenceTransformer(self.model_name)
+            self.model = SentenceTransformer(model_source(self.model_name))
             logger.info("Similarity model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading similarity model: {e}")
+            record_fallback("similarity", "fallback_model")
             # Fallback to smaller model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = SentenceTransformer(model_source(MODEL_CONFIGS["similarity"]["fallback_model_name"]))
     
+    @traced("similarity.calculate_similarity")
+    @uses_model
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts"""
-        self.ensure_loaded()
-        
         try:
             # Encode texts to embeddings
             embeddings = self.model.encode([text1, text2])
@@ -44,12 +59,38 @@ class SimilarityCalculator(BaseModel):
             
         except Exception as e:
             logger.error(f"Error calculating similarity: {e}")
+            record_fallback("similarity", "error")
             return 0.0
     
+    @traced("similarity.embed")
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Unit-length embedding of a text, so a dot product is the cosine
+        similarity; None on error, including a failure to load the model
+        """
+        try:
+            self.acquire()
+        except Exception as e:
+            logger.error(f"Error loading similarity model: {e}")
+            record_fallback("similarity", "error")
+            return None
+        
+        try:
+            embedding = np.asarray(self.model.encode(text), dtype=np.float32)
+            norm = np.linalg.norm(embedding)
+            return embedding / norm if norm > 0 else embedding
+            
+        except Exception as e:
+            logger.error(f"Error embedding text: {e}")
+            record_fallback("similarity", "error")
+            return None
+        finally:
+            self.release()
+    
+    @traced("similarity.rank_candidates")
+    @uses_model
     def rank_candidates(self, job_description: str, resumes: List[Dict]) -> List[Dict]:
         """Rank resumes by similarity to job description"""
-        self.ensure_loaded()
-        
         try:
             # Encode job description
             job_embedding = self.model.encode(job_description)
@@ -79,10 +120,10 @@ class SimilarityCalculator(BaseModel):
             logger.error(f"Error ranking candidates: {e}")
             return []
     
+    @traced("similarity.find_similar_sections")
+    @uses_model
     def find_similar_sections(self, resume_text: str, job_text: str) -> Dict[str, float]:
         """Find which sections of resume match job description best"""
-        self.ensure_loaded()
-        
         # Split resume into sections
         sections = self._split_into_sections(resume_text)
         
@@ -0,0 +1,103 @@
+"""Inverted index from skill id to resume ids for cheap candidate retrieval"""
+
+from typing import List, Dict, Set, Tuple, Iterable, Callable, Hashable, Optional
+import numpy as np
+import logging
+from app.ai.skill_matcher import SkillVocabulary
+from app.ai.skill_stats import skill_corpus_stats
+
+logger = logging.getLogger(__name__)
+
+
+class SkillInvertedIndex:
+    """Posting lists of resume ids per skill, plus the forward skill ids per resume"""
+
+    def __init__(self, vocabulary: SkillVocabulary):
+        self.vocabulary = vocabulary
+        self.postings: Dict[int, Set[Hashable]] = {}
+        self.forward: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.forward)
+
+    def __contains__(self, resume_id: Hashable) -> bool:
+        return resume_id in self.forward
+
+    def add(self, resume_id: Hashable, skills: Iterable[str]):
+        """Index (or re-index) a resume's skills"""
+        self.remove(resume_id)
+        ids = self.vocabulary.encode(skills)
+        self.forward[resume_id] = ids
+        for skill_id in ids.tolist():
+            self.postings.setdefault(skill_id, set()).add(resume_id)
+
+    def remove(self, resume_id: Hashable):
+        """Drop a resume from the index"""
+        ids = self.forward.pop(resume_id, None)
+        if ids is None:
+            return
+        for skill_id in ids.tolist():
+            posting = self.postings.get(skill_id)
+            if posting is not None:
+                posting.discard(resume_id)
+                if not posting:
+                    del self.postings[skill_id]
+
+    def replace(self, other: "SkillInvertedIndex"):
+        """Take over the postings of an index rebuilt from scratch over the same vocabulary"""
+        self.postings, self.forward = other.postings, other.forward
+
+    def candidates(
+        self,
+        required_skills: List[str],
+        allowed_ids: Iterable[Hashable],
+        weights: Callable[[int, int], np.ndarray],
+        min_overlap: float = 0.0,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Rank allowed resumes by the share of required skill weight they cover.
+
+        Returns (resume_id, overlap) pairs with overlap >= min_overlap, best
+        first, at most `limit` of them. Resumes that are not indexed are skipped.
+        """
+        lookup = self.vocabulary.lookup()
+        required_ids = lookup.encode(required_skills)
+        if not len(required_ids):
+            return []
+
+        # Skills outside the vocabulary count towards the required weight but no resume has them
+        skill_weights = weights(len(lookup), lookup.known)
+        required_weight = float(skill_weights[required_ids].sum())
+        required_ids = required_ids[required_ids < lookup.known]
+        allowed = set(allowed_ids)
+        scores: Dict[Hashable, float] = {}
+
+        posting_sizes = sum(len(self.postings.get(skill_id, ())) for skill_id in required_ids.tolist())
+        if len(allowed) < posting_sizes:
+            # Small pool: intersect each resume's skills with the requirements
+            for resume_id in allowed:
+                ids = self.forward.get(resume_id)
+                if ids is not None:
+                    common = np.intersect1d(ids, required_ids, assume_unique=True)
+                    if len(common):
+                        scores[resume_id] = float(skill_weights[common].sum())
+        else:
+            # Large pool: walk the posting lists of the required skills only
+            for skill_id in required_ids.tolist():
+                for resume_id in self.postings.get(skill_id, ()):
+                    if resume_id in allowed:
+                        scores[resume_id] = scores.get(resume_id, 0.0) + float(skill_weights[skill_id])
+
+        ranked = [
+            (resume_id, score / required_weight)
+            for resume_id, score in scores.items()
+            if score / required_weight >= min_overlap
+        ]
+        ranked.sort(key=lambda x: x[1], reverse=True)
+
+        return ranked[:limit] if limit else ranked
+
+
+# Shares the vocabulary of the skill corpus stats so ids and IDF weights line up
+skill_index = SkillInvertedIndex(skill_corpus_stats.vocabulary)
@@ -0,0 +1,178 @@
+"""Vectorized skill matching across many resumes and jobs"""
+
+from typing import List, Dict, Any, Iterable, Optional, Callable
+import threading
+import numpy as np
+import logging
+from app.ai.config import TECHNICAL_SKILLS, SOFT_SKILLS
+
+logger = logging.getLogger(__name__)
+
+
+class SkillVocabulary:
+    """Map skill names to stable integer ids, seeded from the skills taxonomy.
+
+    Only counted documents (stored analyses) grow the vocabulary; request
+    skills are looked up read-only through `lookup()`.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.skill_to_id: Dict[str, int] = {}
+        self.id_to_skill: List[str] = []
+        self.lock = threading.Lock()
+        for skill in skills:
+            self.add(skill)
+
+    def __len__(self) -> int:
+        return len(self.id_to_skill)
+
+    def get(self, skill: str) -> Optional[int]:
+        """Id of a known skill, or None"""
+        return self.skill_to_id.get(skill.lower())
+
+    def add(self, skill: str) -> int:
+        """Return the id of a skill, assigning a new one if unseen"""
+        key = skill.lower()
+        skill_id = self.skill_to_id.get(key)
+        if skill_id is None:
+            with self.lock:
+                skill_id = self.skill_to_id.get(key)
+                if skill_id is None:
+                    # Append before publishing the id so readers never see an id without a name
+                    skill_id = len(self.id_to_skill)
+                    self.id_to_skill.append(key)
+                    self.skill_to_id[key] = skill_id
+        return skill_id
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Encode skills as a sorted array of unique ids (sparse vector), adding unseen ones"""
+        return np.unique(np.fromiter((self.add(skill) for skill in skills), dtype=np.int32))
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """Map ids back to (lowercased) skill names"""
+        return [self.id_to_skill[i] for i in ids]
+
+    def lookup(self) -> "SkillLookup":
+        """Read-only encoder over the vocabulary as it is now"""
+        return SkillLookup(self)
+
+
+class SkillLookup:
+    """
+    Encodes skills against a vocabulary without growing it. Skills the
+    vocabulary doesn't know (or learned after this lookup was made) get
+    temporary ids from `known` up, private to this lookup.
+    """
+
+    def __init__(self, vocabulary: SkillVocabulary):
+        self.vocabulary = vocabulary
+        self.known = len(vocabulary)
+        self.unknown: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.known + len(self.unknown)
+
+    def id(self, skill: str) -> int:
+        key = skill.lower()
+        skill_id = self.vocabulary.skill_to_id.get(key)
+        if skill_id is not None and skill_id < self.known:
+            return skill_id
+        return self.unknown.setdefault(key, self.known + len(self.unknown))
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Encode skills as a sorted array of unique ids (sparse vector)"""
+        return np.unique(np.fromiter((self.id(skill) for skill in skills), dtype=np.int32))
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """Map ids back to (lowercased) skill names"""
+        names = list(self.unknown)
+        return [self.vocabulary.id_to_skill[i] if i < self.known else names[i - self.known] for i in ids]
+
+
+class SkillMatchBatch:
+    """Match counts and scores for N resumes x M jobs"""
+
+    def __init__(
+        self,
+        vocabulary: SkillLookup,
+        resume_matrix: np.ndarray,
+        job_matrix: np.ndarray,
+        weights: Optional[np.ndarray] = None
+    ):
+        self.vocabulary = vocabulary
+        self.resume_matrix = resume_matrix
+        self.job_matrix = job_matrix
+
+        # (N, V) @ (V, M) -> number of required skills each resume has
+        self.matched_counts = (resume_matrix @ job_matrix.T).astype(np.int32)
+        self.required_counts = job_matrix.sum(axis=1).astype(np.int32)
+        self.missing_counts = self.required_counts[np.newaxis, :] - self.matched_counts
+
+        scores = np.zeros(self.matched_counts.shape, dtype=np.float64)
+        np.divide(self.matched_counts, self.required_counts, out=scores, where=self.required_counts > 0)
+        self.match_scores = np.round(scores, 2)
+
+        # Same product with every skill column scaled by its weight (e.g. IDF)
+        self.weighted_scores = None
+        if weights is not None:
+            weighted_jobs = job_matrix * weights[np.newaxis, :]
+            required_weight = weighted_jobs.sum(axis=1)
+            weighted = np.zeros(self.matched_counts.shape, dtype=np.float64)
+            np.divide(resume_matrix @ weighted_jobs.T, required_weight, out=weighted, where=required_weight > 0)
+            self.weighted_scores = np.round(weighted, 2)
+
+    def details(self, resume_index: int, job_index: int) -> Dict[str, Any]:
+        """Per-pair result in the same shape as SkillsExtractor.calculate_skill_match"""
+        resume_row = self.resume_matrix[resume_index] > 0
+        job_row = self.job_matrix[job_index] > 0
+
+        result = {
+            "matched_skills": self.vocabulary.decode(np.flatnonzero(resume_row & job_row)),
+            "missing_skills": self.vocabulary.decode(np.flatnonzero(job_row & ~resume_row)),
+            "match_score": float(self.match_scores[resume_index, job_index]),
+            "matched_count": int(self.matched_counts[resume_index, job_index]),
+            "required_count": int(self.required_counts[job_index])
+        }
+        if self.weighted_scores is not None:
+            result["weighted_match_score"] = float(self.weighted_scores[resume_index, job_index])
+        return result
+
+
+class BatchSkillMatcher:
+    """Score many resumes against many jobs with one matrix product"""
+
+    def __init__(self, vocabulary: SkillVocabulary = None):
+        self.vocabulary = vocabulary or SkillVocabulary(TECHNICAL_SKILLS + SOFT_SKILLS)
+
+    def match(
+        self,
+        resume_skills: List[List[str]],
+        job_skills: List[List[str]],
+        weights: Optional[Callable[[int, int], np.ndarray]] = None
+    ) -> SkillMatchBatch:
+        """Match every resume skill list against every job skill list.
+
+        `weights`, if given, returns a per-skill weight vector for ids
+        [0, width), where ids from `known` up are skills outside the
+        vocabulary, and enables `weighted_scores`.
+        """
+        # Encode everything first so both matrices share the final width
+        lookup = self.vocabulary.lookup()
+        resume_ids = [lookup.encode(skills) for skills in resume_skills]
+        job_ids = [lookup.encode(skills) for skills in job_skills]
+        width = len(lookup)
+
+        return SkillMatchBatch(
+            lookup,
+            self._to_matrix(resume_ids, width),
+            self._to_matrix(job_ids, width),
+            weights(width, lookup.known) if weights else None
+        )
+
+    def _to_matrix(self, id_lists: List[np.ndarray], width: int) -> np.ndarray:
+        """Stack sparse id vectors into a dense 0/1 matrix"""
+        matrix = np.zeros((len(id_lists), width), dtype=np.float32)
+        if id_lists:
+            rows = np.repeat(np.arange(len(id_lists)), [len(ids) for ids in id_lists])
+            matrix[rows, np.concatenate(id_lists)] = 1.0
+        return matrix
@@ -0,0 +1,94 @@
+"""Corpus statistics for IDF-weighted skill matching"""
+
+from typing import List, Optional, Iterable
+from datetime import datetime
+import threading
+import numpy as np
+import logging
+from app.ai.config import TECHNICAL_SKILLS, SOFT_SKILLS
+from app.ai.skill_matcher import SkillVocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class SkillCorpusStats:
+    """Document frequency per skill over all analyzed resumes.
+
+    Frequencies live in a numpy array indexed by vocabulary id and are updated
+    one document at a time. `watermark` is the `analyzed_at` of the newest
+    Analysis row already counted; `rebuilt_at` is when the table was last
+    counted from scratch. Skills that no counted document has get the IDF of
+    a document frequency of 0.
+    """
+
+    def __init__(self, vocabulary: SkillVocabulary = None):
+        self.vocabulary = vocabulary or SkillVocabulary(TECHNICAL_SKILLS + SOFT_SKILLS)
+        self.document_frequency = np.zeros(len(self.vocabulary), dtype=np.int32)
+        self.total_documents = 0
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[float] = None
+        self.rebuilt_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def _grow(self):
+        """Make room for skills added to the vocabulary since the last update"""
+        size = len(self.vocabulary)
+        if size > len(self.document_frequency):
+            grown = np.zeros(max(size, 2 * len(self.document_frequency)), dtype=np.int32)
+            grown[:len(self.document_frequency)] = self.document_frequency
+            self.document_frequency = grown
+
+    def add_document(self, skills: Iterable[str]):
+        """Count one resume's skills, adding unseen ones to the vocabulary"""
+        ids = self.vocabulary.encode(skills)
+        with self.lock:
+            self._grow()
+            self.document_frequency[ids] += 1
+            self.total_documents += 1
+
+    def remove_document(self, skills: Iterable[str]):
+        """Forget one resume's skills"""
+        ids = [self.vocabulary.get(skill) for skill in skills]
+        self.remove_document_ids(np.unique(np.array([i for i in ids if i is not None], dtype=np.int32)))
+
+    def remove_document_ids(self, ids: np.ndarray):
+        """Forget one resume's skills, given as vocabulary ids"""
+        with self.lock:
+            self._grow()
+            self.document_frequency[ids] = np.maximum(self.document_frequency[ids] - 1, 0)
+            self.total_documents = max(self.total_documents - 1, 0)
+
+    def replace(self, other: "SkillCorpusStats"):
+        """Take over the counts of a table rebuilt from scratch over the same vocabulary"""
+        with self.lock:
+            self.document_frequency = other.document_frequency
+            self.total_documents = other.total_documents
+            self.watermark = other.watermark
+
+    def idf_weights(self, width: Optional[int] = None, known: Optional[int] = None) -> np.ndarray:
+        """Smoothed IDF for ids [0, width); ids from `known` up are skills no document has"""
+        width = len(self.vocabulary) if width is None else width
+        known = width if known is None else min(known, width)
+        document_frequency, total_documents = self.document_frequency, self.total_documents
+        df = np.zeros(width, dtype=np.int32)
+        counted = document_frequency[:known]
+        df[:len(counted)] = counted
+        return np.log((1 + total_documents) / (1 + df)) + 1.0
+
+    def idf(self, skills: List[str]) -> List[float]:
+        """Smoothed IDF for each skill name"""
+        lookup = self.vocabulary.lookup()
+        ids = [lookup.id(skill) for skill in skills]
+        weights = self.idf_weights(len(lookup), lookup.known)
+        return [float(weights[i]) for i in ids]
+
+    def weighted_score(self, matched_skills: List[str], required_skills: List[str]) -> float:
+        """Share of the required IDF mass covered by the matched skills"""
+        required_weight = sum(self.idf(required_skills))
+        if not required_weight:
+            return 0
+        return round(sum(self.idf(matched_skills)) / required_weight, 2)
+
+
+# Shared by every SkillsExtractor in the process
+skill_corpus_stats = SkillCorpusStats()
@@ -1,27 +1,70 @@
 """Skills extraction from resume text"""
 
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Set, Any, Iterable
 import re
 import logging
 from app.ai.base import BaseModel
 from app.ai.config import TECHNICAL_SKILLS, SOFT_SKILLS
+from app.ai.skill_matcher import BatchSkillMatcher, SkillMatchBatch
+from app.ai.skill_stats import SkillCorpusStats, skill_corpus_stats
 
 logger = logging.getLogger(__name__)
 
+
+class SkillScanner:
+    """
+    Finds which of a fixed list of skills occur in lowercased text, with the
+    same word-boundary semantics as a separate search per skill, in a
+    single pass. At a given start position the alternation only reports the
+    longest skill, so skills that can share a start with a longer one
+    ("react" / "react native") get their own fallback search.
+    """
+    
+    def __init__(self, skills: Iterable[str]):
+        self.skills = list(skills)
+        lowered = sorted({skill.lower() for skill in self.skills}, key=len, reverse=True)
+        self.pattern = re.compile(r'\b(?=(' + '|'.join(re.escape(skill) for skill in lowered) + r')\b)')
+        self.shadowed = {
+            skill: re.compile(r'\b' + re.escape(skill) + r'\b')
+            for skill in lowered
+            if any(
+                other != skill and other.startswith(skill) and not (other[len(skill)].isalnum() or other[len(skill)] == '_')
+                for other in lowered
+            )
+        }
+    
+    def find(self, text_lower: str) -> List[str]:
+        """Skills present in the text, in list order"""
+        found = {match.group(1) for match in self.pattern.finditer(text_lower)}
+        found.update(
+            skill for skill, pattern in self.shadowed.items()
+            if skill not in found and pattern.search(text_lower)
+        )
+        return [skill for skill in self.skills if skill.lower() in found]
+
+
+TECHNICAL_SCANNER = SkillScanner(TECHNICAL_SKILLS)
+SOFT_SCANNER = SkillScanner(SOFT_SKILLS)
+
+
 class SkillsExtractor(BaseModel):
     """Extract technical and soft skills from resume text"""
     
-    def __init__(self):
+    has_weights = False
+    
+    def __init__(self, corpus_stats: SkillCorpusStats = skill_corpus_stats):
         super().__init__("skills_extractor", "cpu")
         self.technical_skills = set(skill.lower() for skill in TECHNICAL_SKILLS)
         self.soft_skills = set(skill.lower() for skill in SOFT_SKILLS)
-        
+        self.corpus_stats = corpus_stats
+        self.batch_matcher = BatchSkillMatcher(corpus_stats.vocabulary)
+    
     def load_model(self):
         """No model to load for rule-based extraction"""
         # We're using rule-based extraction for skills
         # You can enhance this with a model like JobBERT later
         pass
-        
+    
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract technical and soft skills from text"""
         text_lower = text.lower()
@@ -29,23 +72,9 @@ class SkillsExtractor(BaseModel):
         # Clean text for better matching
         text_cleaned = re.sub(r'[^\w\s\+\#]', ' ', text_lower)
         
-        found_technical = []
-        found_soft = []
-        
-        # Extract technical skills
-        for skill in TECHNICAL_SKILLS:
-            skill_lower = skill.lower()
-            # Check for word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_cleaned):
-                found_technical.append(skill)
-        
-        # Extract soft skills
-        for skill in SOFT_SKILLS:
-            skill_lower = skill.lower()
-            pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_cleaned):
-                found_soft.append(skill)
+        # Extract technical and soft skills (word boundaries avoid partial matches)
+        found_technical = TECHNICAL_SCANNER.find(text_cleaned)
+        found_soft = SOFT_SCANNER.find(text_cleaned)
         
         # Look for additional technical skills patterns
         additional_technical = self._extract_additional_technical_skills(text)
@@ -99,10 +128,26 @@ class SkillsExtractor(BaseModel):
         
         match_score = len(matched) / len(required_set) if required_set else 0
         
+        # Rare skills count for more than ubiquitous ones
+        weighted_match_score = self.corpus_stats.weighted_score(list(matched), list(required_set))
+        
         return {
             "matched_skills": list(matched),
             "missing_skills": list(missing),
             "match_score": round(match_score, 2),
+            "weighted_match_score": weighted_match_score,
             "matched_count": len(matched),
             "required_count": len(required_set)
-        }
\ No newline at end of file
+        }
+    
+    def calculate_skill_match_batch(
+        self,
+        resume_skills: List[List[str]],
+        required_skills: List[List[str]]
+    ) -> SkillMatchBatch:
+        """Calculate skill match for N resumes against M jobs in one vectorized pass"""
+        return self.batch_matcher.match(
+            resume_skills,
+            required_skills,
+            weights=self.corpus_stats.idf_weights
+        )
\ No newline at end of file
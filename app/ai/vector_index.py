@@ -0,0 +1,225 @@
+"""Compact in-process index of resume embeddings for approximate similarity search"""
+
+from typing import List, Dict, Tuple, Iterable, Hashable, Optional
+from datetime import datetime
+import numpy as np
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_to_bytes(embedding: np.ndarray) -> bytes:
+    """Full-precision embedding as stored in Resume.embedding"""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def embedding_from_bytes(data: bytes) -> np.ndarray:
+    """Inverse of embedding_to_bytes"""
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class VectorCodec:
+    """
+    Maps unit-length embeddings to compact codes: reduction to `dims` (a
+    PCA projection once fitted, or Matryoshka-style truncation), then int8
+    scalar quantization with one float32 scale per vector. Queries are reduced
+    but not quantized, so scores stay close to the float dot product.
+    """
+
+    def __init__(self, dims: int = 0, reduction: str = "pca", quantize: bool = True):
+        if reduction not in ("pca", "truncate"):
+            raise ValueError(f"Unknown reduction {reduction!r}")
+        self.dims = dims
+        self.reduction = reduction
+        self.quantize = quantize
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+
+    @property
+    def needs_fit(self) -> bool:
+        return bool(self.dims) and self.reduction == "pca" and self.components is None
+
+    def fit(self, sample: np.ndarray):
+        """Learn the PCA projection from a sample of full embeddings"""
+        sample = np.asarray(sample, dtype=np.float32)
+        self.mean = sample.mean(axis=0)
+        _, _, components = np.linalg.svd(sample - self.mean, full_matrices=False)
+        self.components = np.ascontiguousarray(components[:self.dims])
+
+    def reduce(self, vectors: np.ndarray) -> np.ndarray:
+        """Reduced, re-normalized float32 vectors (rows)"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.dims and self.reduction == "truncate":
+            vectors = vectors[:, :self.dims]
+        elif self.dims:
+            vectors = (vectors - self.mean) @ self.components.T
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(codes, scales) for stored vectors; a vector is approximately codes * scale"""
+        reduced = self.reduce(vectors)
+        if not self.quantize:
+            return reduced, np.ones(len(reduced), dtype=np.float32)
+        scales = np.abs(reduced).max(axis=1) / 127
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(reduced / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+
+    def bytes_per_vector(self, full_dims: int) -> int:
+        dims = self.dims or full_dims
+        return dims + 4 if self.quantize else dims * 4
+
+
+class CompactVectorIndex:
+    """
+    Compact codes for a mutable set of embeddings, scored against a query by
+    dot product. With PCA reduction, vectors are kept in full precision until
+    `fit_size` of them have arrived to fit the projection on. `watermark` and
+    `refreshed_at` track how far an index filled from a table has read it
+    (see app.resumes.vector_index).
+    """
+
+    def __init__(self, codec: VectorCodec, fit_size: int = 1000):
+        self.codec = codec
+        self.fit_size = fit_size
+        self.ids: List[Hashable] = []
+        self.rows: Dict[Hashable, int] = {}
+        self.codes: Optional[np.ndarray] = None
+        self.scales = np.zeros(0, dtype=np.float32)
+        self.pending: Dict[Hashable, np.ndarray] = {}
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.rows) + len(self.pending)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self.rows or doc_id in self.pending
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the codes (and any vectors still waiting for the PCA fit)"""
+        codes = 0 if self.codes is None else self.codes[:len(self.ids)].nbytes + self.scales[:len(self.ids)].nbytes
+        return codes + sum(vector.nbytes for vector in self.pending.values())
+
+    def add(self, doc_id: Hashable, vector: np.ndarray):
+        """Index (or re-index) a document's embedding"""
+        self.remove(doc_id)
+        if self.codec.needs_fit:
+            self.pending[doc_id] = np.asarray(vector, dtype=np.float32)
+            if len(self.pending) >= self.fit_size:
+                self._fit_pending()
+            return
+
+        codes, scales = self.codec.encode(vector)
+        self._append([doc_id], codes, scales)
+
+    def replace(self, other: "CompactVectorIndex"):
+        """Take over the codec and codes of an index built elsewhere (e.g. on another thread)"""
+        self.codec, self.pending = other.codec, other.pending
+        self.ids, self.rows, self.codes, self.scales = other.ids, other.rows, other.codes, other.scales
+        self.watermark = other.watermark
+
+    def remove(self, doc_id: Hashable):
+        """Drop a document from the index"""
+        if self.pending.pop(doc_id, None) is not None:
+            return
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return
+
+        # Move the last row into the hole
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.codes[row] = self.codes[last]
+            self.scales[row] = self.scales[last]
+            self.rows[moved] = row
+        self.ids.pop()
+
+    def score(self, query: np.ndarray, doc_ids: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, float]:
+        """Approximate similarity of every document (optionally restricted to doc_ids)"""
+        ids, values = self._score(query, doc_ids)
+        return dict(zip(ids, values.tolist()))
+
+    def search(
+        self,
+        query: np.ndarray,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """Most similar documents first"""
+        ids, values = self._score(query, doc_ids)
+        if limit and limit < len(ids):
+            # Partial selection instead of sorting the whole index
+            top = np.argpartition(-values, limit - 1)[:limit]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.argsort(-values[top], kind="stable")]
+        return [(ids[row], float(values[row])) for row in top]
+
+    def _score(self, query: np.ndarray, doc_ids: Optional[Iterable[Hashable]]) -> Tuple[List[Hashable], np.ndarray]:
+        query = np.asarray(query, dtype=np.float32)
+        if doc_ids is not None:
+            doc_ids = list(doc_ids)
+
+        ids: List[Hashable] = []
+        values = []
+        if self.pending:
+            ids = [doc_id for doc_id in (self.pending if doc_ids is None else doc_ids) if doc_id in self.pending]
+            values.append(np.array([self.pending[doc_id] @ query for doc_id in ids], dtype=np.float32))
+
+        if self.ids:
+            if doc_ids is None:
+                coded, rows = list(self.ids), slice(0, len(self.ids))
+            else:
+                coded = [doc_id for doc_id in doc_ids if doc_id in self.rows]
+                rows = np.fromiter((self.rows[doc_id] for doc_id in coded), dtype=np.int64, count=len(coded))
+            reduced = self.codec.reduce(query)[0]
+            values.append((self.codes[rows].astype(np.float32) @ reduced) * self.scales[rows])
+            ids += coded
+
+        return ids, (np.concatenate(values) if values else np.zeros(0, dtype=np.float32))
+
+    def _fit_pending(self):
+        ids = list(self.pending)
+        vectors = np.stack([self.pending[doc_id] for doc_id in ids])
+        self.codec.fit(vectors)
+        self.pending = {}
+        codes, scales = self.codec.encode(vectors)
+        self._append(ids, codes, scales)
+        logger.info(f"Fitted {self.codec.dims}-dim PCA for the vector index on {len(ids)} embeddings")
+
+    def _append(self, ids: List[Hashable], codes: np.ndarray, scales: np.ndarray):
+        start = len(self.ids)
+        needed = start + len(ids)
+        if self.codes is None or needed > len(self.codes):
+            # Grow geometrically so appends stay amortized O(1)
+            capacity = max(needed, 2 * (0 if self.codes is None else len(self.codes)), 64)
+            grown = np.zeros((capacity, codes.shape[1]), dtype=codes.dtype)
+            grown_scales = np.zeros(capacity, dtype=np.float32)
+            if self.codes is not None:
+                grown[:start] = self.codes[:start]
+                grown_scales[:start] = self.scales[:start]
+            self.codes, self.scales = grown, grown_scales
+
+        self.codes[start:needed] = codes
+        self.scales[start:needed] = scales
+        for offset, doc_id in enumerate(ids):
+            self.rows[doc_id] = start + offset
+        self.ids.extend(ids)
+
+
+# Resume embeddings, filled from Resume.embedding by app.resumes.vector_index
+# and as resumes are analyzed or matched; pruned by ResumeService on delete
+resume_vector_index = CompactVectorIndex(
+    VectorCodec(
+        dims=settings.VECTOR_INDEX_DIMS,
+        reduction=settings.VECTOR_INDEX_REDUCTION,
+        quantize=settings.VECTOR_INDEX_QUANTIZE
+    ),
+    fit_size=settings.VECTOR_INDEX_FIT_SIZE
+)
@@ -1,23 +1,56 @@
 """Authentication dependencies for FastAPI routes"""
 
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from uuid import UUID
 
-from app.database import get_db
-from app.models.user import User
+from app.config import settings
+from app.database import get_async_db
+from app.models.user import User, UserType
 from app.auth.utils import verify_token
 from app.auth.schemas import TokenData
+from app.utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """The columns authorization needs, cached between requests"""
+    id: UUID
+    user_type: UserType
+    is_active: bool
+
+
+# str(user id) -> CurrentUser, shared by all requests in the process
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_SECONDS, name="user")
+
+
+def invalidate_cached_user(user_id) -> None:
+    """Forget a user's cached projection so the next request reads the row"""
+    _user_cache.invalidate(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _forget_changed_user(mapper, connection, target):
+    """Profile edits, password changes and deactivation all go through here"""
+    invalidate_cached_user(target.id)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user from JWT token"""
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """
+    Get the current authenticated user from JWT token.
+    Returns a cached (id, user_type, is_active) projection; routes that need
+    the full row depend on get_current_user_record instead.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -33,17 +66,31 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+    
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    try:
+        user_uuid = UUID(user_id)
+    except ValueError:
+        raise credentials_exception
+    
+    result = await db.execute(
+        select(User.id, User.user_type, User.is_active).where(User.id == user_uuid)
+    )
+    row = result.first()
+    if row is None:
         raise credentials_exception
     
+    user = CurrentUser(id=row.id, user_type=row.user_type, is_active=row.is_active)
+    _user_cache.set(user_id, user)
     return user
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -53,9 +100,25 @@ async def get_current_active_user(
     return current_user
 
 
-async def get_current_recruiter(
-    current_user: User = Depends(get_current_active_user)
+async def get_current_user_record(
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
+    """Load the full User row for the current user (profile and password routes)"""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        invalidate_cached_user(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_recruiter(
+    current_user: CurrentUser = Depends(get_current_active_user)
+) -> CurrentUser:
     """Get current user if they are a recruiter"""
     if current_user.user_type != "recruiter" and current_user.user_type != "admin":
         raise HTTPException(
@@ -66,8 +129,8 @@ async def get_current_recruiter(
 
 
 async def get_current_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_active_user)
+) -> CurrentUser:
     """Get current user if they are an admin"""
     if current_user.user_type != "admin":
         raise HTTPException(
@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.auth import schemas, utils, dependencies
 
@@ -15,13 +16,14 @@ router = APIRouter()
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: schemas.UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         (User.email == user_data.email) | (User.username == user_data.username)
-    ).first()
+    ))
+    existing_user = result.scalars().first()
     
     if existing_user:
         if existing_user.email == user_data.email:
@@ -36,7 +38,7 @@ async def register(
             )
     
     # Create new user
-    hashed_password = utils.get_password_hash(user_data.password)
+    hashed_password = await utils.get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -46,8 +48,8 @@ async def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
@@ -55,15 +57,20 @@ async def register(
 @router.post("/login", response_model=schemas.Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login user and return JWT tokens"""
     # Find user by username or email
-    user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         (User.username == form_data.username) | (User.email == form_data.username)
-    ).first()
+    ))
+    user = result.scalars().first()
     
-    if not user or not utils.verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await utils.verify_and_update_password(form_data.password, user.hashed_password)
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -76,6 +83,11 @@ async def login(
             detail="Inactive user account"
         )
     
+    # Stored hash used an old cost factor; upgrade it while we have the password
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create tokens
     access_token = utils.create_access_token(data={"sub": str(user.id)})
     refresh_token = utils.create_refresh_token(data={"sub": str(user.id)})
@@ -90,7 +102,7 @@ async def login(
 @router.post("/refresh", response_model=schemas.Token)
 async def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Refresh access token using refresh token"""
     payload = utils.verify_token(refresh_token, token_type="refresh")
@@ -101,7 +113,8 @@ async def refresh_token(
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -120,7 +133,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=schemas.UserResponse)
 async def get_current_user_profile(
-    current_user: User = Depends(dependencies.get_current_active_user)
+    current_user: User = Depends(dependencies.get_current_user_record)
 ):
     """Get current user profile"""
     return current_user
@@ -129,13 +142,14 @@ async def get_current_user_profile(
 @router.put("/me", response_model=schemas.UserResponse)
 async def update_profile(
     user_update: schemas.UserBase,
-    current_user: User = Depends(dependencies.get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(dependencies.get_current_user_record),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile"""
     # Check if email is being changed and already exists
     if user_update.email != current_user.email:
-        existing_user = db.query(User).filter(User.email == user_update.email).first()
+        result = await db.execute(select(User).where(User.email == user_update.email))
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -148,8 +162,8 @@ async def update_profile(
     current_user.full_name = user_update.full_name
     current_user.user_type = user_update.user_type
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     
     return current_user
 
@@ -157,20 +171,20 @@ async def update_profile(
 @router.post("/change-password")
 async def change_password(
     password_data: schemas.PasswordChange,
-    current_user: User = Depends(dependencies.get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(dependencies.get_current_user_record),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change password for authenticated user"""
     # Verify current password
-    if not utils.verify_password(password_data.current_password, current_user.hashed_password):
+    if not await utils.verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    current_user.hashed_password = utils.get_password_hash(password_data.new_password)
-    db.commit()
+    current_user.hashed_password = await utils.get_password_hash_async(password_data.new_password)
+    await db.commit()
     
     return {"message": "Password updated successfully"}
 
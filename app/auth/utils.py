@@ -1,15 +1,28 @@
 """Authentication utilities for password hashing and JWT tokens"""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import asyncio
 import secrets
 
 from app.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; hashes with a different cost are flagged for rehash on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a few threads give real parallelism without
+# letting a login burst occupy every core
+_crypto_executor = ThreadPoolExecutor(
+    max_workers=settings.AUTH_HASH_WORKERS,
+    thread_name_prefix="auth-crypto"
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +35,32 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the auth crypto pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_crypto_executor, verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify on the auth crypto pool. The second value is a fresh hash when the
+    stored one was made with a different cost (BCRYPT_ROUNDS), else None.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _crypto_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the auth crypto pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_crypto_executor, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -25,6 +25,10 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    USER_CACHE_SECONDS: int = 30  # How long the auth user lookup is cached
+    USER_CACHE_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12  # Cost factor; existing hashes are upgraded on login
+    AUTH_HASH_WORKERS: int = 4  # Threads for password hashing and verification
 
     DATABASE_URL: Optional[str] = None
     POSTGRES_USER: str = "resumeiq_user"
@@ -63,8 +67,56 @@ class Settings(BaseSettings):
     
     # Model Settings
     MODEL_CACHE_DIR: str = "models"
+    MODEL_OFFLINE: bool = False  # Load only from verified snapshots in MODEL_CACHE_DIR, never the hub
     MAX_MODEL_CACHE_SIZE: int = 5
     MODEL_INFERENCE_TIMEOUT: int = 30
+    INFERENCE_WORKERS: int = 2  # Threads running model calls off the event loop
+    ANALYSIS_DEFAULT_PROFILE: str = "full"  # fast (rules only), standard (+ similarity) or full (+ NER)
+    MODEL_IDLE_TTL_SECONDS: int = 900  # Unload models unused this long; 0 keeps them loaded
+    MODEL_RSS_BUDGET_MB: int = 0  # Evict least recently used models above this RSS; 0 disables
+    MODEL_SWEEP_INTERVAL_SECONDS: int = 30  # How often idle and budget checks run
+    PREFORK_SHARE_MODELS: bool = True  # gunicorn.conf.py: load weights in the master so workers share them
+    INFERENCE_BACKEND: str = "local"  # "local" (models in each worker) or "remote" (python -m app.ai.server)
+    INFERENCE_SOCKET: str = "/tmp/resumeiq-inference.sock"  # Unix socket of the inference server
+    INFERENCE_SERVER_MAX_BATCH: int = 32  # Max texts per batched model call in the server
+    INFERENCE_SERVER_BATCH_WAIT_MS: float = 5  # How long the server waits to fill a batch
+    
+    # Admission control for /api/v1/ai/*
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_LATENCY_TARGET_MS: int = 2000  # Max projected wait before shedding
+    ADMISSION_BULK_SHARE: float = 0.5  # Share of the target bulk requests may use
+    ADMISSION_DEGRADE: bool = True  # Serve the fast profile instead of 503 where possible
+    ADMISSION_DEFAULT_CHARS: int = 5000  # Assumed text size when the body doesn't tell
+    ADMISSION_INITIAL_MS_PER_KCHAR: float = 100  # Starting speed estimate until calls are measured
+    
+    # Listings
+    LIST_COUNT_CACHE_SECONDS: int = 30  # How long listing totals are cached
+    
+    # Skill Matching
+    SKILL_STATS_REFRESH_SECONDS: int = 60  # Max age of the in-memory skill IDF table
+    SKILL_STATS_OVERLAP_SECONDS: int = 300  # Re-read window for analyses that committed late
+    SKILL_STATS_REBUILD_SECONDS: int = 3600  # Background full recount so workers converge after deletes; 0 disables
+    
+    # Two-stage job matching: skill prefilter, then semantic scoring of the shortlist
+    MATCH_PREFILTER_ENABLED: bool = True
+    MATCH_PREFILTER_MIN_POOL: int = 50  # Smaller pools are scored in full
+    MATCH_CANDIDATE_CAP: int = 200  # Max resumes passed to semantic scoring
+    MATCH_MIN_SKILL_OVERLAP: float = 0.2  # Min share of required skill weight (recall knob)
+    MATCH_LEXICAL_CANDIDATES: int = 50  # Top BM25 hits added to the shortlist
+    MATCH_VECTOR_CANDIDATES: int = 50  # Top compact-embedding hits added to the shortlist
+    TEXT_INDEX_REFRESH_SECONDS: int = 60  # Max age of the in-memory BM25 resume index
+    TEXT_INDEX_OVERLAP_SECONDS: int = 300  # Re-read window for uploads that committed late
+    MATCH_SCORING: str = "hybrid"  # Order by "hybrid" (rank fusion) or "blend" (the fixed-weight overall score)
+    MATCH_RRF_K: int = 60  # Reciprocal rank fusion constant
+    MATCH_PERSIST_BATCH_SIZE: int = 500  # Job match rows per upsert statement
+    
+    # Resume embedding index (approximate search; the shortlist is re-scored in full precision)
+    VECTOR_INDEX_DIMS: int = 128  # Dimensions kept per embedding; 0 keeps all 384
+    VECTOR_INDEX_REDUCTION: str = "pca"  # "pca" or "truncate" (Matryoshka-style prefix)
+    VECTOR_INDEX_FIT_SIZE: int = 1000  # Embeddings collected before the PCA is fitted
+    VECTOR_INDEX_QUANTIZE: bool = True  # int8 codes with a per-vector scale instead of float32
+    VECTOR_INDEX_REFRESH_SECONDS: int = 60  # How often workers read embeddings stored by others
+    VECTOR_INDEX_OVERLAP_SECONDS: int = 300  # Re-read window for embeddings that committed late
     
     # Celery Settings
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
@@ -83,11 +135,29 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_AI_UNITS_PER_MINUTE: int = 30  # Inference quota; routes cost 1-10 units
+    RATE_LIMIT_STORE: str = "memory"  # "memory" (per process) or "redis" (REDIS_URL)
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "resumeiq.log"
     
+    # Metrics
+    METRICS_ENABLED: bool = True  # Prometheus /metrics endpoint and request latency histograms
+    
+    # Profiling (admin-only /api/v1/admin/profile endpoints)
+    PROFILING_ENABLED: bool = True
+    PROFILING_MAX_SECONDS: float = 60  # Longest CPU sample or memory window
+    PROFILING_SAMPLE_INTERVAL_MS: float = 10  # Default stack sampling interval
+    PROFILING_TRACEMALLOC_FRAMES: int = 10  # Traceback depth kept per allocation
+    
+    # Tracing
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.05  # Fraction of requests traced (an upstream traceparent decides for its own)
+    TRACE_EXPORTER: str = "file"  # "file" (TRACE_FILE, JSON lines) or "otlp" (TRACE_OTLP_ENDPOINT)
+    TRACE_FILE: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    
     # Features Flags
     ENABLE_BULK_PROCESSING: bool = True
     ENABLE_AI_ANALYSIS: bool = True
@@ -1,21 +1,28 @@
 """
 Database configuration and session management.
 Uses SQLAlchemy for ORM and Alembic for migrations.
+
+The request path uses the async engine (asyncpg) through get_async_db.
+The sync engine stays for Alembic, startup checks and background workers.
 """
 
 import logging
 import os
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy import create_engine, event, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from alembic import command
 from alembic.config import Config
 
 from app.config import settings
+from app.metrics import DB_QUERY_LATENCY
+from app.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +42,67 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+def _async_database_url(url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Create async database engine for the request path
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    echo=False,
+)
+
+# Objects stay usable after commit: request handlers serialize them afterwards
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Statement types reported as their own label; anything else is OTHER
+DB_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words and words[0].upper() in DB_OPERATIONS else "OTHER"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    span = start_span("db.query", **{"db.operation": _operation(statement), "db.statement": statement[:1000]})
+    conn.info.setdefault("query_started", []).append((time.perf_counter(), span))
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started, span = conn.info["query_started"].pop()
+    DB_QUERY_LATENCY.labels(_operation(statement)).observe(time.perf_counter() - started)
+    if span is not None:
+        span.finish()
+
+
+def _on_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        _, span = context.connection.info["query_started"].pop()
+        if span is not None:
+            span.finish(context.original_exception)
+
+
+# Time every statement on both engines (the async one fires on its sync core)
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_execute)
+    event.listen(_engine, "after_cursor_execute", _after_execute)
+    event.listen(_engine, "handle_error", _on_error)
+
+
 # Create Base class for models
 metadata = MetaData(
     naming_convention={
@@ -64,6 +132,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+
 def init_db() -> None:
     """
     Initialize database schema using Alembic migrations.
@@ -75,11 +156,11 @@ def init_db() -> None:
     if not auto_migrate:
         logger.info("AUTO_MIGRATE disabled — skipping automatic Alembic migrations")
         return
-
+    
     try:
         alembic_cfg = Config(str(Path(__file__).parent.parent / "alembic.ini"))
         alembic_cfg.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
-
+        
         command.upgrade(alembic_cfg, "head")
         logger.info("Database migrated to latest revision using Alembic")
     except Exception as e:
@@ -1,13 +1,12 @@
 """API routes for job management"""
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
 from uuid import UUID
 
-from app.database import get_db
-from app.auth.dependencies import get_current_active_user, get_current_recruiter
-from app.models.user import User
+from app.database import get_async_db
+from app.auth.dependencies import CurrentUser, get_current_active_user, get_current_recruiter
 from app.jobs.service import JobService
 from app.jobs import schemas
 
@@ -17,23 +16,23 @@ router = APIRouter()
 @router.post("/", response_model=schemas.JobResponse)
 async def create_job(
     job_data: schemas.JobCreate,
-    current_user: User = Depends(get_current_recruiter),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_recruiter),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new job posting (recruiters only)"""
     service = JobService(db)
-    job = service.create_job(job_data.model_dump(), current_user)
+    job = await service.create_job(job_data.model_dump(), current_user)
     return job
 
 
 @router.get("/{job_id}", response_model=schemas.JobResponse)
 async def get_job(
     job_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific job posting"""
     service = JobService(db)
-    return service.get_job(job_id)
+    return await service.get_job(job_id)
 
 
 @router.get("/", response_model=schemas.JobListResponse)
@@ -42,8 +41,9 @@ async def list_jobs(
     per_page: int = Query(10, ge=1, le=100),
     active_only: bool = Query(True),
     my_jobs_only: bool = Query(False),
-    current_user: Optional[User] = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    current_user: Optional[CurrentUser] = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List job postings"""
     service = JobService(db)
@@ -52,19 +52,19 @@ async def list_jobs(
     if my_jobs_only and current_user:
         user_id = current_user.id
     
-    return service.list_jobs(page, per_page, active_only, user_id)
+    return await service.list_jobs(page, per_page, active_only, user_id, cursor)
 
 
 @router.put("/{job_id}", response_model=schemas.JobResponse)
 async def update_job(
     job_id: UUID,
     update_data: schemas.JobUpdate,
-    current_user: User = Depends(get_current_recruiter),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_recruiter),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a job posting"""
     service = JobService(db)
-    return service.update_job(
+    return await service.update_job(
         job_id,
         current_user,
         update_data.model_dump(exclude_unset=True)
@@ -74,21 +74,45 @@ async def update_job(
 @router.delete("/{job_id}")
 async def delete_job(
     job_id: UUID,
-    current_user: User = Depends(get_current_recruiter),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_recruiter),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a job posting"""
     service = JobService(db)
-    service.delete_job(job_id, current_user)
+    await service.delete_job(job_id, current_user)
     return {"message": "Job deleted successfully"}
 
 
+@router.get("/{job_id}/matches", response_model=schemas.JobLeaderboardResponse)
+async def get_job_leaderboard(
+    job_id: UUID,
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    min_skills_match: Optional[float] = Query(None, ge=0, le=1),
+    max_missing_skills: Optional[int] = Query(None, ge=0),
+    exclude_missing: Optional[List[str]] = Query(None),
+    current_user: CurrentUser = Depends(get_current_recruiter),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Read stored match results for a job, best first (keyset paginated)"""
+    service = JobService(db)
+    return await service.get_leaderboard(
+        job_id,
+        current_user,
+        per_page,
+        cursor,
+        min_skills_match,
+        max_missing_skills,
+        exclude_missing
+    )
+
+
 @router.post("/{job_id}/match", response_model=schemas.JobMatchResponse)
 async def match_resumes_to_job(
     job_id: UUID,
     match_request: schemas.JobMatchRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Match resumes to a job posting"""
     service = JobService(db)
@@ -60,6 +60,7 @@ class JobListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class JobMatchRequest(BaseModel):
@@ -70,4 +71,27 @@ class JobMatchRequest(BaseModel):
 class JobMatchResponse(BaseModel):
     """Schema for job match response"""
     job_id: UUID
+    candidates_considered: int = 0
+    candidates_scored: int = 0
     matches: List[Dict[str, Any]]
+
+
+class JobMatchEntry(BaseModel):
+    """Schema for a stored job match"""
+    id: UUID
+    resume_id: UUID
+    candidate_name: Optional[str] = None
+    overall_score: float
+    skills_match_score: Optional[float] = None
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    rank: Optional[int] = None
+    matched_at: datetime
+
+
+class JobLeaderboardResponse(BaseModel):
+    """Schema for a page of a job's match leaderboard"""
+    job_id: UUID
+    matches: List[JobMatchEntry]
+    per_page: int
+    next_cursor: Optional[str] = None
@@ -1,28 +1,53 @@
 """Business logic for job operations"""
 
 from typing import List, Optional, Dict, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from itertools import islice, zip_longest
+from sqlalchemy import text, or_, and_, func, not_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
+import numpy as np
+import logging
 
+from app.config import settings
 from app.models.job import JobDescription
 from app.models.user import User, UserType
 from app.models.resume import Resume
 from app.models.analysis import JobMatch
+from app.models.loaders import with_text, with_embedding
 from app.ai.similarity import SimilarityCalculator
 from app.ai.skills_extractor import SkillsExtractor
+from app.ai.skill_index import skill_index
+from app.ai.bm25 import resume_text_index, reciprocal_rank_fusion
+from app.ai.vector_index import resume_vector_index, embedding_from_bytes, embedding_to_bytes
+from app.ai.inference import run_inference
+from app.metrics import record_fallback
+from app.resumes.skill_stats import refresh_skill_stats_if_stale
+from app.resumes.text_index import refresh_text_index_if_stale
+from app.resumes.vector_index import refresh_vector_index_if_stale
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import TTLCache
+from app.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+# (active_only, user_id) -> number of jobs, shared by all requests in the process
+_count_cache = TTLCache(maxsize=10000, ttl=settings.LIST_COUNT_CACHE_SECONDS, name="job_count")
 
 
 class JobService:
     """Service class for job operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.similarity_calculator = SimilarityCalculator()
-        self.skills_extractor = SkillsExtractor()
+        # Shared so a request doesn't reload the embedding model
+        self.similarity_calculator = SimilarityCalculator.shared()
+        self.skills_extractor = SkillsExtractor.shared()
     
-    def create_job(self, job_data: dict, user: User) -> JobDescription:
+    @traced("job_service.create_job")
+    async def create_job(self, job_data: dict, user: User) -> JobDescription:
         """Create a new job posting"""
         
         # Check if user is recruiter
@@ -42,56 +67,92 @@ class JobService:
         )
         
         self.db.add(job)
-        self.db.commit()
-        self.db.refresh(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        
+        _count_cache.clear()
         
         return job
     
-    def get_job(self, job_id: UUID) -> JobDescription:
+    @traced("job_service.get_job")
+    async def get_job(self, job_id: UUID) -> JobDescription:
         """Get a job by ID"""
-        job = self.db.query(JobDescription).filter(
-            JobDescription.id == job_id
-        ).first()
+        job = await self.db.get(JobDescription, job_id)
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
         return job
     
-    def list_jobs(
+    @traced("job_service.list_jobs")
+    async def list_jobs(
         self,
         page: int = 1,
         per_page: int = 10,
         active_only: bool = True,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        cursor: Optional[str] = None
     ) -> dict:
-        """List jobs with pagination"""
-        query = self.db.query(JobDescription)
+        """
+        List jobs, newest first.
+        Pass the returned `next_cursor` to fetch the following page with a
+        keyset seek; `page` still works but costs an OFFSET scan.
+        """
+        filters = []
         
         if active_only:
-            query = query.filter(JobDescription.is_active == "active")
+            filters.append(JobDescription.is_active == "active")
         
         if user_id:
-            query = query.filter(JobDescription.user_id == user_id)
+            filters.append(JobDescription.user_id == user_id)
+        
+        total = _count_cache.get((active_only, user_id))
+        if total is None:
+            total = await self.db.scalar(select(func.count(JobDescription.id)).where(*filters))
+            _count_cache.set((active_only, user_id), total)
+        
+        query = select(JobDescription).where(*filters)
+        
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor, 2)
+            try:
+                last_created_at, last_id = datetime.fromisoformat(last_created_at), UUID(last_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(
+                tuple_(JobDescription.created_at, JobDescription.id) < (last_created_at, last_id)
+            )
+        elif page > 1:
+            query = query.offset((page - 1) * per_page)
         
-        total = query.count()
-        jobs = query.offset((page - 1) * per_page).limit(per_page).all()
+        result = await self.db.execute(query.order_by(
+            JobDescription.created_at.desc(),
+            JobDescription.id.desc()
+        ).limit(per_page + 1))
+        jobs = list(result.scalars())
+        
+        next_cursor = None
+        if len(jobs) > per_page:
+            jobs = jobs[:per_page]
+            next_cursor = encode_cursor(jobs[-1].created_at.isoformat(), jobs[-1].id)
         
         return {
             "jobs": jobs,
             "total": total,
             "page": page,
-            "per_page": per_page
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }
     
-    def update_job(
+    @traced("job_service.update_job")
+    async def update_job(
         self,
         job_id: UUID,
         user: User,
         update_data: dict
     ) -> JobDescription:
         """Update a job posting"""
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         
         # Check ownership
         if job.user_id != user.id and user.user_type != UserType.ADMIN:
@@ -106,14 +167,18 @@ class JobService:
         
         job.updated_at = datetime.utcnow()
         
-        self.db.commit()
-        self.db.refresh(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        
+        if "is_active" in update_data:
+            _count_cache.clear()
         
         return job
     
-    def delete_job(self, job_id: UUID, user: User) -> bool:
+    @traced("job_service.delete_job")
+    async def delete_job(self, job_id: UUID, user: User) -> bool:
         """Delete a job posting"""
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         
         # Check ownership
         if job.user_id != user.id and user.user_type != UserType.ADMIN:
@@ -122,78 +187,445 @@ class JobService:
                 detail="You can only delete your own job postings"
             )
         
-        self.db.delete(job)
-        self.db.commit()
+        await self.db.delete(job)
+        await self.db.commit()
+        
+        _count_cache.clear()
         
         return True
     
+    @traced("job_service.get_leaderboard")
+    async def get_leaderboard(
+        self,
+        job_id: UUID,
+        user: User,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        min_skills_match: Optional[float] = None,
+        max_missing_skills: Optional[int] = None,
+        exclude_missing: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Stored matches for a job, best first, with keyset pagination on
+        (overall_score DESC, id) so every page is an index range scan.
+        """
+        job = await self.get_job(job_id)
+        
+        # Check ownership
+        if job.user_id != user.id and user.user_type != UserType.ADMIN:
+            raise HTTPException(
+                status_code=403,
+                detail="You can only view matches for your own job postings"
+            )
+        
+        query = select(JobMatch, Resume.candidate_name).join(
+            Resume, JobMatch.resume_id == Resume.id
+        ).where(JobMatch.job_id == job_id)
+        
+        if min_skills_match is not None:
+            query = query.where(JobMatch.skills_match_score >= min_skills_match)
+        
+        if max_missing_skills is not None:
+            query = query.where(
+                func.coalesce(func.cardinality(JobMatch.missing_skills), 0) <= max_missing_skills
+            )
+        
+        if exclude_missing:
+            # Candidates must not be missing any of these skills
+            query = query.where(or_(
+                JobMatch.missing_skills.is_(None),
+                not_(JobMatch.missing_skills.overlap([skill.lower() for skill in exclude_missing]))
+            ))
+        
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, 2)
+            try:
+                last_score, last_id = float(last_score), UUID(last_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            # The plain bound is what Postgres can use as an index condition;
+            # the OR only breaks ties within it
+            query = query.where(
+                JobMatch.overall_score <= last_score,
+                or_(
+                    JobMatch.overall_score < last_score,
+                    and_(JobMatch.overall_score == last_score, JobMatch.id > last_id)
+                )
+            )
+        
+        result = await self.db.execute(query.order_by(
+            JobMatch.overall_score.desc(),
+            JobMatch.id
+        ).limit(per_page + 1))
+        rows = result.all()
+        
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        
+        matches = []
+        for job_match, candidate_name in rows:
+            matches.append({
+                "id": job_match.id,
+                "resume_id": job_match.resume_id,
+                "candidate_name": candidate_name,
+                "overall_score": job_match.overall_score,
+                "skills_match_score": job_match.skills_match_score,
+                "matched_skills": job_match.matched_skills or [],
+                "missing_skills": job_match.missing_skills or [],
+                "rank": job_match.rank,
+                "matched_at": job_match.matched_at
+            })
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.overall_score, last.id)
+        
+        return {
+            "job_id": job_id,
+            "matches": matches,
+            "per_page": per_page,
+            "next_cursor": next_cursor
+        }
+    
+    @traced("job_service.match_resumes_to_job")
     async def match_resumes_to_job(
         self,
         job_id: UUID,
         resume_ids: List[UUID],
         user: User
     ) -> Dict[str, Any]:
-        """Match multiple resumes to a job"""
+        """
+        Match multiple resumes to a job in two stages:
+        a cheap skill-overlap and BM25 prefilter, then semantic and section
+        scoring of the shortlist only.
+        """
         
         # Get job
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         
-        # Get resumes
-        resumes = self.db.query(Resume).filter(
+        # Resolve which of the requested resumes the user owns (ids only)
+        result = await self.db.execute(select(Resume.id).where(
             Resume.id.in_(resume_ids),
             Resume.user_id == user.id
-        ).all()
+        ))
+        owned_ids = list(result.scalars())
         
-        if not resumes:
+        if not owned_ids:
             raise HTTPException(status_code=404, detail="No resumes found")
         
-        matches = []
+        # Embedded once here, not once per resume; model calls run on the inference pool
+        job_embedding = await run_inference(
+            self._try_model,
+            self.similarity_calculator.embed,
+            job.description,
+            chars=len(job.description or "")
+        )
         
-        for resume in resumes:
-            if not resume.raw_text:
-                continue
-            
-            # Calculate similarity
-            similarity_score = self.similarity_calculator.calculate_similarity(
-                resume.raw_text,
-                job.description
-            )
-            
-            # Extract and match skills
-            resume_skills = self.skills_extractor.extract_skills(resume.raw_text)
-            skill_match = self.skills_extractor.calculate_skill_match(
-                resume_skills.get("all_skills", []),
-                job.required_skills or []
-            )
+        # Stage 1: shortlist by skill overlap, BM25 and compact embeddings
+        await self.db.run_sync(refresh_skill_stats_if_stale)
+        await self.db.run_sync(refresh_text_index_if_stale)
+        await self.db.run_sync(refresh_vector_index_if_stale)
+        shortlist = self._shortlist_candidates(job, owned_ids, job_embedding)
+        
+        result = await self.db.execute(select(Resume).options(with_text(), with_embedding()).where(Resume.id.in_(shortlist)))
+        resumes = list(result.scalars())
+        
+        # Stage 2: semantic scoring on the shortlist, off the event loop
+        resumes = [resume for resume in resumes if resume.raw_text]
+        resume_scores = await run_inference(
+            self._score_resumes,
+            job.description,
+            job_embedding,
+            resumes,
+            chars=sum(len(resume.raw_text) for resume in resumes)
+        )
+        
+        scored = []
+        embedded_at = datetime.utcnow()
+        for resume, (resume_embedding, similarity_score, section_score, skills) in zip(resumes, resume_scores):
+            # Store embeddings computed here so the next match re-ranks without the model
+            if resume_embedding is not None and resume.embedding is None:
+                resume.embedding = embedding_to_bytes(resume_embedding)
+                resume.embedded_at = embedded_at
             
-            # Create match record
-            job_match = JobMatch(
-                resume_id=resume.id,
-                job_id=job.id,
-                overall_score=similarity_score,
-                skills_match_score=skill_match.get("match_score", 0),
-                matched_skills=skill_match.get("matched_skills", []),
-                missing_skills=skill_match.get("missing_skills", [])
+            # Index resumes this process hasn't seen yet
+            if resume_embedding is not None and resume.id not in resume_vector_index:
+                resume_vector_index.add(resume.id, resume_embedding)
+            if resume.id not in resume_text_index:
+                resume_text_index.add(resume.id, resume.raw_text)
+        
+            scored.append((resume, similarity_score, section_score, skills))
+        
+        # Match skills for all resumes in one vectorized pass, weighted by skill rarity
+        skill_batch = self.skills_extractor.calculate_skill_match_batch(
+            [skills for _, _, _, skills in scored],
+            [job.required_skills or []]
+        )
+        
+        skill_matches = [skill_batch.details(index, 0) for index in range(len(scored))]
+        
+        # Lexical scores for exact tech terms
+        lexical_scores = resume_text_index.score(
+            self._job_query(job),
+            [resume.id for resume, _, _, _ in scored]
+        )
+        
+        # Overall match score (weighted average, as in ResumeAnalyzer); absolute,
+        # so it stays comparable with matches stored by earlier runs
+        overall_scores = {
+            resume.id: (
+                similarity_score * 0.4 +
+                skill_match.get("weighted_match_score", 0) * 0.4 +
+                section_score * 0.2
             )
+            for (resume, similarity_score, section_score, _), skill_match in zip(scored, skill_matches)
+        }
+        
+        # Hybrid scoring orders this run by rank fusion, which is only relative to the pool
+        fusion_scores = None
+        if settings.MATCH_SCORING == "hybrid":
+            fusion_scores = self._fuse_rankings(scored, skill_matches, lexical_scores)
+        order_scores = fusion_scores or overall_scores
+        
+        # Position in this list is the rank within this run
+        ranked = sorted(
+            zip(scored, skill_matches),
+            key=lambda x: (order_scores[x[0][0].id], overall_scores[x[0][0].id]),
+            reverse=True
+        )
+        
+        matches = []
+        match_rows = []
+        
+        for rank, ((resume, similarity_score, _, _), skill_match) in enumerate(ranked, start=1):
+            skills_score = skill_match.get("weighted_match_score", 0)
+            overall_score = overall_scores[resume.id]
             
-            self.db.add(job_match)
+            match_rows.append({
+                "resume_id": resume.id,
+                "job_id": job.id,
+                "overall_score": overall_score,
+                "skills_match_score": skills_score,
+                "matched_skills": skill_match.get("matched_skills", []),
+                "missing_skills": skill_match.get("missing_skills", [])
+            })
             
-            matches.append({
+            match = {
                 "resume_id": str(resume.id),
                 "candidate_name": resume.candidate_name,
-                "overall_score": round(similarity_score, 2),
-                "skills_match_score": skill_match.get("match_score", 0),
+                "overall_score": round(overall_score, 2),
+                "similarity_score": round(similarity_score, 2),
+                "lexical_score": round(lexical_scores.get(resume.id, 0.0), 2),
+                "skills_match_score": skills_score,
                 "matched_skills": skill_match.get("matched_skills", []),
-                "missing_skills": skill_match.get("missing_skills", [])
-            })
-        
-        self.db.commit()
+                "missing_skills": skill_match.get("missing_skills", []),
+                "rank": rank
+            }
+            if fusion_scores is not None:
+                match["fusion_score"] = round(fusion_scores[resume.id], 4)
+            matches.append(match)
         
-        # Sort by overall score
-        matches.sort(key=lambda x: x["overall_score"], reverse=True)
+        await self._persist_matches(job.id, match_rows)
+        await self.db.commit()
         
         return {
             "job_id": str(job_id),
+            "candidates_considered": len(owned_ids),
+            "candidates_scored": len(scored),
             "matches": matches
         }
-
+    
+    def _score_resumes(
+        self,
+        job_description: str,
+        job_embedding: Optional[np.ndarray],
+        resumes: List[Resume]
+    ) -> List[tuple]:
+        """
+        (embedding, similarity, best section similarity, skills) per resume;
+        blocking model calls. If the similarity model fails (or fails to load)
+        it isn't tried again for this run, and the resumes are scored on skills
+        and BM25 alone.
+        """
+        model_ok = job_embedding is not None
+        results = []
+        for resume in resumes:
+            with span("job_service.score_resume", resume_id=str(resume.id)):
+                # Full-precision similarity re-ranks the approximate shortlist; the
+                # stored embedding saves a model call
+                resume_embedding = None
+                if resume.embedding is not None:
+                    resume_embedding = embedding_from_bytes(resume.embedding)
+                elif model_ok:
+                    resume_embedding = self._try_model(self.similarity_calculator.embed, resume.raw_text)
+                    model_ok = resume_embedding is not None
+                similarity_score = 0.0
+                if resume_embedding is not None and job_embedding is not None:
+                    similarity_score = float(resume_embedding @ job_embedding)
+                
+                # Calculate section-wise similarity
+                section_scores = {}
+                if model_ok:
+                    section_scores = self._try_model(
+                        self.similarity_calculator.find_similar_sections,
+                        resume.raw_text,
+                        job_description
+                    )
+                    model_ok = section_scores is not None
+                    section_scores = section_scores or {}
+                
+                # Extract skills
+                resume_skills = self.skills_extractor.extract_skills(resume.raw_text)
+                results.append((
+                    resume_embedding,
+                    similarity_score,
+                    max(section_scores.values(), default=0),
+                    resume_skills.get("all_skills", [])
+                ))
+        return results
+    
+    def _try_model(self, fn, *args):
+        """Call a model method; any failure, loading the model included, gives None"""
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.error(f"{fn.__name__} failed, scoring on skills and BM25 only: {e}")
+            record_fallback("similarity", "error")
+            return None
+    
+    @traced("job_service._shortlist_candidates")
+    def _shortlist_candidates(
+        self,
+        job: JobDescription,
+        resume_ids: List[UUID],
+        job_embedding: Optional[np.ndarray] = None
+    ) -> List[UUID]:
+        """
+        Cut the pool down to resumes with meaningful skill overlap, plus the
+        best BM25 and compact-embedding hits. Resumes that have not been
+        analyzed yet cannot be ruled out. The channels are interleaved before
+        the cap is applied, so a full skill ranking can't crowd out the others.
+        """
+        required_skills = job.required_skills or []
+        if (
+            not settings.MATCH_PREFILTER_ENABLED
+            or not required_skills
+            or len(resume_ids) <= settings.MATCH_PREFILTER_MIN_POOL
+        ):
+            return resume_ids
+        
+        ranked = skill_index.candidates(
+            required_skills,
+            resume_ids,
+            self.skills_extractor.corpus_stats.idf_weights,
+            min_overlap=settings.MATCH_MIN_SKILL_OVERLAP,
+            limit=settings.MATCH_CANDIDATE_CAP
+        )
+        lexical = resume_text_index.search(
+            self._job_query(job),
+            resume_ids,
+            limit=settings.MATCH_LEXICAL_CANDIDATES
+        )
+        semantic = []
+        if job_embedding is not None:
+            semantic = resume_vector_index.search(
+                job_embedding,
+                resume_ids,
+                limit=settings.MATCH_VECTOR_CANDIDATES
+            )
+        unanalyzed = [resume_id for resume_id in resume_ids if resume_id not in skill_index]
+        
+        channels = zip_longest(
+            [resume_id for resume_id, _ in ranked],
+            [resume_id for resume_id, _ in lexical],
+            [resume_id for resume_id, _ in semantic],
+            unanalyzed
+        )
+        shortlist = list(islice(
+            dict.fromkeys(resume_id for row in channels for resume_id in row if resume_id is not None),
+            settings.MATCH_CANDIDATE_CAP
+        ))
+        logger.info(f"Skill prefilter kept {len(shortlist)} of {len(resume_ids)} resumes for job {job.id}")
+        
+        return shortlist
+    
+    def _job_query(self, job: JobDescription) -> str:
+        """Lexical query text for a job"""
+        return " ".join([job.title or "", job.description or ""] + (job.required_skills or []))
+    
+    def _fuse_rankings(
+        self,
+        scored: List[tuple],
+        skill_matches: List[Dict[str, Any]],
+        lexical_scores: Dict[UUID, float]
+    ) -> Dict[UUID, float]:
+        """Reciprocal rank fusion of the BM25, skill and (if informative) embedding rankings (0..1)"""
+        semantic_ranking = [
+            resume.id for resume, similarity_score, _, _
+            in sorted(scored, key=lambda x: x[1], reverse=True)
+        ]
+        lexical_ranking = sorted(lexical_scores, key=lexical_scores.get, reverse=True)
+        skills_ranking = [
+            resume.id for (resume, _, _, _), skill_match
+            in sorted(zip(scored, skill_matches), key=lambda x: x[1].get("weighted_match_score", 0), reverse=True)
+            if skill_match.get("weighted_match_score", 0) > 0
+        ]
+        
+        rankings = [lexical_ranking, skills_ranking]
+        # Without a job embedding every similarity is 0 and the order would be
+        # whatever the database returned; only rank on similarity when it varies
+        if len({similarity_score for _, similarity_score, _, _ in scored}) > 1:
+            rankings.append(semantic_ranking)
+        
+        fused = reciprocal_rank_fusion(rankings, k=settings.MATCH_RRF_K)
+        return {resume.id: fused.get(resume.id, 0.0) for resume, _, _, _ in scored}
+    
+    @traced("job_service._persist_matches")
+    async def _persist_matches(self, job_id: UUID, match_rows: List[Dict[str, Any]]) -> None:
+        """
+        Upsert match rows in batches of MATCH_PERSIST_BATCH_SIZE, one statement
+        per batch. Re-running a match updates the existing (resume_id, job_id)
+        rows instead of inserting duplicates. The stored rank is then the
+        position among all of the job's matches by overall_score, the
+        leaderboard order, which is comparable across runs.
+        """
+        if not match_rows:
+            return
+        
+        matched_at = datetime.utcnow()
+        batch_size = settings.MATCH_PERSIST_BATCH_SIZE
+        
+        for start in range(0, len(match_rows), batch_size):
+            batch = [
+                {"id": uuid4(), "matched_at": matched_at, **row}
+                for row in match_rows[start:start + batch_size]
+            ]
+            
+            stmt = insert(JobMatch).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[JobMatch.resume_id, JobMatch.job_id],
+                set_={
+                    "overall_score": stmt.excluded.overall_score,
+                    "skills_match_score": stmt.excluded.skills_match_score,
+                    "matched_skills": stmt.excluded.matched_skills,
+                    "missing_skills": stmt.excluded.missing_skills,
+                    "matched_at": stmt.excluded.matched_at
+                }
+            )
+            await self.db.execute(stmt)
+        
+        # Rank by the absolute overall_score, not by this run's (possibly fused) order
+        await self.db.execute(
+            text("""
+                UPDATE job_matches AS jm
+                SET rank = ranked.position
+                FROM (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY overall_score DESC, id) AS position
+                    FROM job_matches
+                    WHERE job_id = :job_id
+                ) AS ranked
+                WHERE jm.id = ranked.id AND jm.rank IS DISTINCT FROM ranked.position
+            """),
+            {"job_id": job_id}
+        )
@@ -3,19 +3,33 @@ Main FastAPI application setup and configuration.
 """
 
 from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import logging
 
 from app.config import settings
-from app.database import engine, Base, get_db, init_db, check_database_connection
+from app.database import engine, Base, get_db, init_db, check_database_connection, SessionLocal
+from app.resumes.skill_stats import refresh_skill_stats, rebuild_skill_stats
+from app.resumes.maintenance import table_maintenance
+from app.resumes.text_index import build_text_index
+from app.resumes.vector_index import build_vector_index
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.tracing import RequestIdFilter
+from app.ai.lifecycle import model_manager
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
 )
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIdFilter())
 logger = logging.getLogger(__name__)
 
 
@@ -32,15 +46,34 @@ async def lifespan(app: FastAPI):
     if not check_database_connection():
         raise RuntimeError("Database connection failed")
     init_db()
-
+    
     logger.info("Database connected successfully")
     
+    # Build the skill IDF table; requests then read only new analyses
+    db = SessionLocal()
+    try:
+        refresh_skill_stats(db)
+    finally:
+        db.close()
+    
     # Pre-load models here
     # logger.info("Loading AI models...")
     
+    # Unload idle models and enforce MODEL_RSS_BUDGET_MB
+    model_manager.start()
+    
+    # Periodic full recounts run off the request path, as do the first builds of
+    # the BM25 and embedding indexes, so startup doesn't read the whole corpus
+    table_maintenance.add("skill stats", rebuild_skill_stats, settings.SKILL_STATS_REBUILD_SECONDS)
+    table_maintenance.add("resume text index", build_text_index, 0, immediately=True)
+    table_maintenance.add("resume vector index", build_vector_index, 0, immediately=True)
+    table_maintenance.start(asyncio.get_running_loop())
+    
     yield
     
     logger.info("Shutting down ResumeIQ API...")
+    table_maintenance.stop()
+    model_manager.stop()
 
 
 # Create FastAPI instance
@@ -53,6 +86,18 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Admission control runs after rate limiting; both sit inside CORS so
+# 429 and 503 responses still carry CORS headers
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(RateLimitMiddleware)
+
+# Outermost of our middleware so shed and rate-limited requests are timed too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Request ids and root spans wrap everything else
+app.add_middleware(TracingMiddleware)
+
 # Configure CORS (adjust origins for production)
 app.add_middleware(
     CORSMiddleware,
@@ -91,6 +136,16 @@ async def health_check():
     }
 
 
+# Prometheus scrape endpoint
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """
+        Prometheus metrics in text exposition format
+        """
+        return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
 # API Info endpoint
 @app.get("/api/v1/info", tags=["Info"])
 async def api_info():
@@ -144,3 +199,6 @@ app.include_router(job_router, prefix="/api/v1/jobs", tags=["Jobs"])
 
 from app.resumes.ai_router import router as ai_router
 app.include_router(ai_router, prefix="/api/v1/ai", tags=["AI Analysis"])
+
+from app.admin.router import router as admin_router
+app.include_router(admin_router, prefix="/api/v1/admin", tags=["Admin"])
@@ -0,0 +1,127 @@
+"""
+Prometheus metrics.
+
+Every metric lives here so instrumented modules import one name and
+/metrics renders the default registry.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.tracing import span
+
+# Buckets from sub-millisecond regex stages up to multi-second model calls
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+LOAD_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REQUEST_LATENCY = Histogram(
+    "resumeiq_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS
+)
+ANALYSIS_STAGE_LATENCY = Histogram(
+    "resumeiq_analysis_stage_duration_seconds",
+    "Time spent in each resume analyzer stage",
+    ["stage", "profile"],
+    buckets=STAGE_BUCKETS
+)
+PDF_EXTRACTION_LATENCY = Histogram(
+    "resumeiq_pdf_extraction_duration_seconds",
+    "PDF text extraction time by parser that produced the text",
+    ["parser"],
+    buckets=STAGE_BUCKETS
+)
+DB_QUERY_LATENCY = Histogram(
+    "resumeiq_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ["operation"],
+    buckets=DB_BUCKETS
+)
+MODEL_LOAD_LATENCY = Histogram(
+    "resumeiq_model_load_duration_seconds",
+    "Model load time",
+    ["model"],
+    buckets=LOAD_BUCKETS
+)
+
+CACHE_REQUESTS = Counter(
+    "resumeiq_cache_requests_total",
+    "In-process cache lookups",
+    ["cache", "result"]
+)
+FALLBACKS = Counter(
+    "resumeiq_fallbacks_total",
+    "Degraded code paths taken (fallback models, regex extraction, shed load)",
+    ["component", "reason"]
+)
+MODEL_UNLOADS = Counter(
+    "resumeiq_model_unloads_total",
+    "Models unloaded by the lifecycle manager (idle TTL or RSS budget)",
+    ["model", "reason"]
+)
+
+MODEL_LOADED = Gauge(
+    "resumeiq_model_loaded",
+    "1 while a model is loaded in this process",
+    ["model"]
+)
+MODEL_MEMORY = Gauge(
+    "resumeiq_model_memory_bytes",
+    "Parameter and buffer memory held by a loaded model",
+    ["model"]
+)
+
+
+class StageTimer:
+    """
+    Times the stages of one analysis. Each stage is observed into
+    ANALYSIS_STAGE_LATENCY, traced as an `analysis.<stage>` span and kept
+    for the response's `timings` block.
+    """
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            with span(f"analysis.{name}", profile=self.profile):
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            ANALYSIS_STAGE_LATENCY.labels(name, self.profile).observe(elapsed)
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def as_dict(self) -> Dict[str, float]:
+        """Milliseconds per stage plus the total"""
+        timings = {name: round(seconds * 1000, 2) for name, seconds in self.timings.items()}
+        timings["total"] = round((time.perf_counter() - self._started) * 1000, 2)
+        return timings
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_fallback(component: str, reason: str):
+    FALLBACKS.labels(component, reason).inc()
+
+
+def model_memory_bytes(*modules) -> Optional[int]:
+    """Bytes of parameters and buffers across torch modules, None if there are none"""
+    total, found = 0, False
+    for module in modules:
+        if module is None or not hasattr(module, "parameters"):
+            continue
+        found = True
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    return total if found else None
@@ -0,0 +1 @@
+"""ASGI middleware for request admission"""
\ No newline at end of file
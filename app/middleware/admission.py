@@ -0,0 +1,114 @@
+"""Admission control and load shedding for the inference-heavy endpoints"""
+
+import logging
+import math
+import re
+from typing import List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.config import settings
+from app.ai.inference import AdmissionController, AdmissionTicket, admission_controller, INTERACTIVE, BULK
+from app.models.analysis import AnalysisProfile
+from app.metrics import record_fallback
+
+logger = logging.getLogger(__name__)
+
+# (method, path pattern, can degrade to the fast profile) for inference routes
+ADMISSION_ROUTES: List[Tuple[str, "re.Pattern", bool]] = [
+    ("POST", re.compile(r"^/api/v1/ai/analyze/[^/]+$"), True),
+    ("POST", re.compile(r"^/api/v1/ai/analyze-text$"), True),
+    ("POST", re.compile(r"^/api/v1/ai/match-score$"), False),
+    ("POST", re.compile(r"^/api/v1/jobs/[^/]+/match$"), False),
+]
+
+# Bytes per resume id in a job match body: a quoted UUID and a separator
+MATCH_ID_BYTES = 39
+
+PRIORITY_HEADER = b"x-request-priority"
+
+
+def _match_route(method: str, path: str) -> Optional[bool]:
+    """Whether the route can degrade, or None if it is not admission controlled"""
+    for route_method, pattern, degradable in ADMISSION_ROUTES:
+        if method == route_method and pattern.match(path):
+            return degradable
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    Sheds inference load before it queues. Each request's cost is estimated
+    from its body size (stored resumes use ADMISSION_DEFAULT_CHARS); when the
+    projected wait exceeds ADMISSION_LATENCY_TARGET_MS the request is served
+    with the rule-based fast profile (request.state.analysis_profile) or a 503.
+    Clients mark batch traffic with `X-Request-Priority: bulk`; it is shed first.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        # Every request on these routes is charged: the profile a route runs is
+        # only known once it has parsed its form/query. Routes that settle on
+        # the fast profile give the charge back (release_admission)
+        degradable = _match_route(scope["method"], scope["path"])
+        if degradable is None:
+            await self.app(scope, receive, send)
+            return
+
+        chars, priority = self._estimate(scope)
+
+        if not self.controller.try_admit(chars, priority):
+            if degradable and settings.ADMISSION_DEGRADE:
+                logger.info(f"Inference saturated, serving fast analysis for {scope['path']}")
+                record_fallback("admission", "fast_profile")
+                scope.setdefault("state", {})["analysis_profile"] = AnalysisProfile.FAST
+                await self.app(scope, receive, send)
+                return
+
+            logger.warning(f"Inference saturated, shedding {priority} request to {scope['path']}")
+            record_fallback("admission", f"shed_{priority}")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Analysis capacity exceeded, retry later", "type": "overloaded"},
+                headers={"Retry-After": str(math.ceil(self.controller.retry_after()))}
+            )
+            await response(scope, receive, send)
+            return
+
+        ticket = AdmissionTicket(self.controller, chars)
+        scope.setdefault("state", {})["admission"] = ticket
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ticket.release()
+
+    def _estimate(self, scope) -> Tuple[int, str]:
+        """(estimated characters of input, priority) from the request headers"""
+        content_length = None
+        priority = INTERACTIVE
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    pass
+            elif name == PRIORITY_HEADER and value.strip().lower() == BULK.encode():
+                priority = BULK
+
+        # Job matching scores up to MATCH_CANDIDATE_CAP stored resumes
+        if scope["path"].startswith("/api/v1/jobs/"):
+            resumes = min(max((content_length or 0) // MATCH_ID_BYTES, 1), settings.MATCH_CANDIDATE_CAP)
+            return resumes * settings.ADMISSION_DEFAULT_CHARS, priority
+
+        # analyze/{id} reads the resume from the database; its body is empty
+        if not content_length or scope["path"].startswith("/api/v1/ai/analyze/"):
+            return settings.ADMISSION_DEFAULT_CHARS + len(scope.get("query_string", b"")), priority
+        return content_length, priority
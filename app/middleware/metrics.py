@@ -0,0 +1,56 @@
+"""Request latency metrics per route template"""
+
+import time
+from typing import Dict
+
+from app.metrics import REQUEST_LATENCY
+
+# Label for paths that matched no route, so scanners can't blow up cardinality
+UNMATCHED = "unmatched"
+
+# endpoint function -> route path, filled lazily from the app's routes
+_route_templates: Dict[object, str] = {}
+
+
+def route_template(scope) -> str:
+    """Template of the route the router matched, from the endpoint it set on the scope"""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED
+    if endpoint not in _route_templates:
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is not None:
+                _route_templates.setdefault(route.endpoint, route.path)
+    return _route_templates.get(endpoint, UNMATCHED)
+
+
+class MetricsMiddleware:
+    """
+    Observes every HTTP request into REQUEST_LATENCY, labelled with the route
+    template (/api/v1/resumes/{resume_id}) rather than the raw path. Sits
+    outside rate limiting and admission control so 429s and 503s are counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(
+                scope["method"], route_template(scope), str(status)
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,225 @@
+"""Token bucket rate limiting for the API (RATE_LIMIT_* settings)"""
+
+import logging
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.config import settings
+from app.auth.utils import verify_token
+
+logger = logging.getLogger(__name__)
+
+# (method, path pattern, cost) for routes that run model inference; they draw
+# on a separate per-user and per-IP quota of RATE_LIMIT_AI_UNITS_PER_MINUTE
+AI_ROUTE_COSTS: List[Tuple[str, "re.Pattern", int]] = [
+    ("POST", re.compile(r"^/api/v1/ai/analyze/[^/]+$"), 5),
+    ("POST", re.compile(r"^/api/v1/ai/analyze-text$"), 5),
+    ("POST", re.compile(r"^/api/v1/ai/match-score$"), 3),
+    ("GET", re.compile(r"^/api/v1/ai/skills/extract$"), 1),
+    ("POST", re.compile(r"^/api/v1/jobs/[^/]+/match$"), 10),
+]
+
+EXEMPT_PATHS = {"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+
+def route_cost(method: str, path: str) -> int:
+    """AI quota units a request costs (0 for routes without inference)"""
+    for route_method, pattern, cost in AI_ROUTE_COSTS:
+        if method == route_method and pattern.match(path):
+            return cost
+    return 0
+
+
+# (key, cost, capacity, refill rate in tokens/s) for one bucket a request draws on
+Bucket = Tuple[str, float, float, float]
+
+
+class BucketStore(ABC):
+    """Where token bucket state lives"""
+
+    @abstractmethod
+    async def take(self, buckets: List[Bucket]) -> Tuple[bool, float, int]:
+        """
+        Take each bucket's cost only if every bucket can pay it; otherwise take
+        nothing. Returns (allowed, seconds until it would be allowed, index of
+        the bucket with the longest wait or -1).
+        """
+
+
+class MemoryBucketStore(BucketStore):
+    """Buckets in this process only; fine for a single node"""
+
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, buckets: List[Bucket]) -> Tuple[bool, float, int]:
+        now = time.monotonic()
+
+        with self._lock:
+            refilled = []
+            retry_after, limiting = 0.0, -1
+            for index, (key, cost, capacity, rate) in enumerate(buckets):
+                cost = min(cost, capacity)
+                tokens, updated_at = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                if tokens < cost and (cost - tokens) / rate > retry_after:
+                    retry_after, limiting = (cost - tokens) / rate, index
+                refilled.append((key, tokens, cost))
+
+            allowed = limiting < 0
+            for key, tokens, cost in refilled:
+                self._buckets[key] = (tokens - cost if allowed else tokens, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return allowed, retry_after, limiting
+
+
+# Refill every bucket and take from all or none in one round trip; uses the
+# Redis clock so nodes agree. ARGV holds (capacity, rate, cost) per key.
+_REDIS_TAKE = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local tokens = {}
+local retry_after = 0
+local limiting = -1
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[3 * i - 2])
+    local rate = tonumber(ARGV[3 * i - 1])
+    local cost = math.min(tonumber(ARGV[3 * i]), capacity)
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local ts = tonumber(state[2]) or now
+    tokens[i] = math.min(capacity, (tonumber(state[1]) or capacity) + math.max(0, now - ts) * rate)
+    if tokens[i] < cost and (cost - tokens[i]) / rate > retry_after then
+        retry_after = (cost - tokens[i]) / rate
+        limiting = i - 1
+    end
+end
+
+local allowed = 0
+if limiting < 0 then
+    allowed = 1
+end
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[3 * i - 2])
+    local rate = tonumber(ARGV[3 * i - 1])
+    if allowed == 1 then
+        tokens[i] = tokens[i] - math.min(tonumber(ARGV[3 * i]), capacity)
+    end
+    redis.call('HSET', KEYS[i], 'tokens', tokens[i], 'ts', now)
+    redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 1)
+end
+return {allowed, tostring(retry_after), limiting}
+"""
+
+
+class RedisBucketStore(BucketStore):
+    """
+    Buckets shared by every node through Redis. One script touches all of a
+    request's keys, so this needs a single Redis rather than a Cluster.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self._take = self.client.register_script(_REDIS_TAKE)
+
+    async def take(self, buckets: List[Bucket]) -> Tuple[bool, float, int]:
+        args = []
+        for _, cost, capacity, rate in buckets:
+            args.extend([capacity, rate, cost])
+        allowed, retry_after, limiting = await self._take(keys=[key for key, *_ in buckets], args=args)
+        return bool(int(allowed)), float(retry_after), int(limiting)
+
+
+def build_bucket_store(kind: Optional[str] = None) -> BucketStore:
+    """Store named by RATE_LIMIT_STORE ("memory" or "redis")"""
+    kind = kind or settings.RATE_LIMIT_STORE
+    if kind == "redis":
+        try:
+            return RedisBucketStore(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("RATE_LIMIT_STORE=redis but the redis package is not installed; using memory")
+    return MemoryBucketStore()
+
+
+class RateLimitMiddleware:
+    """
+    Token buckets for all requests (RATE_LIMIT_PER_MINUTE) and for inference
+    routes, charged by AI_ROUTE_COSTS. Every request draws on buckets for its
+    IP and, when it carries a valid access token, for its user too, so neither
+    rotating IPs nor sharing an account gets around the limits. Tokens are only
+    taken when every bucket admits the request. Store errors let the request
+    through rather than failing the API.
+    """
+
+    def __init__(self, app, store: Optional[BucketStore] = None):
+        self.app = app
+        self.store = store or build_bucket_store()
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        clients = self._client_keys(scope)
+        per_minute = settings.RATE_LIMIT_PER_MINUTE
+        buckets: List[Bucket] = [(f"rl:{client}", 1, per_minute, per_minute / 60) for client in clients]
+
+        cost = route_cost(scope["method"], scope["path"])
+        if cost:
+            ai_per_minute = settings.RATE_LIMIT_AI_UNITS_PER_MINUTE
+            buckets.extend((f"rl:ai:{client}", cost, ai_per_minute, ai_per_minute / 60) for client in clients)
+
+        try:
+            allowed, retry_after, limiting = await self.store.take(buckets)
+        except Exception as e:
+            logger.warning(f"Rate limit store error, allowing request: {e}")
+            allowed = True
+
+        if not allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded", "type": "rate_limited"},
+                headers={
+                    "Retry-After": str(max(1, math.ceil(retry_after))),
+                    "X-RateLimit-Limit": str(int(buckets[limiting][2]))
+                }
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _client_keys(self, scope) -> List[str]:
+        """ip:<address>, plus user:<id> for a valid bearer token"""
+        # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+        client = scope.get("client")
+        keys = [f"ip:{client[0] if client else 'unknown'}"]
+
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    payload = verify_token(token, token_type="access")
+                    if payload and payload.get("sub"):
+                        keys.append(f"user:{payload['sub']}")
+                break
+
+        return keys
@@ -0,0 +1,81 @@
+"""Request ids and root spans for tracing"""
+
+import re
+import uuid
+from typing import Optional, Tuple
+
+from app.middleware.metrics import route_template
+from app.tracing import request_id_var, should_sample, trace
+
+REQUEST_ID_HEADER = b"x-request-id"
+TRACEPARENT_HEADER = b"traceparent"
+
+# Client-supplied ids are echoed into logs and headers, so keep them boring
+_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._\-]{1,64}$")
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def _parse_traceparent(value: bytes) -> Tuple[Optional[str], Optional[str], Optional[bool]]:
+    """(trace id, parent span id, sampled) from a W3C traceparent header"""
+    match = _TRACEPARENT.match(value.decode("latin-1").strip().lower())
+    if not match or match.group(1) == "0" * 32:
+        return None, None, None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+class TracingMiddleware:
+    """
+    Gives every request an id (X-Request-ID, generated if absent or invalid)
+    that is echoed on the response and added to log records. Sampled
+    requests get a root span; an upstream W3C traceparent joins its trace
+    and keeps its sampling decision.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        trace_id = parent_id = parent_sampled = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER and _REQUEST_ID.match(value):
+                request_id = value.decode()
+            elif name == TRACEPARENT_HEADER:
+                trace_id, parent_id, parent_sampled = _parse_traceparent(value)
+        request_id = request_id or uuid.uuid4().hex
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(REQUEST_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            with trace(
+                f"{scope['method']} {scope['path']}",
+                should_sample(parent_sampled),
+                trace_id=trace_id,
+                parent_id=parent_id,
+                request_id=request_id
+            ) as root:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    if root is not None:
+                        route = route_template(scope)
+                        root.name = f"{scope['method']} {route}"
+                        root.set_attribute("http.method", scope["method"])
+                        root.set_attribute("http.route", route)
+                        root.set_attribute("http.target", scope["path"])
+                        root.set_attribute("http.status_code", status)
+        finally:
+            request_id_var.reset(token)
@@ -3,6 +3,6 @@
 from app.models.user import User
 from app.models.resume import Resume
 from app.models.job import JobDescription
-from app.models.analysis import Analysis, JobMatch
+from app.models.analysis import Analysis, AnalysisProfile, JobMatch
 
-__all__ = ["User", "Resume", "JobDescription", "Analysis", "JobMatch"]
\ No newline at end of file
+__all__ = ["User", "Resume", "JobDescription", "Analysis", "AnalysisProfile", "JobMatch"]
\ No newline at end of file
@@ -1,13 +1,24 @@
 """Analysis models for resume analysis results and job matching"""
 
-from sqlalchemy import Column, String, DateTime, Text, Integer, Float, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Integer, Float, Enum, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
+import enum
 
 from app.database import Base
 
+# Deferred column group for the heavy Analysis payload
+DETAILS = "details"
+
+
+class AnalysisProfile(str, enum.Enum):
+    """Which analysis stages ran"""
+    FAST = "fast"  # Rule-based only, no models
+    STANDARD = "standard"  # Rule-based entities, embedding similarity for job match
+    FULL = "full"  # NER model and embedding similarity
+
 
 class Analysis(Base):
     """Stores the AI analysis results for a resume"""
@@ -16,39 +27,50 @@ class Analysis(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), unique=True, nullable=False)
     
+    # Heavy JSONB/ARRAY columns below are deferred as one group; load them
+    # with app.models.loaders.with_analysis_details when needed
+    
     # Extracted information
-    extracted_skills = Column(ARRAY(String), nullable=True)
-    technical_skills = Column(ARRAY(String), nullable=True)
-    soft_skills = Column(ARRAY(String), nullable=True)
+    extracted_skills = deferred(Column(ARRAY(String), nullable=True), group=DETAILS)
+    technical_skills = deferred(Column(ARRAY(String), nullable=True), group=DETAILS)
+    soft_skills = deferred(Column(ARRAY(String), nullable=True), group=DETAILS)
     
     # Experience
     total_experience_years = Column(Float, nullable=True)
     experience_level = Column(String(50), nullable=True)  # Junior, Mid, Senior, Executive
-    work_history = Column(JSONB, nullable=True)  # List of {company, position, duration, description}
+    work_history = deferred(Column(JSONB, nullable=True), group=DETAILS)  # List of {company, position, duration, description}
     
     # Education
     education_level = Column(String(100), nullable=True)  # Bachelor's, Master's, PhD, etc.
-    education_details = Column(JSONB, nullable=True)  # List of {degree, institution, year}
+    education_details = deferred(Column(JSONB, nullable=True), group=DETAILS)  # List of {degree, institution, year}
     
     # Contact information (extracted)
-    contact_info = Column(JSONB, nullable=True)  # {email, phone, linkedin, github, etc.}
+    contact_info = deferred(Column(JSONB, nullable=True), group=DETAILS)  # {email, phone, linkedin, github, etc.}
     
     # Scores
     ats_score = Column(Integer, nullable=True)  # 0-100
     completeness_score = Column(Integer, nullable=True)  # 0-100
     
     # Additional extracted data
-    languages = Column(ARRAY(String), nullable=True)
-    certifications = Column(JSONB, nullable=True)
-    projects = Column(JSONB, nullable=True)
-    achievements = Column(JSONB, nullable=True)
+    languages = deferred(Column(ARRAY(String), nullable=True), group=DETAILS)
+    certifications = deferred(Column(JSONB, nullable=True), group=DETAILS)
+    projects = deferred(Column(JSONB, nullable=True), group=DETAILS)
+    achievements = deferred(Column(JSONB, nullable=True), group=DETAILS)
     
     # AI model outputs
-    ner_entities = Column(JSONB, nullable=True)  # Raw NER output
-    skills_confidence = Column(JSONB, nullable=True)  # Skill extraction confidence scores
+    ner_entities = deferred(Column(JSONB, nullable=True), group=DETAILS)  # Raw NER output
+    skills_confidence = deferred(Column(JSONB, nullable=True), group=DETAILS)  # Skill extraction confidence scores
+    
+    # Which stages produced this row
+    analysis_profile = Column(
+        Enum(AnalysisProfile),
+        default=AnalysisProfile.FULL,
+        server_default=AnalysisProfile.FULL.name,
+        nullable=False
+    )
     
     # Timestamps
-    analyzed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    analyzed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     # Relationships
     resume = relationship("Resume", back_populates="analysis")
@@ -57,6 +79,10 @@ class Analysis(Base):
 class JobMatch(Base):
     """Stores the matching results between a resume and job description"""
     __tablename__ = "job_matches"
+    __table_args__ = (
+        # One row per resume/job pair; target of the bulk upsert in JobService
+        UniqueConstraint("resume_id", "job_id", name="uq_job_matches_resume_id_job_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), nullable=False)
@@ -87,3 +113,12 @@ class JobMatch(Base):
     # Relationships
     resume = relationship("Resume", back_populates="job_matches")
     job_description = relationship("JobDescription", back_populates="job_matches")
+
+
+# Leaderboard keyset pagination: WHERE job_id = ? ORDER BY overall_score DESC, id
+Index(
+    "ix_job_matches_job_id_overall_score",
+    JobMatch.job_id,
+    JobMatch.overall_score.desc(),
+    JobMatch.id
+)
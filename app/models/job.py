@@ -1,6 +1,6 @@
 """Job description model for job postings and requirements"""
 
-from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -11,6 +11,11 @@ from app.database import Base
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        # Listings, newest first (keyset on created_at, id)
+        Index("ix_job_descriptions_is_active_created_at", "is_active", "created_at", "id"),
+        Index("ix_job_descriptions_user_id_created_at", "user_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,36 @@
+"""Column loading profiles for the heavy Resume and Analysis columns.
+
+Resume.raw_text / parsed_data and the JSONB/ARRAY columns of Analysis are
+deferred on the models, so plain queries only read the light metadata.
+Queries that really need the payload opt in with one of these options.
+"""
+
+from sqlalchemy.orm import undefer, undefer_group, selectinload
+
+from app.models.resume import Resume
+from app.models.analysis import Analysis, DETAILS
+
+
+def with_text():
+    """Load Resume.raw_text in the same SELECT"""
+    return undefer(Resume.raw_text)
+
+
+def with_parsed_data():
+    """Load Resume.parsed_data in the same SELECT"""
+    return undefer(Resume.parsed_data)
+
+
+def with_embedding():
+    """Load Resume.embedding in the same SELECT"""
+    return undefer(Resume.embedding)
+
+
+def with_analysis_details():
+    """Load every deferred Analysis column in the same SELECT"""
+    return undefer_group(DETAILS)
+
+
+def with_analysis():
+    """Eager-load Resume.analysis including its deferred columns"""
+    return selectinload(Resume.analysis).undefer_group(DETAILS)
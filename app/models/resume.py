@@ -1,8 +1,8 @@
 """Resume model for storing uploaded resumes and their metadata"""
 
-from sqlalchemy import Column, String, DateTime, Text, Integer, Enum, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Integer, Enum, ForeignKey, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 import enum
@@ -20,6 +20,10 @@ class ResumeStatus(str, enum.Enum):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Per-user listing, newest first (keyset on uploaded_at, id)
+        Index("ix_resumes_user_id_uploaded_at", "user_id", "uploaded_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -30,9 +34,10 @@ class Resume(Base):
     file_size = Column(Integer, nullable=False)  # in bytes
     file_type = Column(String(50), nullable=False)  # pdf, docx, txt
     
-    # Content
-    raw_text = Column(Text, nullable=True)
-    parsed_data = Column(JSONB, nullable=True)  # Structured extracted data
+    # Content (deferred: load with app.models.loaders.with_text when needed)
+    raw_text = deferred(Column(Text, nullable=True))
+    parsed_data = deferred(Column(JSONB, nullable=True))  # Structured extracted data
+    embedding = deferred(Column(LargeBinary, nullable=True))  # Unit-length float32 text embedding
     
     # Metadata
     candidate_name = Column(String(255), nullable=True)
@@ -47,6 +52,7 @@ class Resume(Base):
     # Timestamps
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    embedded_at = Column(DateTime, nullable=True, index=True)
     
     # Relationships
     user = relationship("User", back_populates="resumes")
@@ -1,35 +1,66 @@
 """API endpoints for AI-powered resume analysis"""
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from datetime import datetime
 import json
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.resume import Resume
-from app.models.analysis import Analysis
-from app.auth.dependencies import get_current_active_user
-from app.models.user import User
+from app.models.analysis import Analysis, AnalysisProfile
+from app.models.loaders import with_text
+from app.auth.dependencies import CurrentUser, get_current_active_user
 from app.resumes.analyzer import ResumeAnalyzer
+from app.resumes.skill_stats import apply_analysis
+from app.ai.inference import run_inference, release_admission
+from app.ai.vector_index import embedding_to_bytes, resume_vector_index
+from app.config import settings
 
 router = APIRouter()
 analyzer = ResumeAnalyzer()
 
+
+async def _run_analysis(
+    request: Request,
+    text: str,
+    job_description: Optional[str],
+    profile: Optional[AnalysisProfile],
+    include_timings: bool = False
+) -> dict:
+    """Analyze with the requested profile, or fast when AdmissionMiddleware is shedding load"""
+    profile = profile or AnalysisProfile(settings.ANALYSIS_DEFAULT_PROFILE)
+    if getattr(request.state, "analysis_profile", None) == AnalysisProfile.FAST:
+        profile = AnalysisProfile.FAST
+    if profile == AnalysisProfile.FAST:
+        # Rule-based only: don't hold inference capacity other requests could use
+        release_admission(request)
+    results = await analyzer.analyze_resume(text, job_description, profile)
+    if not include_timings:
+        results.pop("timings", None)
+    return results
+
+
 @router.post("/analyze/{resume_id}")
 async def analyze_resume(
+    request: Request,
     resume_id: str,
     job_description: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    profile: Optional[AnalysisProfile] = Query(None, description="fast, standard or full (default ANALYSIS_DEFAULT_PROFILE)"),
+    timings: bool = Query(False, description="Include per-stage timings (ms) in the response"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Analyze a resume using AI models
     """
     # Get resume from database
-    resume = db.query(Resume).filter(
+    result = await db.execute(select(Resume).options(with_text()).where(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
-    ).first()
+    ))
+    resume = result.scalars().first()
     
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
@@ -37,11 +68,8 @@ async def analyze_resume(
     if not resume.raw_text:
         raise HTTPException(status_code=400, detail="Resume text not available")
     
-    # Perform analysis
-    analysis_results = await analyzer.analyze_resume(
-        resume.raw_text,
-        job_description
-    )
+    # Perform analysis (fast profile when admission control is shedding load)
+    analysis_results = await _run_analysis(request, resume.raw_text, job_description, profile, timings)
     
     # Save analysis to database
     analysis = Analysis(
@@ -54,12 +82,30 @@ async def analyze_resume(
         work_history=analysis_results.get("work_history", []),
         contact_info=analysis_results.get("contact_info", {}),
         ats_score=analysis_results.get("ats_score"),
-        ner_entities=analysis_results.get("entities", {})
+        ner_entities=analysis_results.get("entities", {}),
+        analysis_profile=AnalysisProfile(analysis_results.get("analysis_profile", AnalysisProfile.FULL))
     )
     
     db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
+    
+    # Store the resume embedding for job matching (the fast profile runs no models)
+    embedding = None
+    if analysis.analysis_profile != AnalysisProfile.FAST:
+        embedding = await run_inference(
+            analyzer.similarity_calculator.embed,
+            resume.raw_text,
+            chars=len(resume.raw_text)
+        )
+    if embedding is not None:
+        resume.embedding = embedding_to_bytes(embedding)
+        resume.embedded_at = datetime.utcnow()
+    
+    await db.commit()
+    
+    # Fold the new row into the skill IDF table (no table read) and the embedding into the vector index
+    apply_analysis(resume.id, analysis_results.get("all_skills", []))
+    if embedding is not None:
+        resume_vector_index.add(resume.id, embedding)
     
     return {
         "message": "Analysis completed successfully",
@@ -68,15 +114,18 @@ async def analyze_resume(
 
 @router.post("/analyze-text")
 async def analyze_text(
+    request: Request,
     text: str = Form(...),
     job_description: Optional[str] = Form(None),
-    #current_user: User = Depends(get_current_active_user)
+    profile: Optional[AnalysisProfile] = Form(None),
+    timings: bool = Form(False),
+    #current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """
     Analyze resume text directly without saving
     """
     # Perform analysis
-    analysis_results = await analyzer.analyze_resume(text, job_description)
+    analysis_results = await _run_analysis(request, text, job_description, profile, timings)
     
     return {
         "message": "Analysis completed successfully",
@@ -86,7 +135,7 @@ async def analyze_text(
 @router.get("/skills/extract")
 async def extract_skills_from_text(
     text: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """
     Extract skills from any text
@@ -100,7 +149,7 @@ async def extract_skills_from_text(
 async def calculate_match_score(
     resume_text: str = Form(...),
     job_description: str = Form(...),
-    current_user: User = Depends(get_current_active_user)
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """
     Calculate match score between resume and job description
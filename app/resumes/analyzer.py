@@ -8,6 +8,9 @@ from app.ai.ner_extractor import NERExtractor
 from app.ai.skills_extractor import SkillsExtractor
 from app.ai.similarity import SimilarityCalculator
 from app.ai.experience_classifier import ExperienceClassifier
+from app.ai.inference import run_inference
+from app.metrics import StageTimer
+from app.models.analysis import AnalysisProfile
 
 logger = logging.getLogger(__name__)
 
@@ -15,30 +18,61 @@ class ResumeAnalyzer:
     """Orchestrate all AI models to analyze a resume"""
     
     def __init__(self):
-        self.ner_extractor = NERExtractor()
-        self.skills_extractor = SkillsExtractor()
-        self.similarity_calculator = SimilarityCalculator()
-        self.experience_classifier = ExperienceClassifier()
-        
-    async def analyze_resume(self, resume_text: str, job_description: Optional[str] = None) -> Dict[str, Any]:
+        self.ner_extractor = NERExtractor.shared()
+        self.skills_extractor = SkillsExtractor.shared()
+        self.similarity_calculator = SimilarityCalculator.shared()
+        self.experience_classifier = ExperienceClassifier.shared()
+    
+    async def analyze_resume(
+        self,
+        resume_text: str,
+        job_description: Optional[str] = None,
+        profile: AnalysisProfile = AnalysisProfile.FULL
+    ) -> Dict[str, Any]:
         """
         Perform complete analysis of a resume
         
         Args:
             resume_text: The text content of the resume
             job_description: Optional job description for matching
-            
+            profile: Which stages run. fast is rule-based only, standard adds
+                embedding similarity for the job match, full also runs NER
+        
         Returns:
             Dictionary containing all analysis results
         """
-        logger.info("Starting resume analysis")
+        # No model calls, so no point paying for a thread hop
+        if profile == AnalysisProfile.FAST:
+            return self._analyze_resume(resume_text, job_description, profile)
         
-        analysis_results = {}
+        return await run_inference(
+            self._analyze_resume,
+            resume_text,
+            job_description,
+            profile,
+            chars=len(resume_text) + len(job_description or "")
+        )
+    
+    def _analyze_resume(
+        self,
+        resume_text: str,
+        job_description: Optional[str] = None,
+        profile: AnalysisProfile = AnalysisProfile.FULL
+    ) -> Dict[str, Any]:
+        """Blocking analysis; model-backed profiles run on the inference pool"""
+        logger.info(f"Starting resume analysis ({profile.value})")
+        
+        analysis_results = {"analysis_profile": profile.value}
+        timer = StageTimer(profile.value)
         
         try:
-            # 1. Extract named entities
+            # 1. Extract named entities (regex only below the full profile)
             logger.info("Extracting entities...")
-            ner_results = self.ner_extractor.extract_entities(resume_text)
+            with timer.stage("ner"):
+                if profile == AnalysisProfile.FULL:
+                    ner_results = self.ner_extractor.extract_entities(resume_text)
+                else:
+                    ner_results = self.ner_extractor.extract_entities_fast(resume_text)
             analysis_results.update({
                 "candidate_name": ner_results.get("candidate_name"),
                 "contact_info": ner_results.get("contact_info", {}),
@@ -48,7 +82,8 @@ class ResumeAnalyzer:
             
             # 2. Extract skills
             logger.info("Extracting skills...")
-            skills_results = self.skills_extractor.extract_skills(resume_text)
+            with timer.stage("skills"):
+                skills_results = self.skills_extractor.extract_skills(resume_text)
             analysis_results.update({
                 "technical_skills": skills_results.get("technical_skills", []),
                 "soft_skills": skills_results.get("soft_skills", []),
@@ -57,7 +92,8 @@ class ResumeAnalyzer:
             
             # 3. Classify experience level
             logger.info("Classifying experience...")
-            experience_results = self.experience_classifier.classify_experience(resume_text)
+            with timer.stage("experience"):
+                experience_results = self.experience_classifier.classify_experience(resume_text)
             analysis_results.update({
                 "experience_years": experience_results.get("experience_years"),
                 "experience_level": experience_results.get("experience_level"),
@@ -66,42 +102,59 @@ class ResumeAnalyzer:
             
             # 4. Calculate ATS score
             logger.info("Calculating ATS score...")
-            ats_score = self._calculate_ats_score(analysis_results, resume_text)
+            with timer.stage("ats_score"):
+                ats_score = self._calculate_ats_score(analysis_results, resume_text)
             analysis_results["ats_score"] = ats_score
             
             # 5. If job description provided, calculate match
             if job_description:
                 logger.info("Calculating job match...")
-                match_results = await self.calculate_job_match(
-                    resume_text, 
-                    job_description,
-                    analysis_results.get("all_skills", [])
-                )
+                with timer.stage("job_match"):
+                    match_results = self._calculate_job_match(
+                        resume_text, 
+                        job_description,
+                        analysis_results.get("all_skills", []),
+                        use_similarity=profile != AnalysisProfile.FAST
+                    )
                 analysis_results["job_match"] = match_results
             
             # 6. Generate recommendations
-            recommendations = self._generate_recommendations(analysis_results)
+            with timer.stage("recommendations"):
+                recommendations = self._generate_recommendations(analysis_results)
             analysis_results["recommendations"] = recommendations
             
             # Add metadata
             analysis_results["analyzed_at"] = datetime.utcnow().isoformat()
             analysis_results["status"] = "completed"
-            
+        
         except Exception as e:
             logger.error(f"Error during resume analysis: {e}")
             analysis_results["status"] = "failed"
             analysis_results["error"] = str(e)
         
+        # Milliseconds per stage; routers drop it unless the client asks for it
+        analysis_results["timings"] = timer.as_dict()
+        
         return analysis_results
     
     async def calculate_job_match(self, resume_text: str, job_description: str, resume_skills: List[str]) -> Dict[str, Any]:
         """Calculate how well a resume matches a job description"""
-        
-        # Calculate overall similarity
-        similarity_score = self.similarity_calculator.calculate_similarity(
-            resume_text, 
-            job_description
+        return await run_inference(
+            self._calculate_job_match,
+            resume_text,
+            job_description,
+            resume_skills,
+            chars=len(resume_text) + len(job_description)
         )
+    
+    def _calculate_job_match(
+        self,
+        resume_text: str,
+        job_description: str,
+        resume_skills: List[str],
+        use_similarity: bool = True
+    ) -> Dict[str, Any]:
+        """Blocking job match; runs on the inference pool unless use_similarity is off"""
         
         # Extract required skills from job description
         job_skills = self.skills_extractor.extract_skills(job_description)
@@ -113,6 +166,23 @@ class ResumeAnalyzer:
             required_skills
         )
         
+        # Skill overlap only, for the fast profile
+        if not use_similarity:
+            return {
+                "overall_score": skill_match.get("weighted_match_score", 0),
+                "similarity_score": None,
+                "skills_match": skill_match,
+                "section_scores": {},
+                "matched_skills": skill_match.get("matched_skills", []),
+                "missing_skills": skill_match.get("missing_skills", [])
+            }
+        
+        # Calculate overall similarity
+        similarity_score = self.similarity_calculator.calculate_similarity(
+            resume_text, 
+            job_description
+        )
+        
         # Calculate section-wise similarity
         section_scores = self.similarity_calculator.find_similar_sections(
             resume_text,
@@ -122,7 +192,7 @@ class ResumeAnalyzer:
         # Overall match score (weighted average)
         overall_score = (
             similarity_score * 0.4 +
-            skill_match.get("match_score", 0) * 0.4 +
+            skill_match.get("weighted_match_score", 0) * 0.4 +
             max(section_scores.values(), default=0) * 0.2
         )
         
@@ -0,0 +1,102 @@
+"""
+Background upkeep of the in-memory search tables.
+
+Table-wide rebuilds read every row, so they run here on a daemon thread with
+their own session instead of inside whichever request notices they are due.
+Each rebuild fills fresh structures and swaps them in on the event loop,
+where requests read and update them; requests keep doing the cheap
+incremental refreshes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# A one-off job that failed is retried after this long
+RETRY_SECONDS = 60
+
+
+class _Job:
+    def __init__(self, name: str, run: Callable[[Session], Any], interval: float, immediately: bool):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        self.due = time.monotonic() + (0 if immediately else interval)
+
+
+class TableMaintenance:
+    """Runs registered rebuilds every `interval` seconds each on one daemon thread"""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self.jobs: List[_Job] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def add(self, name: str, run: Callable[[Session], Any], interval: float, immediately: bool = False):
+        """Register a rebuild; `immediately` also runs it as soon as the thread starts"""
+        if interval > 0 or immediately:
+            self.jobs.append(_Job(name, run, interval, immediately))
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Run the jobs on a daemon thread; swaps go through `loop` if given"""
+        if self._thread is not None or not self.jobs:
+            return
+        self.loop = loop
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="table-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.jobs = []
+
+    def swap(self, replace: Callable[..., Any], *args):
+        """Call `replace` on the event loop and wait for it; directly if there is no loop"""
+        if self.loop is None or self._thread is not threading.current_thread():
+            return replace(*args)
+
+        async def call():
+            return replace(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result()
+
+    def _run(self):
+        while self.jobs and not self._stop.is_set():
+            job = min(self.jobs, key=lambda job: job.due)
+            if self._stop.wait(max(job.due - time.monotonic(), 0)):
+                return
+            ok = self._run_job(job)
+            if job.interval > 0:
+                job.due = time.monotonic() + job.interval
+            elif ok:
+                self.jobs.remove(job)
+            else:
+                job.due = time.monotonic() + RETRY_SECONDS
+
+    def _run_job(self, job: _Job) -> bool:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            job.run(db)
+            logger.info(f"Rebuilt {job.name} in {time.perf_counter() - started:.1f}s")
+            return True
+        except Exception as e:
+            logger.error(f"Rebuilding {job.name} failed: {e}")
+            return False
+        finally:
+            db.close()
+
+
+table_maintenance = TableMaintenance()
@@ -2,18 +2,19 @@
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, HTTPException
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 import os
 
-from app.database import get_db
-from app.auth.dependencies import get_current_active_user
-from app.models.user import User
+from app.database import get_async_db
+from app.auth.dependencies import CurrentUser, get_current_active_user
 from app.resumes.service import ResumeService
 from app.resumes import schemas
 from app.config import settings
 from app.models.analysis import Analysis
+from app.models.loaders import with_analysis_details
 
 router = APIRouter()
 
@@ -22,8 +23,8 @@ router = APIRouter()
 async def upload_resume(
     file: UploadFile = File(...),
     position_applied: Optional[str] = Form(None),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a new resume"""
     service = ResumeService(db)
@@ -34,12 +35,12 @@ async def upload_resume(
 @router.get("/{resume_id}", response_model=schemas.ResumeResponse)
 async def get_resume(
     resume_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific resume"""
     service = ResumeService(db)
-    return service.get_resume(resume_id, current_user)
+    return await service.get_resume(resume_id, current_user, load_text=True)
 
 
 @router.get("/", response_model=schemas.ResumeListResponse)
@@ -47,24 +48,25 @@ async def list_resumes(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     status: Optional[schemas.ResumeStatus] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List user's resumes"""
     service = ResumeService(db)
-    return service.list_resumes(current_user, page, per_page, status)
+    return await service.list_resumes(current_user, page, per_page, status, cursor)
 
 
 @router.put("/{resume_id}", response_model=schemas.ResumeResponse)
 async def update_resume(
     resume_id: UUID,
     update_data: schemas.ResumeUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update resume metadata"""
     service = ResumeService(db)
-    return service.update_resume(
+    return await service.update_resume(
         resume_id, 
         current_user, 
         update_data.model_dump(exclude_unset=True)
@@ -74,24 +76,24 @@ async def update_resume(
 @router.delete("/{resume_id}")
 async def delete_resume(
     resume_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a resume"""
     service = ResumeService(db)
-    service.delete_resume(resume_id, current_user)
+    await service.delete_resume(resume_id, current_user)
     return {"message": "Resume deleted successfully"}
 
 
 @router.get("/{resume_id}/download")
 async def download_resume(
     resume_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download the original resume file"""
     service = ResumeService(db)
-    resume = service.get_resume(resume_id, current_user)
+    resume = await service.get_resume(resume_id, current_user)
     
     file_path = os.path.join(settings.UPLOAD_DIR, resume.file_path)
     if not os.path.exists(file_path):
@@ -106,13 +108,14 @@ async def download_resume(
 @router.get("/{resume_id}/analysis")
 async def get_resume_analysis(
     resume_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get analysis for a resume"""
-    analysis = db.query(Analysis).filter(
+    result = await db.execute(select(Analysis).options(with_analysis_details()).where(
         Analysis.resume_id == resume_id
-    ).first()
+    ))
+    analysis = result.scalars().first()
     
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
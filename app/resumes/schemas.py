@@ -32,8 +32,8 @@ class ResumeUpdate(ResumeBase):
     status: Optional[ResumeStatus] = None
 
 
-class ResumeResponse(ResumeBase):
-    """Schema for resume response"""
+class ResumeSummary(ResumeBase):
+    """Schema for resume metadata, without the extracted text"""
     id: UUID
     user_id: UUID
     filename: str
@@ -42,17 +42,22 @@ class ResumeResponse(ResumeBase):
     status: ResumeStatus
     uploaded_at: datetime
     processed_at: Optional[datetime] = None
-    raw_text: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class ResumeResponse(ResumeSummary):
+    """Schema for resume response"""
+    raw_text: Optional[str] = None
+
+
 class ResumeListResponse(BaseModel):
     """Schema for resume list response"""
-    resumes: List[ResumeResponse]
+    resumes: List[ResumeSummary]
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class ResumeAnalysisResponse(BaseModel):
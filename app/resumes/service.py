@@ -5,25 +5,36 @@ import shutil
 from typing import List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import UploadFile, HTTPException
 import aiofiles
 
 from app.models.resume import Resume, ResumeStatus
+from app.models.loaders import with_text
 from app.models.user import User
 from app.config import settings
 from app.utils.file_handler import FileHandler
 from app.utils.pdf_parser import PDFParser
+from app.ai.bm25 import resume_text_index
+from app.ai.vector_index import resume_vector_index
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.tracing import traced
+
+# (user_id, status) -> number of resumes, shared by all requests in the process
+_count_cache = TTLCache(maxsize=10000, ttl=settings.LIST_COUNT_CACHE_SECONDS, name="resume_count")
 
 
 class ResumeService:
     """Service class for resume operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.file_handler = FileHandler()
         self.pdf_parser = PDFParser()
     
+    @traced("resume_service.create_resume")
     async def create_resume(
         self,
         file: UploadFile,
@@ -78,67 +89,110 @@ class ResumeService:
         )
         
         self.db.add(resume)
-        self.db.commit()
-        self.db.refresh(resume)
+        await self.db.commit()
+        
+        # Keep the lexical index and cached counts in step with the table
+        if raw_text:
+            resume_text_index.add(resume.id, raw_text)
+        _count_cache.invalidate_where(lambda key: key[0] == user.id)
         
         return resume
     
-    def get_resume(self, resume_id: UUID, user: User) -> Resume:
-        """Get a resume by ID"""
-        resume = self.db.query(Resume).filter(
+    @traced("resume_service.get_resume")
+    async def get_resume(self, resume_id: UUID, user: User, load_text: bool = False) -> Resume:
+        """Get a resume by ID (raw_text is only fetched with load_text=True)"""
+        query = select(Resume).where(
             Resume.id == resume_id,
             Resume.user_id == user.id
-        ).first()
+        )
+        if load_text:
+            query = query.options(with_text())
+        
+        resume = (await self.db.execute(query)).scalars().first()
         
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
         
         return resume
     
-    def list_resumes(
+    @traced("resume_service.list_resumes")
+    async def list_resumes(
         self,
         user: User,
         page: int = 1,
         per_page: int = 10,
-        status: Optional[ResumeStatus] = None
+        status: Optional[ResumeStatus] = None,
+        cursor: Optional[str] = None
     ) -> dict:
-        """List user's resumes with pagination"""
-        query = self.db.query(Resume).filter(Resume.user_id == user.id)
+        """
+        List user's resumes, newest first.
+        Pass the returned `next_cursor` to fetch the following page with a
+        keyset seek; `page` still works but costs an OFFSET scan.
+        """
+        filters = [Resume.user_id == user.id]
         
         if status:
-            query = query.filter(Resume.status == status)
-        
-        total = query.count()
-        resumes = query.offset((page - 1) * per_page).limit(per_page).all()
+            filters.append(Resume.status == status)
+        
+        total = _count_cache.get((user.id, status))
+        if total is None:
+            total = await self.db.scalar(select(func.count(Resume.id)).where(*filters))
+            _count_cache.set((user.id, status), total)
+        
+        query = select(Resume).where(*filters)
+        
+        if cursor:
+            last_uploaded_at, last_id = decode_cursor(cursor, 2)
+            try:
+                last_uploaded_at, last_id = datetime.fromisoformat(last_uploaded_at), UUID(last_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(tuple_(Resume.uploaded_at, Resume.id) < (last_uploaded_at, last_id))
+        elif page > 1:
+            query = query.offset((page - 1) * per_page)
+        
+        result = await self.db.execute(query.order_by(
+            Resume.uploaded_at.desc(),
+            Resume.id.desc()
+        ).limit(per_page + 1))
+        resumes = list(result.scalars())
+        
+        next_cursor = None
+        if len(resumes) > per_page:
+            resumes = resumes[:per_page]
+            next_cursor = encode_cursor(resumes[-1].uploaded_at.isoformat(), resumes[-1].id)
         
         return {
             "resumes": resumes,
             "total": total,
             "page": page,
-            "per_page": per_page
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }
+
     
-    def update_resume(
+    @traced("resume_service.update_resume")
+    async def update_resume(
         self,
         resume_id: UUID,
         user: User,
         update_data: dict
     ) -> Resume:
         """Update a resume"""
-        resume = self.get_resume(resume_id, user)
+        resume = await self.get_resume(resume_id, user, load_text=True)
         
         for field, value in update_data.items():
             if hasattr(resume, field) and value is not None:
                 setattr(resume, field, value)
         
-        self.db.commit()
-        self.db.refresh(resume)
+        await self.db.commit()
         
         return resume
     
-    def delete_resume(self, resume_id: UUID, user: User) -> bool:
+    @traced("resume_service.delete_resume")
+    async def delete_resume(self, resume_id: UUID, user: User) -> bool:
         """Delete a resume and its file"""
-        resume = self.get_resume(resume_id, user)
+        resume = await self.get_resume(resume_id, user)
         
         # Delete file
         file_path = os.path.join(settings.UPLOAD_DIR, resume.file_path)
@@ -146,7 +200,11 @@ class ResumeService:
             os.remove(file_path)
         
         # Delete database record
-        self.db.delete(resume)
-        self.db.commit()
+        await self.db.delete(resume)
+        await self.db.commit()
+        
+        resume_text_index.remove(resume_id)
+        resume_vector_index.remove(resume_id)
+        _count_cache.invalidate_where(lambda key: key[0] == user.id)
         
         return True
@@ -0,0 +1,153 @@
+"""Keep the in-memory skill corpus statistics and skill index in sync with the analyses table"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.analysis import Analysis
+from app.ai.skill_stats import SkillCorpusStats, skill_corpus_stats
+from app.ai.skill_index import SkillInvertedIndex, skill_index
+from app.resumes.maintenance import table_maintenance
+
+logger = logging.getLogger(__name__)
+
+# Session.info key of analyses deleted in the current transaction
+DELETED_ANALYSES = "deleted_analyses"
+
+
+def _count(db: Session, stats: SkillCorpusStats, index: SkillInvertedIndex) -> int:
+    """
+    Count and index Analysis rows not counted yet. The first call reads the
+    whole table; later calls read the ids in a SKILL_STATS_OVERLAP_SECONDS
+    window before the watermark (analyzed_at is set before the row commits,
+    so a slow transaction can land behind it) and load skills only for
+    resumes not counted yet. A resume has at most one analysis.
+    """
+    columns = (Analysis.resume_id, Analysis.extracted_skills, Analysis.analyzed_at)
+    if stats.watermark is None:
+        rows = db.query(*columns).order_by(Analysis.analyzed_at).yield_per(1000)
+    else:
+        since = stats.watermark - timedelta(seconds=settings.SKILL_STATS_OVERLAP_SECONDS)
+        recent = db.query(Analysis.resume_id, Analysis.analyzed_at).filter(Analysis.analyzed_at >= since).all()
+        for _, analyzed_at in recent:
+            stats.watermark = max(stats.watermark, analyzed_at)
+        new_ids = [resume_id for resume_id, _ in recent if resume_id not in index]
+        if not new_ids:
+            return 0
+        rows = db.query(*columns).filter(Analysis.resume_id.in_(new_ids)).order_by(Analysis.analyzed_at)
+
+    added = 0
+    for resume_id, skills, analyzed_at in rows:
+        if resume_id not in index:
+            apply_analysis(resume_id, skills or [], stats, index)
+            added += 1
+        stats.watermark = max(stats.watermark or analyzed_at, analyzed_at)
+    return added
+
+
+def apply_analysis(
+    resume_id: UUID,
+    skills: List[str],
+    stats: SkillCorpusStats = skill_corpus_stats,
+    index: SkillInvertedIndex = skill_index
+):
+    """Count an analysis this process just wrote, without reading the table"""
+    counted = index.forward.get(resume_id)
+    if counted is not None:
+        stats.remove_document_ids(counted)
+    stats.add_document(skills)
+    index.add(resume_id, skills)
+
+
+def rebuild_skill_stats(
+    db: Session,
+    stats: SkillCorpusStats = skill_corpus_stats,
+    index: SkillInvertedIndex = skill_index
+) -> int:
+    """
+    Recount every Analysis row into fresh tables and swap them in. Deletes
+    made through other workers only reach this process this way; it runs on
+    the table_maintenance thread every SKILL_STATS_REBUILD_SECONDS.
+    """
+    fresh_stats = SkillCorpusStats(stats.vocabulary)
+    fresh_index = SkillInvertedIndex(stats.vocabulary)
+    _count(db, fresh_stats, fresh_index)
+    table_maintenance.swap(_replace, stats, fresh_stats, index, fresh_index)
+
+    stats.refreshed_at = stats.rebuilt_at = time.monotonic()
+    logger.info(f"Skill corpus stats rebuilt: {stats.total_documents} analyses")
+    return stats.total_documents
+
+
+def _replace(
+    stats: SkillCorpusStats,
+    fresh_stats: SkillCorpusStats,
+    index: SkillInvertedIndex,
+    fresh_index: SkillInvertedIndex
+):
+    stats.replace(fresh_stats)
+    index.replace(fresh_index)
+
+
+def refresh_skill_stats(
+    db: Session,
+    stats: SkillCorpusStats = skill_corpus_stats,
+    index: SkillInvertedIndex = skill_index
+) -> int:
+    """
+    Count and index Analysis rows written since the last refresh; the whole
+    table on the first call. Async callers go through `AsyncSession.run_sync`.
+    """
+    if stats.watermark is None:
+        return rebuild_skill_stats(db, stats, index)
+
+    added = _count(db, stats, index)
+    stats.refreshed_at = time.monotonic()
+    if added:
+        logger.info(f"Skill corpus stats: {added} new analyses, {stats.total_documents} total")
+    return added
+
+
+def refresh_skill_stats_if_stale(
+    db: Session,
+    stats: SkillCorpusStats = skill_corpus_stats,
+    index: SkillInvertedIndex = skill_index
+) -> int:
+    """Refresh when the last refresh is older than SKILL_STATS_REFRESH_SECONDS"""
+    if (
+        stats.refreshed_at is not None
+        and time.monotonic() - stats.refreshed_at < settings.SKILL_STATS_REFRESH_SECONDS
+    ):
+        return 0
+    return refresh_skill_stats(db, stats, index)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deleted_analyses(session, flush_context):
+    """Remember analyses deleted by this flush until the transaction ends"""
+    deleted = [target.resume_id for target in session.deleted if isinstance(target, Analysis)]
+    if deleted:
+        session.info.setdefault(DELETED_ANALYSES, []).extend(deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_deleted_analyses(session):
+    """Drop committed deletes from this process's stats and index"""
+    for resume_id in session.info.pop(DELETED_ANALYSES, ()):
+        # Read the skills from the index: the deferred column can't be loaded for a deleted row
+        ids = skill_index.forward.get(resume_id)
+        if ids is not None:
+            skill_corpus_stats.remove_document_ids(ids)
+            skill_index.remove(resume_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_rolled_back_analyses(session):
+    """A rolled back delete never happened"""
+    session.info.pop(DELETED_ANALYSES, None)
@@ -0,0 +1,78 @@
+"""Fill the in-memory BM25 resume index from the resumes table"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.resumes.maintenance import table_maintenance
+from app.models.resume import Resume
+from app.ai.bm25 import BM25Index, resume_text_index
+
+logger = logging.getLogger(__name__)
+
+
+def build_text_index(db: Session, index: BM25Index = resume_text_index) -> int:
+    """
+    Index every stored resume text into a fresh index and swap it in. Runs
+    once on the table_maintenance thread after startup, so workers start
+    without reading the corpus; until then lexical matching sees only what
+    this process indexed itself.
+    """
+    started = datetime.utcnow()
+    fresh = BM25Index(index.k1, index.b)
+    query = db.query(Resume.id, Resume.raw_text, Resume.uploaded_at).filter(Resume.raw_text.isnot(None))
+    for resume_id, raw_text, uploaded_at in query.yield_per(500):
+        fresh.add(resume_id, raw_text)
+        fresh.watermark = max(fresh.watermark or uploaded_at, uploaded_at)
+    fresh.watermark = fresh.watermark or started
+
+    table_maintenance.swap(index.replace, fresh)
+    index.refreshed_at = time.monotonic()
+    logger.info(f"Resume text index built: {len(index)} resumes")
+    return len(index)
+
+
+def refresh_text_index(db: Session, index: BM25Index = resume_text_index) -> int:
+    """
+    Index the text of resumes uploaded since the last refresh. Resumes
+    uploaded through other workers only reach this process this way. Text
+    never changes after upload, so only ids are read in the
+    TEXT_INDEX_OVERLAP_SECONDS re-read window (for late commits) and text is
+    loaded for resumes not indexed yet. Does nothing before build_text_index
+    has run. Async callers go through `AsyncSession.run_sync`.
+    """
+    if index.watermark is None:
+        return 0
+
+    since = index.watermark - timedelta(seconds=settings.TEXT_INDEX_OVERLAP_SECONDS)
+    recent = db.query(Resume.id, Resume.uploaded_at).filter(
+        Resume.raw_text.isnot(None),
+        Resume.uploaded_at >= since
+    ).all()
+    for _, uploaded_at in recent:
+        index.watermark = max(index.watermark, uploaded_at)
+    new_ids = [resume_id for resume_id, _ in recent if resume_id not in index]
+
+    added = 0
+    if new_ids:
+        for resume_id, raw_text in db.query(Resume.id, Resume.raw_text).filter(Resume.id.in_(new_ids)):
+            index.add(resume_id, raw_text)
+            added += 1
+
+    index.refreshed_at = time.monotonic()
+    if added:
+        logger.info(f"Resume text index: {added} new resumes, {len(index)} total")
+    return added
+
+
+def refresh_text_index_if_stale(db: Session, index: BM25Index = resume_text_index) -> int:
+    """Refresh when the last refresh is older than TEXT_INDEX_REFRESH_SECONDS"""
+    if (
+        index.refreshed_at is not None
+        and time.monotonic() - index.refreshed_at < settings.TEXT_INDEX_REFRESH_SECONDS
+    ):
+        return 0
+    return refresh_text_index(db, index)
@@ -0,0 +1,80 @@
+"""Fill the in-memory resume embedding index from the resumes table"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.resumes.maintenance import table_maintenance
+from app.models.resume import Resume
+from app.ai.vector_index import CompactVectorIndex, VectorCodec, embedding_from_bytes, resume_vector_index
+
+logger = logging.getLogger(__name__)
+
+
+def build_vector_index(db: Session, index: CompactVectorIndex = resume_vector_index) -> int:
+    """
+    Index every stored embedding into a fresh index and swap it in. Runs once
+    on the table_maintenance thread after startup, so workers start without
+    reading the corpus.
+    """
+    started = datetime.utcnow()
+    codec = index.codec
+    fresh = CompactVectorIndex(
+        VectorCodec(dims=codec.dims, reduction=codec.reduction, quantize=codec.quantize),
+        fit_size=index.fit_size
+    )
+    query = db.query(Resume.id, Resume.embedding, Resume.embedded_at).filter(Resume.embedding.isnot(None))
+    for resume_id, embedding, embedded_at in query.yield_per(1000):
+        fresh.add(resume_id, embedding_from_bytes(embedding))
+        fresh.watermark = max(fresh.watermark or embedded_at, embedded_at)
+    fresh.watermark = fresh.watermark or started
+
+    table_maintenance.swap(index.replace, fresh)
+    index.refreshed_at = time.monotonic()
+    logger.info(f"Resume vector index built: {len(index)} embeddings")
+    return len(index)
+
+
+def refresh_vector_index(db: Session, index: CompactVectorIndex = resume_vector_index) -> int:
+    """
+    Index embeddings stored since the last refresh, by this or other workers.
+    Only ids are read in the VECTOR_INDEX_OVERLAP_SECONDS re-read window (for
+    late commits); embeddings are loaded for resumes not indexed yet. Does
+    nothing before build_vector_index has run.
+    Async callers go through `AsyncSession.run_sync`.
+    """
+    if index.watermark is None:
+        return 0
+
+    since = index.watermark - timedelta(seconds=settings.VECTOR_INDEX_OVERLAP_SECONDS)
+    recent = db.query(Resume.id, Resume.embedded_at).filter(
+        Resume.embedding.isnot(None),
+        Resume.embedded_at >= since
+    ).all()
+    for _, embedded_at in recent:
+        index.watermark = max(index.watermark, embedded_at)
+    new_ids = [resume_id for resume_id, _ in recent if resume_id not in index]
+
+    added = 0
+    if new_ids:
+        for resume_id, embedding in db.query(Resume.id, Resume.embedding).filter(Resume.id.in_(new_ids)):
+            index.add(resume_id, embedding_from_bytes(embedding))
+            added += 1
+
+    index.refreshed_at = time.monotonic()
+    if added:
+        logger.info(f"Resume vector index: {added} new embeddings, {len(index)} total")
+    return added
+
+
+def refresh_vector_index_if_stale(db: Session, index: CompactVectorIndex = resume_vector_index) -> int:
+    """Refresh when the last refresh is older than VECTOR_INDEX_REFRESH_SECONDS"""
+    if (
+        index.refreshed_at is not None
+        and time.monotonic() - index.refreshed_at < settings.VECTOR_INDEX_REFRESH_SECONDS
+    ):
+        return 0
+    return refresh_vector_index(db, index)
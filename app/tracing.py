@@ -0,0 +1,301 @@
+"""
+Request tracing.
+
+TracingMiddleware samples each request once (TRACE_SAMPLE_RATE) and opens a
+root span; `span()` and `@traced` add child spans below whatever span is
+current. Finished spans are exported in the background, as JSON lines
+(TRACE_EXPORTER=file) or OTLP/HTTP JSON to a local collector (otlp).
+Outside a sampled request every helper here is a no-op.
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marks a request that was not sampled, so nested spans don't start traces
+NOT_SAMPLED = object()
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_current_span: contextvars.ContextVar[Any] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error", "kind")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any], kind: str):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None):
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.end_ns = time.time_ns()
+        processor.submit(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+def should_sample(parent_sampled: Optional[bool] = None) -> bool:
+    """Sampling decision for a new trace; an upstream decision wins if given"""
+    if not settings.TRACING_ENABLED:
+        return False
+    if parent_sampled is not None:
+        return parent_sampled
+    return random.random() < settings.TRACE_SAMPLE_RATE
+
+
+@contextmanager
+def trace(
+    name: str,
+    sampled: bool,
+    trace_id: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    **attributes
+):
+    """Root span for one unit of work (a request, a batch job); yields None when not sampled"""
+    if not sampled:
+        token = _current_span.set(NOT_SAMPLED)
+        try:
+            yield None
+        finally:
+            _current_span.reset(token)
+        return
+
+    root = Span(name, trace_id or os.urandom(16).hex(), parent_id, attributes, "server")
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        root.finish()
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """A child of the current span, not made current itself (for leaf operations)"""
+    parent = _current_span.get()
+    if parent is None or parent is NOT_SAMPLED:
+        return None
+    if request_id_var.get():
+        attributes.setdefault("request_id", request_id_var.get())
+    return Span(name, parent.trace_id, parent.span_id, attributes, "internal")
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a child span; yields the span, or None when not sampled"""
+    current = start_span(name, **attributes)
+    if current is None:
+        yield None
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+
+
+def traced(name: Optional[str] = None):
+    """Decorator wrapping a sync or async function in a span named after it"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds `request_id` to log records so handlers can format it"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class FileExporter:
+    """Appends spans as JSON lines"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a") as f:
+            for finished in spans:
+                f.write(json.dumps(finished.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPExporter:
+    """Posts spans to an OpenTelemetry collector over OTLP/HTTP (JSON encoding)"""
+
+    KINDS = {"internal": 1, "server": 2}
+
+    def __init__(self, endpoint: str, service_name: str = "resumeiq-api", timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": _otlp_value(self.service_name)}]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [self._span(finished) for finished in spans]
+            }]
+        }]}
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        urllib.request.urlopen(request, timeout=self.timeout).close()
+
+    def _span(self, finished: Span) -> Dict[str, Any]:
+        otlp = {
+            "traceId": finished.trace_id,
+            "spanId": finished.span_id,
+            "name": finished.name,
+            "kind": self.KINDS[finished.kind],
+            "startTimeUnixNano": str(finished.start_ns),
+            "endTimeUnixNano": str(finished.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in finished.attributes.items()],
+            "status": {"code": 2, "message": finished.error} if finished.error else {"code": 1}
+        }
+        if finished.parent_id:
+            otlp["parentSpanId"] = finished.parent_id
+        return otlp
+
+
+class BatchSpanProcessor:
+    """
+    Buffers finished spans and exports them from a daemon thread, so request
+    handlers never wait on disk or network. Spans are dropped when the
+    buffer is full rather than blocking.
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 512, interval: float = 2.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._exporter = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    def submit(self, finished: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(finished)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Export everything queued so far on the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._export(batch)
+                batch = []
+        self._export(batch)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            if settings.TRACE_EXPORTER == "otlp":
+                self._exporter = OTLPExporter(settings.TRACE_OTLP_ENDPOINT)
+            else:
+                self._exporter = FileExporter(settings.TRACE_FILE)
+            self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def _export(self, batch: List[Span]):
+        if not batch:
+            return
+        try:
+            with self._export_lock:
+                self._exporter.export(batch)
+        except Exception as e:
+            logger.warning(f"Dropping {len(batch)} spans, export failed: {e}")
+
+
+processor = BatchSpanProcessor()
@@ -0,0 +1,27 @@
+"""Keyset pagination cursor helpers"""
+
+import base64
+import json
+from typing import Any, List
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """Decode a cursor produced by encode_cursor into its `size` string values"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
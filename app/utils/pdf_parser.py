@@ -1,16 +1,22 @@
 """PDF parsing utilities"""
 
+import time
 import PyPDF2
 import pdfplumber
 from typing import Optional
 
+from app.metrics import PDF_EXTRACTION_LATENCY, record_fallback
+from app.tracing import traced
+
 
 class PDFParser:
     """Parse PDF files to extract text"""
     
+    @traced("pdf.extract_text")
     def extract_text(self, file_path: str) -> Optional[str]:
         """Extract text from PDF file"""
         text = ""
+        started = time.perf_counter()
         
         try:
             # Try with pdfplumber first (better for tables)
@@ -21,19 +27,23 @@ class PDFParser:
                         text += page_text + "\n"
             
             if text.strip():
+                PDF_EXTRACTION_LATENCY.labels("pdfplumber").observe(time.perf_counter() - started)
                 return text
             
             # Fallback to PyPDF2
+            record_fallback("pdf_parser", "pypdf2")
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page_num in range(len(pdf_reader.pages)):
                     page = pdf_reader.pages[page_num]
                     text += page.extract_text() + "\n"
             
+            PDF_EXTRACTION_LATENCY.labels("pypdf2").observe(time.perf_counter() - started)
             return text.strip() if text.strip() else None
             
         except Exception as e:
             print(f"Error parsing PDF: {e}")
+            PDF_EXTRACTION_LATENCY.labels("failed").observe(time.perf_counter() - started)
             return None
     
     def extract_metadata(self, file_path: str) -> dict:
@@ -0,0 +1,155 @@
+"""
+Synthetic resume and job description corpus.
+
+Everything is generated from a seed, so two runs with the same arguments
+benchmark exactly the same inputs.
+"""
+
+import os
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.ai.config import TECHNICAL_SKILLS, SOFT_SKILLS
+
+FIRST_NAMES = ["Alex", "Maria", "Wei", "Priya", "Jordan", "Fatima", "Lukas", "Aiko", "Samuel", "Elena"]
+LAST_NAMES = ["Garcia", "Chen", "Okafor", "Novak", "Silva", "Kim", "Haddad", "Larsen", "Patel", "Moreau"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Hooli", "Vandelay", "Wayne Tech"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Analyst", "Backend Developer",
+          "Frontend Developer", "DevOps Engineer", "Engineering Manager", "Machine Learning Engineer"]
+LEVELS = ["Junior", "", "Senior", "Lead", "Principal"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "BA Economics"]
+FILLER = [
+    "Delivered features used by thousands of customers across several regions",
+    "Worked closely with product and design to refine requirements",
+    "Reduced infrastructure cost by consolidating services and tuning queries",
+    "Mentored new team members and ran weekly knowledge sharing sessions",
+    "Owned the on-call rotation and improved incident response playbooks",
+    "Migrated legacy components to a modular architecture with automated tests",
+]
+
+# Number of work history entries per size
+SIZES = {"short": 1, "medium": 3, "long": 8}
+
+
+@dataclass
+class Document:
+    """One generated resume or job description"""
+    name: str
+    kind: str  # "resume" or "job"
+    size: str
+    text: str
+    skills: List[str] = field(default_factory=list)
+    pdf_path: Optional[str] = None
+
+
+def _skills(rng: random.Random, count: int) -> List[str]:
+    return rng.sample(TECHNICAL_SKILLS, count) + rng.sample(SOFT_SKILLS, max(count // 4, 1))
+
+
+def make_resume(rng: random.Random, size: str, index: int) -> Document:
+    """A plain-text resume with contacts, dated work history and a skills section"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = _skills(rng, 4 + 3 * SIZES[size])
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+        f" | linkedin.com/in/{name.lower().replace(' ', '-')}",
+        "",
+        "Summary",
+        f"{rng.choice(LEVELS)} engineer with {rng.randint(1, 20)} years of experience in "
+        f"{', '.join(skills[:3])}.",
+        "",
+        "Experience",
+    ]
+
+    year = 2024
+    for _ in range(SIZES[size]):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 else f"{rng.choice(MONTHS)} {year}"
+        lines.append(f"{rng.choice(LEVELS)} {rng.choice(TITLES)}, {rng.choice(COMPANIES)}  {rng.choice(MONTHS)} {start} - {end}".strip())
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"- {rng.choice(FILLER)} using {rng.choice(skills)}.")
+        lines.append("")
+        year = start
+
+    lines += ["Education", f"{rng.choice(DEGREES)}, {year - 1}", "", "Skills", ", ".join(skills)]
+    return Document(f"resume-{size}-{index}", "resume", size, "\n".join(lines), skills)
+
+
+def make_job(rng: random.Random, size: str, index: int) -> Document:
+    """A job description listing required skills"""
+    skills = _skills(rng, 3 + 2 * SIZES[size])
+    title = f"{rng.choice(LEVELS)} {rng.choice(TITLES)}".strip()
+    lines = [
+        title,
+        f"{rng.choice(COMPANIES)} is hiring a {title} to join a growing team.",
+        "",
+        "Requirements",
+    ] + [f"- Experience with {skill}" for skill in skills] + [
+        "",
+        "About the role",
+    ] + [f"{rng.choice(FILLER)}." for _ in range(SIZES[size] * 2)]
+    return Document(f"job-{size}-{index}", "job", size, "\n".join(lines), skills)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(text: str, path: str, lines_per_page: int = 50):
+    """Write text as a minimal multi-page PDF (Helvetica, one line per text row)"""
+    lines = [line.encode("latin-1", "replace").decode("latin-1") for line in text.split("\n")]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []  # 1-based: catalog, pages, font, then (page, content) pairs
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_id, page_lines in zip(page_ids, pages):
+        rows = "".join(f"({_pdf_escape(line)}) Tj T* " for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td {rows}ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_corpus(
+    per_size: int = 5,
+    seed: int = 42,
+    pdf_dir: Optional[str] = None
+) -> List[Document]:
+    """Resumes and jobs for every size; resumes are also written as PDFs when pdf_dir is set"""
+    rng = random.Random(seed)
+    documents = []
+
+    for size in SIZES:
+        for index in range(per_size):
+            resume = make_resume(rng, size, index)
+            if pdf_dir:
+                os.makedirs(pdf_dir, exist_ok=True)
+                resume.pdf_path = os.path.join(pdf_dir, f"{resume.name}.pdf")
+                write_pdf(resume.text, resume.pdf_path)
+            documents.append(resume)
+            documents.append(make_job(rng, size, index))
+
+    return documents
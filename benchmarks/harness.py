@@ -0,0 +1,129 @@
+"""Timing, JSON result files and baseline comparison shared by the benchmarks"""
+
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Metrics compared against a baseline; higher is worse for all of them
+COMPARED_METRICS = ("p50_ms", "p95_ms")
+
+
+def summarize(samples_ms: List[float], **extra) -> Dict[str, Any]:
+    """Latency percentiles for a list of samples in milliseconds"""
+    ordered = sorted(samples_ms)
+
+    def percentile(p: float) -> float:
+        return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(percentile(0.50), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "p99_ms": round(percentile(0.99), 3),
+        "max_ms": round(ordered[-1], 3),
+        **extra
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 20, warmup: int = 2) -> Dict[str, Any]:
+    """Call fn repeatedly and summarize wall time per call"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return summarize(samples)
+
+
+def environment() -> Dict[str, Any]:
+    """Where the numbers came from"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def save_results(path: str, suite: str, results: Dict[str, Dict[str, Any]], params: Dict[str, Any]):
+    """Write a result file (also usable as a baseline)"""
+    with open(path, "w") as f:
+        json.dump({
+            "suite": suite,
+            "environment": environment(),
+            "params": params,
+            "results": results
+        }, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict[str, Any],
+    results: Dict[str, Dict[str, Any]],
+    threshold: float = 0.10
+) -> List[Dict[str, Any]]:
+    """
+    Per benchmark and metric, the relative change against the baseline.
+    Entries slower than `threshold` (0.10 = 10%) are flagged as regressions.
+    """
+    rows = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+
+        for metric in COMPARED_METRICS:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regression": change > threshold
+            })
+
+    return rows
+
+
+def print_results(results: Dict[str, Dict[str, Any]], comparison: Optional[List[Dict[str, Any]]] = None):
+    """Human-readable table of results and, if given, the baseline comparison"""
+    for name, result in sorted(results.items()):
+        if "skipped" in result:
+            print(f"{name:<32} skipped: {result['skipped']}")
+            continue
+        extra = f"  {result['ops_per_sec']} ops/s" if "ops_per_sec" in result else ""
+        if "recall" in result:
+            extra += (
+                f"  recall {result['recall']:.3f}  reranked {result['rerank_recall']:.3f}"
+                f"  {result['bytes_per_vector']}B/vector"
+            )
+        errors = f"  errors {result['errors']}" if result.get("errors") else ""
+        print(
+            f"{name:<32} p50 {result['p50_ms']:>9.3f}ms  p95 {result['p95_ms']:>9.3f}ms  "
+            f"p99 {result['p99_ms']:>9.3f}ms{extra}{errors}"
+        )
+
+    if comparison:
+        print()
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['benchmark']:<32} {row['metric']:<7} {row['baseline']:>9.3f} -> "
+                f"{row['current']:>9.3f}  {row['change']:+.1%} {flag}"
+            )
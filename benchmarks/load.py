@@ -0,0 +1,167 @@
+"""
+End-to-end API load scenarios against a running server.
+
+Start the API first (e.g. `uvicorn app.main:app`), then point --url at it.
+A throwaway user is registered to get a bearer token; requests are fired
+from a thread pool with a fixed concurrency for a fixed count.
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import Document, generate_corpus
+from benchmarks.harness import summarize
+
+API_PREFIX = "/api/v1"
+
+
+class Client:
+    """Tiny urllib client; returns (status, body) and never raises on HTTP errors"""
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token: Optional[str] = None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        form: Optional[Dict[str, str]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        query: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes]:
+        url = f"{self.base_url}{API_PREFIX}{path}"
+        if query:
+            url += "?" + urllib.parse.urlencode(query)
+
+        headers = {}
+        data = None
+        if form is not None:
+            data = urllib.parse.urlencode(form).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        req = urllib.request.Request(url, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            return 0, str(e).encode()
+
+    def authenticate(self):
+        """Register a throwaway job seeker and log in as it"""
+        name = f"bench_{uuid.uuid4().hex[:12]}"
+        password = "benchmark-password"
+        status, body = self.request("POST", "/auth/register", json_body={
+            "email": f"{name}@example.com",
+            "username": name,
+            "password": password
+        })
+        if status != 201:
+            raise RuntimeError(f"Registration failed ({status}): {body[:200]!r}")
+
+        status, body = self.request("POST", "/auth/login", form={"username": name, "password": password})
+        if status != 200:
+            raise RuntimeError(f"Login failed ({status}): {body[:200]!r}")
+        self.token = json.loads(body)["access_token"]
+
+
+def _scenarios(client: Client, documents: List[Document]) -> Dict[str, Callable[[random.Random], int]]:
+    """Scenario name -> function issuing one request and returning its status"""
+    resumes = [doc for doc in documents if doc.kind == "resume"]
+    jobs = [doc for doc in documents if doc.kind == "job"]
+
+    def analyze_text(profile: str):
+        def call(rng: random.Random) -> int:
+            return client.request("POST", "/ai/analyze-text", form={
+                "text": rng.choice(resumes).text,
+                "job_description": rng.choice(jobs).text,
+                "profile": profile
+            })[0]
+        return call
+
+    def skills_extract(rng: random.Random) -> int:
+        return client.request("GET", "/ai/skills/extract", query={"text": rng.choice(resumes).text[:1500]})[0]
+
+    def match_score(rng: random.Random) -> int:
+        return client.request("POST", "/ai/match-score", form={
+            "resume_text": rng.choice(resumes).text,
+            "job_description": rng.choice(jobs).text
+        })[0]
+
+    return {
+        "analyze_text_fast": analyze_text("fast"),
+        "analyze_text_full": analyze_text("full"),
+        "skills_extract": skills_extract,
+        "match_score": match_score,
+    }
+
+
+def _run_scenario(call: Callable[[random.Random], int], requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "rng"):
+            local.rng = random.Random(f"{seed}-{threading.get_ident()}")
+        started = time.perf_counter()
+        status = call(local.rng)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            samples.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return summarize(
+        samples,
+        concurrency=concurrency,
+        ops_per_sec=round(requests / wall, 2),
+        errors=errors,
+        statuses=statuses
+    )
+
+
+def run_load(
+    base_url: str,
+    requests: int = 50,
+    concurrency: int = 4,
+    per_size: int = 5,
+    seed: int = 42,
+    only: List[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Run every selected scenario in turn against the server at base_url"""
+    client = Client(base_url)
+    client.authenticate()
+    scenarios = _scenarios(client, generate_corpus(per_size, seed))
+
+    results = {}
+    for name, call in scenarios.items():
+        if only and name not in only:
+            continue
+        # One unmeasured request so model loading isn't in the numbers
+        call(random.Random(seed))
+        results[f"load.{name}"] = _run_scenario(call, requests, concurrency, seed)
+
+    return results
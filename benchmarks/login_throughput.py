@@ -0,0 +1,103 @@
+"""
+Login throughput benchmark for password verification.
+
+Fires a burst of concurrent logins at bcrypt verification, once inline on the
+event loop (the old behaviour) and once through the auth crypto pool, and
+reports logins/sec plus the worst event loop stall seen by a heartbeat task.
+
+Usage (from the repo root, with .env or DATABASE_URL set):
+    python -m benchmarks.login_throughput --logins 64 --rounds 12 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float, stalls: list):
+    """Record how late each tick fires; a late tick means the loop was blocked"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - started - interval)
+
+
+async def _run(mode: str, logins: int, password: str, hashed: str) -> dict:
+    from app.auth import utils
+
+    async def inline_login():
+        return utils.pwd_context.verify_and_update(password, hashed)
+
+    async def pooled_login():
+        return await utils.verify_and_update_password(password, hashed)
+
+    login = inline_login if mode == "inline" else pooled_login
+
+    stop = asyncio.Event()
+    stalls: list = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, 0.005, stalls))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+
+    assert all(valid for valid, _ in results)
+    return {
+        "mode": mode,
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "max_loop_stall_ms": round(max(stalls, default=0.0) * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent logins per run")
+    parser.add_argument("--rounds", type=int, default=None, help="Override BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, default=None, help="Override AUTH_HASH_WORKERS")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so overrides go in before importing app
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if args.workers is not None:
+        os.environ["AUTH_HASH_WORKERS"] = str(args.workers)
+
+    from app.config import settings
+    from app.auth import utils
+
+    password = "benchmark-password"
+    hashed = utils.get_password_hash(password)
+
+    results = [
+        asyncio.run(_run(mode, args.logins, password, hashed))
+        for mode in ("inline", "pool")
+    ]
+
+    if args.json:
+        json.dump({
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "workers": settings.AUTH_HASH_WORKERS,
+            "results": results
+        }, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS} workers={settings.AUTH_HASH_WORKERS}")
+    for result in results:
+        print(
+            f"{result['mode']:>6}: {result['logins_per_sec']:>7} logins/s  "
+            f"{result['seconds']:>6}s total  max loop stall {result['max_loop_stall_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
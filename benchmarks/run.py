@@ -0,0 +1,103 @@
+"""
+Benchmark suite entry point.
+
+Usage (from the repo root, with .env or DATABASE_URL set):
+    python -m benchmarks.run stages --output baseline.json
+    python -m benchmarks.run stages --compare baseline.json --threshold 0.15
+    python -m benchmarks.run load --url http://localhost:8000 --requests 100 --concurrency 8
+    python -m benchmarks.run startup --budget-ms 1500
+    python -m benchmarks.run vectors --vectors 50000 --k 10
+
+With --compare the exit status is 1 when any p50/p95 is slower than the
+baseline by more than the threshold, so it can gate CI. The startup suite
+also exits 1 when importing the app pulls in torch/transformers or its
+median import time is over --budget-ms.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.harness import compare, load_results, print_results, save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ResumeIQ analysis benchmarks")
+    parser.add_argument("suite", choices=["stages", "load", "startup", "vectors"])
+    parser.add_argument("--per-size", type=int, default=5, help="Resumes and jobs per size (short/medium/long)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", help="Stage or scenario names to run")
+    parser.add_argument("--output", help="Write results as JSON (usable as a baseline)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, 0.10 = 10%%")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    stages = parser.add_argument_group("stages")
+    stages.add_argument("--repeat", type=int, default=10)
+    stages.add_argument("--warmup", type=int, default=1)
+    stages.add_argument("--skip-models", action="store_true", help="Skip stages that need model weights")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--url", default="http://localhost:8000")
+    load.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    load.add_argument("--concurrency", type=int, default=4)
+
+    startup = parser.add_argument_group("startup")
+    startup.add_argument("--module", default="app.main", help="Module whose import is timed")
+    startup.add_argument("--imports", type=int, default=5, help="Fresh interpreters to time")
+    startup.add_argument("--budget-ms", type=float, default=0, help="Max median import time, 0 = none")
+
+    vectors = parser.add_argument_group("vectors")
+    vectors.add_argument("--vectors", type=int, default=20000, help="Indexed embeddings")
+    vectors.add_argument("--queries", type=int, default=200)
+    vectors.add_argument("--k", type=int, default=10)
+    vectors.add_argument("--oversample", type=int, default=5, help="Compact hits re-ranked per k")
+    vectors.add_argument("--embeddings", help=".npy of real embeddings instead of synthetic ones")
+
+    args = parser.parse_args()
+
+    if args.suite == "stages":
+        from benchmarks.stages import run_stages
+        params = {"per_size": args.per_size, "seed": args.seed, "repeat": args.repeat, "warmup": args.warmup}
+        results = run_stages(only=args.only, skip_models=args.skip_models, **params)
+    elif args.suite == "vectors":
+        from benchmarks.vectors import run_vectors
+        params = {"count": args.vectors, "queries": args.queries, "k": args.k,
+                  "oversample": args.oversample, "seed": args.seed, "embeddings": args.embeddings}
+        results = run_vectors(only=args.only, **params)
+    elif args.suite == "startup":
+        from benchmarks.startup import run_startup
+        params = {"module": args.module, "repeat": args.imports}
+        results = run_startup(**params)
+    else:
+        from benchmarks.load import run_load
+        params = {"per_size": args.per_size, "seed": args.seed, "requests": args.requests,
+                  "concurrency": args.concurrency}
+        results = run_load(args.url, only=args.only, **params)
+
+    comparison = None
+    if args.compare:
+        comparison = compare(load_results(args.compare), results, args.threshold)
+
+    if args.output:
+        save_results(args.output, args.suite, results, params)
+
+    if args.json:
+        json.dump({"results": results, "comparison": comparison}, sys.stdout, indent=2)
+        print()
+    else:
+        print_results(results, comparison)
+
+    violations = []
+    if args.suite == "startup":
+        from benchmarks.startup import check_budget
+        violations = check_budget(results, args.budget_ms)
+        for violation in violations:
+            print(f"BUDGET: {violation}", file=sys.stderr)
+
+    if violations or (comparison and any(row["regression"] for row in comparison)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Per-stage microbenchmarks for the analysis pipeline.
+
+Each stage runs over the whole corpus once per sample, so a sample's time is
+the cost of processing every document of that kind. Model-backed stages load
+their model before timing and are reported as skipped if it can't be loaded.
+"""
+
+import asyncio
+import tempfile
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.corpus import Document, generate_corpus
+from benchmarks.harness import measure
+
+# Stages that need transformer / sentence-transformer weights
+MODEL_STAGES = {"ner_full", "embedding", "job_match_full", "analyze_full"}
+
+
+def _stages(documents: List[Document]) -> Tuple[Dict[str, Callable[[], Any]], Any]:
+    """Stage name -> callable over the corpus, plus the analyzer they share"""
+    from app.models.analysis import AnalysisProfile
+    from app.resumes.analyzer import ResumeAnalyzer
+    from app.utils.pdf_parser import PDFParser
+
+    analyzer = ResumeAnalyzer()
+    parser = PDFParser()
+    resumes = [doc for doc in documents if doc.kind == "resume"]
+    jobs = [doc for doc in documents if doc.kind == "job"]
+    pairs = list(zip(resumes, jobs))
+    pdfs = [doc.pdf_path for doc in resumes if doc.pdf_path]
+
+    skills = analyzer.skills_extractor
+    resume_skills = [skills.extract_skills(doc.text)["all_skills"] for doc in resumes]
+    job_skills = [skills.extract_skills(doc.text)["all_skills"] for doc in jobs]
+
+    return {
+        "pdf_extraction": lambda: [parser.extract_text(path) for path in pdfs],
+        "skill_extraction": lambda: [skills.extract_skills(doc.text) for doc in documents],
+        "skill_match": lambda: [
+            skills.calculate_skill_match(r, j) for r, j in zip(resume_skills, job_skills)
+        ],
+        "skill_match_batch": lambda: skills.calculate_skill_match_batch(resume_skills, job_skills),
+        "experience": lambda: [analyzer.experience_classifier.classify_experience(doc.text) for doc in resumes],
+        "ner_fast": lambda: [analyzer.ner_extractor.extract_entities_fast(doc.text) for doc in resumes],
+        "ner_full": lambda: [analyzer.ner_extractor.extract_entities(doc.text) for doc in resumes],
+        "embedding": lambda: [
+            analyzer.similarity_calculator.calculate_similarity(r.text, j.text) for r, j in pairs
+        ],
+        "job_match_fast": lambda: [
+            analyzer._calculate_job_match(r.text, j.text, s, use_similarity=False)
+            for (r, j), s in zip(pairs, resume_skills)
+        ],
+        "job_match_full": lambda: [
+            analyzer._calculate_job_match(r.text, j.text, s) for (r, j), s in zip(pairs, resume_skills)
+        ],
+        "analyze_fast": lambda: [
+            analyzer._analyze_resume(r.text, j.text, AnalysisProfile.FAST) for r, j in pairs
+        ],
+        "analyze_full": lambda: [
+            asyncio.run(analyzer.analyze_resume(r.text, j.text, AnalysisProfile.FULL)) for r, j in pairs
+        ],
+    }, analyzer
+
+
+def _load_models(analyzer) -> str:
+    """Load the transformer models up front; returns an error message on failure"""
+    try:
+        analyzer.ner_extractor.ensure_loaded()
+        analyzer.similarity_calculator.ensure_loaded()
+    except Exception as e:
+        return f"models unavailable ({e})"
+    return ""
+
+
+def run_stages(
+    per_size: int = 5,
+    seed: int = 42,
+    repeat: int = 10,
+    warmup: int = 1,
+    only: List[str] = None,
+    skip_models: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """Time every selected stage over a freshly generated corpus"""
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="resumeiq-bench-") as pdf_dir:
+        documents = generate_corpus(per_size, seed, pdf_dir=pdf_dir)
+        stages, analyzer = _stages(documents)
+        selected = [name for name in stages if not only or name in only]
+
+        model_error = ""
+        if any(name in MODEL_STAGES for name in selected):
+            model_error = "skipped with --skip-models" if skip_models else _load_models(analyzer)
+
+        for name in selected:
+            if name in MODEL_STAGES and model_error:
+                results[f"stage.{name}"] = {"skipped": model_error}
+                continue
+            result = measure(stages[name], repeat=repeat, warmup=warmup)
+            result["corpus_size"] = len(documents)
+            results[f"stage.{name}"] = result
+
+    return results
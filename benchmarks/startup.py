@@ -0,0 +1,86 @@
+"""
+Cold start benchmark and import budget.
+
+Imports the app in fresh interpreters and reports the wall time and the RSS
+it costs. The ML packages must stay out of that import (they load with the
+first model), so any of HEAVY_MODULES showing up is reported as a violation,
+as is a median import time over the budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.harness import summarize
+
+# Packages that only the first model load may import
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers")
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "rss_mb": peak / 2**20 if sys.platform == "darwin" else peak / 1024,
+    "modules": sorted(name for name in sys.modules if name.split(".")[0] in {heavy!r})
+}}))
+"""
+
+
+def _probe(module: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + [
+        "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ))
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return completed
+
+
+def slowest_imports(importtime_log: str, top: int = 10) -> List[Dict[str, Any]]:
+    """Top-level packages by total self import time (all their modules) from a -X importtime log"""
+    totals: Dict[str, int] = {}
+    for line in importtime_log.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        package = parts[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(parts[0])
+    ordered = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"module": name, "ms": round(us / 1000, 1)} for name, us in ordered]
+
+
+def run_startup(module: str = "app.main", repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Import `module` in `repeat` fresh interpreters and summarize"""
+    samples, rss, heavy = [], [], set()
+    for _ in range(repeat):
+        probe = json.loads(_probe(module).stdout.strip().splitlines()[-1])
+        samples.append(probe["ms"])
+        rss.append(probe["rss_mb"])
+        heavy.update(probe["modules"])
+
+    traced = _probe(module, importtime=True)
+    return {
+        f"import_{module}": summarize(
+            samples,
+            rss_mb=round(max(rss), 1),
+            heavy_modules=sorted(heavy),
+            slowest_imports=slowest_imports(traced.stderr)
+        )
+    }
+
+
+def check_budget(results: Dict[str, Dict[str, Any]], budget_ms: float) -> List[str]:
+    """Budget violations: heavy packages imported eagerly, or a median import over budget_ms"""
+    violations = []
+    for name, result in results.items():
+        if result["heavy_modules"]:
+            violations.append(f"{name} imports {', '.join(result['heavy_modules'])} eagerly")
+        if budget_ms and result["p50_ms"] > budget_ms:
+            violations.append(f"{name} p50 {result['p50_ms']:.0f}ms is over the {budget_ms:.0f}ms budget")
+    return violations
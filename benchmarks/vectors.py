@@ -0,0 +1,114 @@
+"""
+Recall and latency of compact embedding codes (app.ai.vector_index).
+
+Each configuration indexes the same vectors and answers the same queries.
+recall@k is the share of the exact float32 top-k that the compact search
+returns. rerank_recall@k is the share after re-scoring the top `oversample * k`
+compact hits with the full-precision vectors, as job matching does for its
+shortlist. Latency is per query over the whole index, including the rerank.
+
+Vectors are synthetic by default: clustered, unit-length and anisotropic,
+with variance decaying across dimensions like sentence embeddings.
+Pass --embeddings with an .npy of real MiniLM embeddings for true numbers.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.harness import summarize
+
+# (name, dims, reduction, quantize); dims 0 keeps the full vector
+CONFIGS = [
+    ("float32_full", 0, "pca", False),
+    ("int8_full", 0, "pca", True),
+    ("truncate128_int8", 128, "truncate", True),
+    ("pca128_float32", 128, "pca", False),
+    ("pca128_int8", 128, "pca", True),
+    ("pca64_int8", 64, "pca", True),
+]
+
+
+def synthetic_embeddings(count: int, dims: int = 384, clusters: int = 200, seed: int = 42) -> np.ndarray:
+    """Unit vectors around random cluster centers, with a decaying variance spectrum"""
+    rng = np.random.default_rng(seed)
+    spectrum = 1 / np.sqrt(1 + np.arange(dims) / 8)
+    centers = rng.standard_normal((clusters, dims)) * spectrum
+    labels = rng.integers(0, clusters, count)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((count, dims)) * spectrum
+    # Random rotation so no prefix of dimensions is special (truncation gets no free lunch)
+    rotation, _ = np.linalg.qr(rng.standard_normal((dims, dims)))
+    vectors = vectors @ rotation
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _recall(found: List[int], exact: np.ndarray) -> float:
+    return len(set(found) & set(exact.tolist())) / len(exact)
+
+
+def run_config(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    exact: np.ndarray,
+    dims: int,
+    reduction: str,
+    quantize: bool,
+    k: int,
+    oversample: int
+) -> Dict[str, Any]:
+    from app.ai.vector_index import CompactVectorIndex, VectorCodec
+
+    codec = VectorCodec(dims=dims, reduction=reduction, quantize=quantize)
+    index = CompactVectorIndex(codec, fit_size=min(len(vectors), 5000))
+
+    started = time.perf_counter()
+    for doc_id, vector in enumerate(vectors):
+        index.add(doc_id, vector)
+    build_seconds = time.perf_counter() - started
+
+    samples, recalls, rerank_recalls = [], [], []
+    for query, truth in zip(queries, exact):
+        started = time.perf_counter()
+        hits = [doc_id for doc_id, _ in index.search(query, limit=k * oversample)]
+        reranked = sorted(hits, key=lambda doc_id: float(vectors[doc_id] @ query), reverse=True)[:k]
+        samples.append((time.perf_counter() - started) * 1000)
+        recalls.append(_recall(hits[:k], truth))
+        rerank_recalls.append(_recall(reranked, truth))
+
+    return summarize(
+        samples,
+        recall=round(float(np.mean(recalls)), 4),
+        rerank_recall=round(float(np.mean(rerank_recalls)), 4),
+        bytes_per_vector=codec.bytes_per_vector(vectors.shape[1]),
+        index_mb=round(index.nbytes / 2**20, 2),
+        build_seconds=round(build_seconds, 3)
+    )
+
+
+def run_vectors(
+    count: int = 20000,
+    queries: int = 200,
+    k: int = 10,
+    oversample: int = 5,
+    seed: int = 42,
+    embeddings: Optional[str] = None,
+    only: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Benchmark every configuration (or `only` those) on the same vectors and queries"""
+    if embeddings:
+        data = np.load(embeddings).astype(np.float32)
+        data /= np.linalg.norm(data, axis=1, keepdims=True)
+    else:
+        data = synthetic_embeddings(count + queries, seed=seed)
+    vectors, query_vectors = data[:-queries], data[-queries:]
+
+    # Exact float32 top-k for every query
+    exact = np.argsort(-(query_vectors @ vectors.T), axis=1)[:, :k]
+
+    results = {}
+    for name, dims, reduction, quantize in CONFIGS:
+        if only and name not in only:
+            continue
+        results[name] = run_config(vectors, query_vectors, exact, dims, reduction, quantize, k, oversample)
+    return results
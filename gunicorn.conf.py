@@ -0,0 +1,27 @@
+"""
+Gunicorn config for pre-fork serving:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported in the master and, with PREFORK_SHARE_MODELS, the model
+weights are loaded there too, before any worker is forked. Workers then
+share one copy of the weights instead of loading their own, so adding a
+worker costs little memory and no model load time.
+"""
+
+import os
+
+from app.config import settings
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app in the master so workers inherit it (and its models) on fork
+preload_app = True
+
+
+def on_starting(server):
+    if settings.PREFORK_SHARE_MODELS:
+        from app.ai.prefork import share_models
+        share_models()